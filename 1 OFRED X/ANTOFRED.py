@@ -12,22 +12,16 @@ Features:
 
 import asyncio
 import json
+import sys
 import threading
-import hashlib
 import random
-import time
 from pathlib import Path
 from datetime import datetime, timedelta
 from typing import Optional, List, Dict, Tuple
-from dataclasses import dataclass, asdict
 from collections import defaultdict
-import re
 
 import customtkinter as ctk
 from tkinter import messagebox, filedialog, scrolledtext
-import numpy as np
-from sklearn.ensemble import IsolationForest
-from sklearn.preprocessing import StandardScaler
 
 try:
     import praw
@@ -35,188 +29,10 @@ try:
 except ImportError:
     print("Zainstaluj: pip install praw openai scikit-learn numpy")
 
-
-@dataclass
-class UserBehavior:
-    """Track user behavioral patterns"""
-    user_id: str
-    message_count: int = 0
-    avg_response_time: float = 0.0
-    timestamps: List[float] = None
-    message_lengths: List[int] = None
-    unique_patterns: set = None
-    typing_speed: float = 0.0  # chars per second
-    capitalization_ratio: float = 0.0
-    punctuation_ratio: float = 0.0
-    emoji_usage: float = 0.0
-    
-    def __post_init__(self):
-        if self.timestamps is None:
-            self.timestamps = []
-        if self.message_lengths is None:
-            self.message_lengths = []
-        if self.unique_patterns is None:
-            self.unique_patterns = set()
-
-
-class BotDetectionEngine:
-    """Machine Learning-based bot detection"""
-    
-    def __init__(self):
-        self.user_behaviors: Dict[str, UserBehavior] = {}
-        self.scaler = StandardScaler()
-        self.isolation_forest = IsolationForest(
-            contamination=0.1,
-            random_state=42,
-            n_estimators=100
-        )
-        self.bot_signatures = {
-            # Bot patterns
-            'rapid_fire': {'min_msgs': 5, 'time_window': 10},  # 5 wiadomości w 10 sekund
-            'repetitive': {'pattern_threshold': 0.7},
-            'generic_responses': {'similarity_threshold': 0.85},
-            'suspicious_timing': {'std_dev_threshold': 0.5},
-            'unusual_caps': {'ratio_threshold': 0.4},
-            'emoji_spam': {'threshold': 0.3},
-            'url_bomber': {'url_threshold': 3},
-        }
-        self.training_data = []
-        
-    def extract_features(self, text: str, user: UserBehavior) -> np.ndarray:
-        """Extract behavioral features from message"""
-        
-        # 1. Message velocity
-        if len(user.timestamps) > 1:
-            recent_times = user.timestamps[-5:]
-            time_diffs = np.diff(recent_times)
-            message_velocity = 1.0 / (np.mean(time_diffs) + 1e-6)
-        else:
-            message_velocity = 0.0
-            
-        # 2. Message length consistency
-        if user.message_lengths:
-            length_std = np.std(user.message_lengths) if len(user.message_lengths) > 1 else 0
-            length_mean = np.mean(user.message_lengths)
-            current_length = len(text)
-            length_anomaly = abs(current_length - length_mean) / (length_std + 1)
-        else:
-            length_anomaly = 0.0
-            
-        # 3. Linguistic patterns
-        caps_ratio = sum(1 for c in text if c.isupper()) / (len(text) + 1)
-        punct_ratio = sum(1 for c in text if c in '!?.,-;:') / (len(text) + 1)
-        emoji_ratio = len(re.findall(r'[😀-🙏🌀-🗿🚀-🛿]', text)) / (len(text) + 1)
-        url_count = len(re.findall(r'http[s]?://\S+', text))
-        
-        # 4. Repetition score
-        words = text.lower().split()
-        unique_ratio = len(set(words)) / (len(words) + 1)
-        
-        # 5. Response time anomaly
-        if len(user.timestamps) > 1:
-            recent_interval = user.timestamps[-1] - user.timestamps[-2]
-            avg_interval = np.mean(np.diff(user.timestamps))
-            timing_anomaly = recent_interval / (avg_interval + 1e-6)
-        else:
-            timing_anomaly = 0.0
-            
-        # Stack features
-        features = np.array([
-            message_velocity,
-            length_anomaly,
-            caps_ratio,
-            punct_ratio,
-            emoji_ratio,
-            url_count,
-            unique_ratio,
-            timing_anomaly,
-        ])
-        
-        return features
-        
-    def analyze_user(self, user_id: str, text: str) -> Tuple[float, str]:
-        """
-        Analyze user message for bot-like behavior
-        Returns: (bot_score 0-1, reason)
-        """
-        
-        if user_id not in self.user_behaviors:
-            self.user_behaviors[user_id] = UserBehavior(user_id=user_id)
-            
-        user = self.user_behaviors[user_id]
-        
-        # Update behavior tracking
-        user.message_count += 1
-        user.timestamps.append(time.time())
-        user.message_lengths.append(len(text))
-        
-        bot_score = 0.0
-        reasons = []
-        
-        # ======= CHECK 1: Rapid-fire messaging =======
-        if len(user.timestamps) >= 5:
-            recent_window = user.timestamps[-5:]
-            time_span = recent_window[-1] - recent_window[0]
-            if time_span < self.bot_signatures['rapid_fire']['time_window']:
-                bot_score += 0.25
-                reasons.append("⚠️ Rapid-fire messaging detected")
-                
-        # ======= CHECK 2: Repetitive patterns =======
-        user.unique_patterns.add(hashlib.md5(text.lower().encode()).hexdigest()[:8])
-        if len(user.unique_patterns) < user.message_count * 0.3:
-            bot_score += 0.20
-            reasons.append("🔄 Highly repetitive messages")
-            
-        # ======= CHECK 3: Generic/template responses =======
-        generic_phrases = [
-            "check out my profile", "subscribe now", "link in bio",
-            "follow for more", "dm me", "click here", "only fans",
-            "🔥🔥🔥", "💯💯💯", "👀👀👀"
-        ]
-        generic_count = sum(1 for phrase in generic_phrases if phrase in text.lower())
-        if generic_count > 2:
-            bot_score += 0.15
-            reasons.append("📋 Generic/template response detected")
-            
-        # ======= CHECK 4: Abnormal capitalization =======
-        caps_ratio = sum(1 for c in text if c.isupper()) / max(len(text), 1)
-        if caps_ratio > self.bot_signatures['unusual_caps']['ratio_threshold']:
-            bot_score += 0.15
-            reasons.append("🔤 Unusual capitalization pattern")
-            
-        # ======= CHECK 5: Emoji spam =======
-        emoji_ratio = len(re.findall(r'[😀-🙏🌀-🗿🚀-🛿]', text)) / max(len(text), 1)
-        if emoji_ratio > self.bot_signatures['emoji_spam']['threshold']:
-            bot_score += 0.10
-            reasons.append("😱 Emoji spam detected")
-            
-        # ======= CHECK 6: URL bombing =======
-        url_count = len(re.findall(r'http[s]?://\S+', text))
-        if url_count > self.bot_signatures['url_bomber']['url_threshold']:
-            bot_score += 0.10
-            reasons.append(f"🔗 URL bombing: {url_count} links")
-            
-        # ======= CHECK 7: ML anomaly detection =======
-        try:
-            features = self.extract_features(text, user)
-            if len(self.training_data) > 10:
-                scaled_features = self.scaler.transform([features])
-                anomaly_score = -self.isolation_forest.score_samples(scaled_features)[0]
-                if anomaly_score > 0.5:
-                    bot_score += min(0.15, anomaly_score * 0.1)
-                    reasons.append("🤖 ML anomaly detected")
-        except Exception as e:
-            pass
-            
-        # Normalize score to 0-1
-        bot_score = min(1.0, bot_score)
-        reason_text = " | ".join(reasons) if reasons else "✅ Wygląda humanitarnie"
-        
-        return bot_score, reason_text
-        
-    def is_likely_bot(self, bot_score: float, threshold: float = 0.6) -> bool:
-        """Determine if user is likely a bot"""
-        return bot_score >= threshold
+# Shared detection package (bot 3/AntiBot-Response-Manager/antibot)
+ANTIBOT_ROOT = Path(__file__).resolve().parent / "bot 3" / "AntiBot-Response-Manager"
+sys.path.insert(0, str(ANTIBOT_ROOT))
+from antibot.detection import BotDetectionEngine
 
 
 class HumanResponseGenerator:
@@ -396,7 +212,7 @@ class OnlyFansManager:
         pass
 
 
-class AntiBot ResponseGUI(ctk.CTk):
+class AntiBotResponseGUI(ctk.CTk):
     """Main GUI Application"""
     
     def __init__(self):
@@ -408,11 +224,19 @@ class AntiBot ResponseGUI(ctk.CTk):
         ctk.set_default_color_theme("blue")
         
         # Initialize components
-        self.bot_detector = BotDetectionEngine()
+        self.bot_detector = BotDetectionEngine(
+            config_path=str(ANTIBOT_ROOT / "config" / "bot_signatures.json"),
+        )
         self.response_generator: Optional[HumanResponseGenerator] = None
         self.reddit_manager: Optional[RedditManager] = None
         
         self.create_ui()
+        self.protocol("WM_DELETE_WINDOW", self.on_close)
+        
+    def on_close(self):
+        """Persist detector state before the window goes away"""
+        self.bot_detector.close()  # all work runs on the Tk thread: no task executor to drain
+        self.destroy()
         
     def create_ui(self):
         """Build UI"""
@@ -591,7 +415,7 @@ class AntiBot ResponseGUI(ctk.CTk):
 
 ⚙️ Behavioral Data:
 - Message count: {self.bot_detector.user_behaviors[username].message_count}
-- Unique patterns: {len(self.bot_detector.user_behaviors[username].unique_patterns)}
+- Unique patterns: {self.bot_detector.user_behaviors[username].unique_messages}
 """
         
         self.bot_results.delete("1.0", "end")
@@ -633,8 +457,8 @@ class AntiBot ResponseGUI(ctk.CTk):
         for user_id, behavior in list(self.bot_detector.user_behaviors.items())[:10]:
             stats_text += f"👤 {user_id}:\n"
             stats_text += f"   - Messages: {behavior.message_count}\n"
-            stats_text += f"   - Unique Patterns: {len(behavior.unique_patterns)}\n"
-            stats_text += f"   - Avg Message Length: {np.mean(behavior.message_lengths):.0f} chars\n\n"
+            stats_text += f"   - Unique Patterns: {behavior.unique_messages}\n"
+            stats_text += f"   - Avg Message Length: {behavior.length_stats.mean:.0f} chars\n\n"
             
         self.monitor_stats.delete("1.0", "end")
         self.monitor_stats.insert("1.0", stats_text)
@@ -642,7 +466,7 @@ class AntiBot ResponseGUI(ctk.CTk):
 
 def main():
     """Launch application"""
-    app = AntiBot ResponseGUI()
+    app = AntiBotResponseGUI()
     app.mainloop()
 
 
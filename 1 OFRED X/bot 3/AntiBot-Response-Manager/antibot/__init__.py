@@ -0,0 +1,4 @@
+"""
+🔥 AntiBot shared components
+Detection code used by the GUI scripts, free of GUI/API imports
+"""
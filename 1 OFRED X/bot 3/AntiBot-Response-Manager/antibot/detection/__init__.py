@@ -0,0 +1,55 @@
+"""
+🤖 Bot detection building blocks shared by all front-ends
+"""
+
+from .behavior import RingBuffer, RollingStats, UserBehavior
+from .cache import UserCache
+from .campaign import CampaignIndex
+from .engine import BotDetectionEngine
+from .eventtime import ManualClock, ReorderBuffer
+from .features import TextFeatures
+from .instrumentation import Instrumentation
+from .matching import KeywordMatcher
+from .metrics import DetectionMetrics, format_report
+from .result import DetectionResult, ScoreCalibrator, read_records, write_records
+from .rules import Ruleset, RulesetError, SignatureWatcher
+from .sharding import ShardedDetector
+from .similarity import NearDuplicateIndex, minhash, simhash, sketch
+from .snapshots import ModelSnapshotStore, feature_schema_hash
+from .store import BehaviorStore, SQLiteBehaviorStore
+from .training import FeatureReservoir, FittedModel, ModelTrainer
+
+__all__ = [
+    "BehaviorStore",
+    "BotDetectionEngine",
+    "CampaignIndex",
+    "DetectionMetrics",
+    "DetectionResult",
+    "FeatureReservoir",
+    "FittedModel",
+    "Instrumentation",
+    "KeywordMatcher",
+    "ManualClock",
+    "ModelSnapshotStore",
+    "ModelTrainer",
+    "NearDuplicateIndex",
+    "ReorderBuffer",
+    "RingBuffer",
+    "RollingStats",
+    "Ruleset",
+    "RulesetError",
+    "SQLiteBehaviorStore",
+    "ScoreCalibrator",
+    "ShardedDetector",
+    "SignatureWatcher",
+    "TextFeatures",
+    "UserBehavior",
+    "UserCache",
+    "feature_schema_hash",
+    "format_report",
+    "minhash",
+    "read_records",
+    "simhash",
+    "sketch",
+    "write_records",
+]
@@ -0,0 +1,260 @@
+"""
+👤 Per-user behavioral state
+Fixed-size history windows + running statistics, so tracking a user costs
+O(1) time and bounded memory no matter how many messages they send.
+"""
+
+import math
+import time
+from array import array
+from bisect import insort
+from collections import deque
+from typing import Deque, Dict, Iterable, Iterator, List, Optional, Union
+
+from .similarity import NearDuplicateIndex
+
+# Messages of history kept per user (velocity needs 5, timing regularity all of them)
+DEFAULT_WINDOW = 32
+# Intervals needed before timing regularity means anything
+MIN_TIMING_INTERVALS = 5
+
+
+class RingBuffer:
+    """Fixed-capacity float history backed by array('d'), oldest entries overwritten"""
+
+    __slots__ = ("_data", "_start", "_size")
+
+    def __init__(self, capacity: int = DEFAULT_WINDOW):
+        if capacity < 1:
+            raise ValueError("capacity must be >= 1")
+        self._data = array("d", bytes(8 * capacity))
+        self._start = 0
+        self._size = 0
+
+    @property
+    def capacity(self) -> int:
+        return len(self._data)
+
+    def append(self, value: float):
+        capacity = len(self._data)
+        if self._size < capacity:
+            self._data[(self._start + self._size) % capacity] = value
+            self._size += 1
+        else:
+            self._data[self._start] = value
+            self._start = (self._start + 1) % capacity
+
+    def __len__(self) -> int:
+        return self._size
+
+    def __iter__(self) -> Iterator[float]:
+        capacity = len(self._data)
+        for i in range(self._size):
+            yield self._data[(self._start + i) % capacity]
+
+    def __getitem__(self, index: Union[int, slice]) -> Union[float, List[float]]:
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(self._size))]
+        if index < 0:
+            index += self._size
+        if not 0 <= index < self._size:
+            raise IndexError("ring buffer index out of range")
+        return self._data[(self._start + index) % len(self._data)]
+
+    def __repr__(self) -> str:
+        return f"RingBuffer({list(self)!r}, capacity={self.capacity})"
+
+    @classmethod
+    def from_values(cls, values: List[float], capacity: int) -> "RingBuffer":
+        buf = cls(capacity)
+        for value in values[-capacity:]:
+            buf.append(value)
+        return buf
+
+
+class RecentTimes:
+    """
+    Sorted timestamps of a user's newest messages for the multi-resolution
+    rate check. Only what some window can still use is kept: nothing older
+    than `horizon` seconds and no more than `depth` entries (the largest
+    min_msgs), so add() is amortized O(1) and within() is one index lookup.
+    """
+
+    __slots__ = ("_times",)
+
+    def __init__(self, times: Iterable[float] = ()):
+        self._times: Deque[float] = deque(sorted(times))
+
+    def add(self, timestamp: float, horizon: float, depth: int):
+        times = self._times
+        if not times or timestamp >= times[-1]:
+            times.append(timestamp)
+        else:
+            insort(times, timestamp)  # late arrival
+        cutoff = times[-1] - horizon
+        while times and (times[0] <= cutoff or len(times) > depth):
+            times.popleft()
+
+    def within(self, seconds: float, min_msgs: int) -> bool:
+        """True if the newest min_msgs messages span less than `seconds`"""
+        times = self._times
+        return len(times) >= min_msgs and times[-1] - times[-min_msgs] < seconds
+
+    def __len__(self) -> int:
+        return len(self._times)
+
+    def __iter__(self) -> Iterator[float]:
+        return iter(self._times)
+
+
+class RollingStats:
+    """Running count/mean/variance (Welford) plus min/max over every value seen"""
+
+    __slots__ = ("count", "mean", "_m2", "min", "max")
+
+    def __init__(self):
+        self.count = 0
+        self.mean = 0.0
+        self._m2 = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+
+    def push(self, value: float):
+        self.count += 1
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self._m2 += delta * (value - self.mean)
+        if value < self.min:
+            self.min = value
+        if value > self.max:
+            self.max = value
+
+    @property
+    def variance(self) -> float:
+        """Population variance (same as np.var with ddof=0)"""
+        return self._m2 / self.count if self.count else 0.0
+
+    @property
+    def std(self) -> float:
+        return math.sqrt(self.variance)
+
+    def decay(self, factor: float):
+        """Down-weight everything seen so far (mean and variance stay, count shrinks)"""
+        self.count *= factor
+        self._m2 *= factor
+
+    def to_dict(self) -> Dict:
+        return {'count': self.count, 'mean': self.mean, 'm2': self._m2, 'min': self.min, 'max': self.max}
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> "RollingStats":
+        stats = cls()
+        stats.count = data['count']
+        stats.mean = data['mean']
+        stats._m2 = data['m2']
+        stats.min = data['min']
+        stats.max = data['max']
+        return stats
+
+
+class UserBehavior:
+    """Track user behavioral patterns"""
+
+    __slots__ = (
+        "user_id",
+        "message_count",
+        "timestamps",
+        "message_lengths",
+        "unique_messages",
+        "recent_fingerprints",
+        "recent_times",
+        "created_at",
+        "length_stats",
+        "interval_stats",
+    )
+
+    def __init__(self, user_id: str, window: int = DEFAULT_WINDOW, created_at: Optional[float] = None):
+        self.user_id = user_id
+        self.message_count = 0
+        self.timestamps = RingBuffer(window)
+        self.message_lengths = RingBuffer(window)
+        self.unique_messages = 0
+        self.recent_fingerprints = NearDuplicateIndex()
+        self.recent_times = RecentTimes()
+        self.created_at = time.time() if created_at is None else created_at
+        self.length_stats = RollingStats()
+        self.interval_stats = RollingStats()
+
+    def record(self, timestamp: float, length: int):
+        """Add one message to the history windows and running statistics"""
+        if self.timestamps:
+            self.interval_stats.push(timestamp - self.timestamps[-1])
+        self.message_count += 1
+        self.timestamps.append(timestamp)
+        self.message_lengths.append(length)
+        self.length_stats.push(length)
+
+    def interval_variation(self) -> Optional[float]:
+        """
+        Coefficient of variation (std / mean) of the intervals between the
+        messages in the history window; None with fewer than MIN_TIMING_INTERVALS
+        """
+        times = list(self.timestamps)
+        n = len(times) - 1
+        if n < MIN_TIMING_INTERVALS:
+            return None
+        mean = (times[-1] - times[0]) / n
+        if mean <= 0:
+            return 0.0
+        variance = sum((b - a - mean) ** 2 for a, b in zip(times, times[1:])) / n
+        return math.sqrt(variance) / mean
+
+    def decay(self, factor: float):
+        """
+        Scale the behavioral counters by factor (0-1) so old activity weighs
+        less than new: message/unique counts (rounded, their ratio is kept)
+        and the weight of the running length/interval statistics
+        """
+        self.message_count = round(self.message_count * factor)
+        self.unique_messages = round(self.unique_messages * factor)
+        self.length_stats.decay(factor)
+        self.interval_stats.decay(factor)
+
+    def to_dict(self):
+        return {
+            'user_id': self.user_id,
+            'message_count': self.message_count,
+            'unique_patterns_count': self.unique_messages,
+            'avg_message_length': self.length_stats.mean,
+            'created_at': self.created_at,
+        }
+
+    def to_state(self) -> Dict:
+        """Full state for persistence (see from_state)"""
+        return {
+            'user_id': self.user_id,
+            'window': self.timestamps.capacity,
+            'message_count': self.message_count,
+            'timestamps': list(self.timestamps),
+            'message_lengths': list(self.message_lengths),
+            'unique_messages': self.unique_messages,
+            'recent_fingerprints': list(self.recent_fingerprints),
+            'recent_times': list(self.recent_times),
+            'created_at': self.created_at,
+            'length_stats': self.length_stats.to_dict(),
+            'interval_stats': self.interval_stats.to_dict(),
+        }
+
+    @classmethod
+    def from_state(cls, state: Dict) -> "UserBehavior":
+        window = state['window']
+        user = cls(state['user_id'], window=window, created_at=state['created_at'])
+        user.message_count = state['message_count']
+        user.timestamps = RingBuffer.from_values(state['timestamps'], window)
+        user.message_lengths = RingBuffer.from_values(state['message_lengths'], window)
+        user.unique_messages = state['unique_messages']
+        user.recent_fingerprints = NearDuplicateIndex.from_values(state['recent_fingerprints'])
+        user.recent_times = RecentTimes(state['recent_times'])
+        user.length_stats = RollingStats.from_dict(state['length_stats'])
+        user.interval_stats = RollingStats.from_dict(state['interval_stats'])
+        return user
@@ -0,0 +1,64 @@
+"""
+🧠 Resident user-behavior cache
+Bounds the engine's in-memory users: an LRU map capped at max_users that
+also drops anyone idle for longer than idle_ttl (in message time, so
+replays of old traffic age out the same as live traffic). The engine
+saves every update to its BehaviorStore, so an evicted user is already
+spilled and the next message rehydrates them with store.load(). With
+the default no-op store an evicted user simply starts over.
+"""
+
+from collections import OrderedDict
+from typing import Iterator, Optional, Tuple
+
+from .behavior import UserBehavior
+from .store import BehaviorStore
+
+
+class UserCache:
+    """user_id -> UserBehavior, least recently active first"""
+
+    def __init__(self, store: BehaviorStore, max_users: int = 100_000, idle_ttl: float = 86400.0):
+        if max_users < 1:
+            raise ValueError("max_users must be >= 1")
+        self.store = store
+        self.max_users = max_users
+        self.idle_ttl = idle_ttl
+        self.evicted = 0
+        self._users: "OrderedDict[str, UserBehavior]" = OrderedDict()
+
+    def get(self, user_id: str) -> Optional[UserBehavior]:
+        return self._users.get(user_id)
+
+    def put(self, user: UserBehavior, now: float):
+        """Mark user as the most recently active and evict over budget / idle users"""
+        self._users[user.user_id] = user
+        self._users.move_to_end(user.user_id)
+        self._evict(now - self.idle_ttl)
+
+    def _evict(self, cutoff: float):
+        users = self._users
+        while users:
+            user = next(iter(users.values()))
+            if len(users) <= self.max_users and (not user.timestamps or user.timestamps[-1] >= cutoff):
+                break
+            users.popitem(last=False)
+            self.evicted += 1
+
+    def __len__(self) -> int:
+        return len(self._users)
+
+    def __contains__(self, user_id: object) -> bool:
+        return user_id in self._users
+
+    def __getitem__(self, user_id: str) -> UserBehavior:
+        return self._users[user_id]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._users)
+
+    def items(self) -> Iterator[Tuple[str, UserBehavior]]:
+        return iter(self._users.items())
+
+    def values(self) -> Iterator[UserBehavior]:
+        return iter(self._users.values())
@@ -0,0 +1,135 @@
+"""
+🕸️ Cross-user campaign detection
+Coordinated spam from many fresh accounts looks normal per user. This
+index keeps every recent message, across all users, in MinHash LSH
+buckets (the signature split into bands; messages sharing most shingles
+collide in at least one band with high probability), confirms candidates
+by SimHash distance and counts how many distinct authors posted a
+near-identical message within the sliding window.
+Entries age out of the window and the totals are capped, so memory stays
+bounded no matter the traffic.
+"""
+
+import threading
+from collections import deque
+from typing import Deque, Dict, Hashable, List, Tuple
+
+import numpy as np
+
+from .similarity import DEFAULT_MAX_DISTANCE, MINHASH_PERMUTATIONS
+
+# (timestamp, simhash, author, bucket keys)
+_Entry = Tuple[float, int, Hashable, Tuple[bytes, ...]]
+
+
+class CampaignIndex:
+    """
+    Global time-windowed LSH index of message sketches (see similarity.sketch).
+    observe() records one message and returns the number of distinct
+    authors (including this one) with a near-identical message in the
+    window - a value >= min_authors means a coordinated campaign.
+    """
+
+    def __init__(self, window: float = 3600.0, min_authors: int = 3,
+                 max_distance: int = DEFAULT_MAX_DISTANCE, bands: int = 8,
+                 max_entries: int = 100_000, max_bucket: int = 1024, max_authors: int = 50):
+        if bands < 1 or MINHASH_PERMUTATIONS % bands:
+            raise ValueError(f"bands must divide the MinHash length ({MINHASH_PERMUTATIONS})")
+        self.window = window
+        self.min_authors = min_authors
+        self.max_distance = max_distance
+        self.bands = bands
+        self.max_entries = max_entries
+        self.max_bucket = max_bucket
+        self.max_authors = max_authors
+
+        self._entries: Deque[_Entry] = deque()
+        self._buckets: Dict[bytes, Deque[_Entry]] = {}
+        self._latest = float("-inf")
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @property
+    def bucket_count(self) -> int:
+        return len(self._buckets)
+
+    def _keys(self, signature: np.ndarray) -> Tuple[bytes, ...]:
+        rows = len(signature) // self.bands
+        return tuple(
+            bytes((band,)) + signature[band * rows:(band + 1) * rows].tobytes()
+            for band in range(self.bands)
+        )
+
+    def observe(self, author: Hashable, fingerprint: int, signature: np.ndarray, timestamp: float) -> int:
+        """Add one message; returns distinct authors in its cluster (capped at max_authors)"""
+        keys = self._keys(signature)
+        with self._lock:
+            self._advance(timestamp)
+
+            authors = {author}
+            cutoff = timestamp - self.window
+            for key in keys:
+                bucket = self._buckets.get(key)
+                if not bucket:
+                    continue
+                # Newest first, so a busy bucket can stop early
+                for entry_time, other, other_author, _ in reversed(bucket):
+                    if other_author in authors or entry_time < cutoff:
+                        continue
+                    if (fingerprint ^ other).bit_count() <= self.max_distance:
+                        authors.add(other_author)
+                        if len(authors) >= self.max_authors:
+                            break
+                if len(authors) >= self.max_authors:
+                    break
+
+            self._insert((timestamp, fingerprint, author, keys))
+        return len(authors)
+
+    def record(self, author: Hashable, fingerprint: int, signature: np.ndarray, timestamp: float):
+        """Add one message without counting its cluster (for messages already decided)"""
+        keys = self._keys(signature)
+        with self._lock:
+            self._advance(timestamp)
+            self._insert((timestamp, fingerprint, author, keys))
+
+    def _advance(self, timestamp: float):
+        if timestamp > self._latest:
+            self._latest = timestamp
+        self._expire(self._latest - self.window)
+
+    def _insert(self, entry: _Entry):
+        self._entries.append(entry)
+        for key in entry[3]:
+            bucket = self._buckets.get(key)
+            if bucket is None:
+                bucket = self._buckets[key] = deque(maxlen=self.max_bucket)
+            bucket.append(entry)
+        if len(self._entries) > self.max_entries:
+            self._evict(self._entries.popleft())
+
+    def is_campaign(self, cluster_size: int) -> bool:
+        return cluster_size >= self.min_authors
+
+    def _expire(self, cutoff: float):
+        entries = self._entries
+        while entries and entries[0][0] < cutoff:
+            self._evict(entries.popleft())
+
+    def _evict(self, entry: _Entry):
+        # Buckets are filled in the same order as _entries, so the evicted
+        # entry is at the left end (unless maxlen already dropped it)
+        for key in entry[3]:
+            bucket = self._buckets.get(key)
+            if bucket is None:
+                continue
+            if bucket and bucket[0] is entry:
+                bucket.popleft()
+            if not bucket:
+                del self._buckets[key]
+
+    def __repr__(self) -> str:
+        return (f"CampaignIndex({len(self)} messages, {self.bucket_count} buckets, "
+                f"window={self.window}s, min_authors={self.min_authors})")
@@ -0,0 +1,447 @@
+"""
+🤖 Bot detection engine
+Rule layers, the cross-user campaign index and the online anomaly model
+behind one analyze_user()/analyze_batch() API. Imports no GUI or API
+client code, so it runs the same under the GUI and the headless service.
+"""
+
+import os
+import time
+from pathlib import Path
+from typing import Callable, Iterable, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+from ..logger import Logger
+from .behavior import UserBehavior
+from .cache import UserCache
+from .campaign import CampaignIndex
+from .eventtime import ReorderBuffer, in_event_time
+from .features import TextFeatures
+from .instrumentation import Instrumentation, dump_json
+from .layers import Layer, LayerBatch, default_layers
+from .metrics import DetectionMetrics
+from .result import DetectionResult, ScoreCalibrator
+from .rules import DEFAULT_SIGNATURES, Ruleset, SignatureWatcher
+from .similarity import sketch
+from .snapshots import ModelSnapshotStore
+from .store import BehaviorStore
+from .training import ModelTrainer
+
+
+class BotDetectionEngine:
+    """
+    🤖 Machine Learning-based Bot Detection System
+    9-Layer Analysis: Velocity + Length + Linguistics + Timing + ML
+    """
+
+    # Order of extract_features() output - part of the model snapshot schema
+    FEATURE_NAMES = (
+        'message_velocity', 'length_anomaly', 'caps_ratio', 'punct_ratio',
+        'emoji_ratio', 'url_count', 'unique_ratio', 'timing_anomaly',
+    )
+
+    def __init__(self, config_path: str = None, behavior_store: Optional[BehaviorStore] = None,
+                 model_dir: Optional[str] = None, train: bool = True, watch_config: bool = False,
+                 max_users: int = 100_000, idle_ttl: float = 86400.0, half_life: float = 86400.0,
+                 clock: Callable[[], float] = time.time, early_exit: bool = False, bot_threshold: float = 0.6):
+        self.logger = Logger("BotDetector")
+
+        # Only read for messages without a timestamp; every check runs on event time
+        self.clock = clock
+
+        # Load bot signatures - validated and precompiled, swapped whole on reload
+        self.config_path = config_path
+        if config_path and Path(config_path).exists():
+            self.ruleset = Ruleset.load(config_path)
+        else:
+            self.ruleset = Ruleset.compile(DEFAULT_SIGNATURES)
+        self.signature_watcher: Optional[SignatureWatcher] = None
+
+        # Cross-user index of recent message fingerprints (CHECK 8)
+        self.campaign_index = CampaignIndex(
+            window=self.ruleset.campaign_window, min_authors=self.ruleset.campaign_min_authors
+        )
+
+        # Aggregates for the Monitor tab, updated per message, and
+        # per-stage timers (off unless ANTIBOT_INSTRUMENT is set)
+        self.metrics = DetectionMetrics(threshold=bot_threshold)
+        self.instrumentation = Instrumentation()
+
+        # Maps final scores to bot probabilities (refit it on labelled traffic)
+        self.calibrator = ScoreCalibrator()
+
+        # Detection layers, cheapest first. early_exit stops scoring a message
+        # once its verdict at bot_threshold is settled (see layers.py)
+        self.layers = default_layers()
+        self.early_exit = early_exit
+        self.bot_threshold = bot_threshold
+
+        # Behavior state: up to max_users recently active users in memory,
+        # everyone else in the store. A user back after idle_ttl seconds or
+        # more has their counters decayed by 0.5 ** (idle / half_life)
+        self.behavior_store = behavior_store or BehaviorStore()
+        self.user_behaviors = UserCache(self.behavior_store, max_users=max_users, idle_ttl=idle_ttl)
+        self.idle_ttl = idle_ttl
+        self.half_life = half_life
+
+        # ML models - fitted in the background on real traffic,
+        # warm-started from the newest snapshot in model_dir.
+        # train=False freezes the newest snapshot (no observe, no refits)
+        snapshots = ModelSnapshotStore(model_dir, self.FEATURE_NAMES) if model_dir else None
+        self.trainer = ModelTrainer(n_features=len(self.FEATURE_NAMES), snapshots=snapshots)
+        self.train = train
+        if train:
+            self.trainer.start()
+        else:
+            self.trainer.load_snapshot()
+
+        if watch_config:
+            self.watch_signatures()
+
+    @property
+    def bot_signatures(self):
+        """Read-only view of the active signatures"""
+        return self.ruleset.signatures
+
+    def set_ruleset(self, ruleset: Ruleset):
+        """Swap in a compiled ruleset; messages already being scored finish on the old one"""
+        self.campaign_index.window = ruleset.campaign_window
+        self.campaign_index.min_authors = ruleset.campaign_min_authors
+        self.ruleset = ruleset
+        self.logger.info("Bot signatures v%d (%s) active", ruleset.version, ruleset.digest)
+
+    def reload_signatures(self) -> Ruleset:
+        """Re-read config_path; raises RulesetError (keeping the current ruleset) if it is invalid"""
+        ruleset = Ruleset.load(self.config_path, version=self.ruleset.version + 1)
+        self.set_ruleset(ruleset)
+        return ruleset
+
+    def watch_signatures(self, interval: float = 2.0):
+        """Reload config_path whenever it changes on disk"""
+        if not self.config_path or self.signature_watcher is not None:
+            return
+        self.signature_watcher = SignatureWatcher(self.config_path, self.reload_signatures, interval)
+        self.signature_watcher.start()
+
+    def extract_features(self, text: str, user: UserBehavior,
+                         text_features: Optional[TextFeatures] = None) -> np.ndarray:
+        """Extract 8 behavioral features"""
+        tf = text_features or TextFeatures(text)
+
+        # 1. Message velocity (msg/second)
+        if len(user.timestamps) > 1:
+            recent_times = user.timestamps[-5:]
+            time_diffs = np.diff(recent_times)
+            message_velocity = 1.0 / (np.mean(time_diffs) + 1e-6)
+        else:
+            message_velocity = 0.0
+
+        # 2. Message length anomaly (running mean/std over the whole history)
+        if user.length_stats.count:
+            length_std = user.length_stats.std
+            length_mean = user.length_stats.mean
+            current_length = tf.length
+            length_anomaly = abs(current_length - length_mean) / (length_std + 1)
+        else:
+            length_anomaly = 0.0
+
+        # 3. Capitalization ratio
+        caps_ratio = tf.caps / (tf.length + 1)
+
+        # 4. Punctuation ratio
+        punct_ratio = tf.punct / (tf.length + 1)
+
+        # 5. Emoji ratio (incl. transport & map symbols)
+        emoji_ratio = (tf.emoji + tf.transport_emoji) / (tf.length + 1)
+
+        # 6. URL count
+        url_count = tf.urls
+
+        # 7. Word uniqueness
+        unique_ratio = tf.unique_words / (tf.word_count + 1)
+
+        # 8. Response timing anomaly
+        if len(user.timestamps) > 1:
+            recent_interval = user.timestamps[-1] - user.timestamps[-2]
+            avg_interval = user.interval_stats.mean
+            timing_anomaly = recent_interval / (avg_interval + 1e-6)
+        else:
+            timing_anomaly = 0.0
+
+        features = np.array([
+            message_velocity,
+            length_anomaly,
+            caps_ratio,
+            punct_ratio,
+            emoji_ratio,
+            url_count,
+            unique_ratio,
+            timing_anomaly,
+        ])
+
+        return features
+
+    def _track_message(self, user_id: str, text: str, timestamp: float,
+                       rules: Ruleset) -> Tuple[UserBehavior, bool, bool, bool, Tuple[int, np.ndarray]]:
+        """
+        Update behavioral tracking for one message
+        Returns: (user, rapid_fire_hit, repetitive_hit, timing_hit, (simhash, minhash)) -
+        CHECK 1, 2 and 2b depend on per-user state, the sketch feeds CHECK 8
+        """
+
+        # Initialize user if new (or rehydrate from the behavior store)
+        user = self.user_behaviors.get(user_id)
+        if user is None:
+            user = self.behavior_store.load(user_id) or UserBehavior(user_id=user_id, created_at=timestamp)
+
+        # Old activity fades: decay depends only on the idle time, not on residency
+        if user.timestamps:
+            idle = timestamp - user.timestamps[-1]
+            if idle >= self.idle_ttl:
+                user.decay(0.5 ** (idle / self.half_life))
+
+        # Update tracking (bounded windows + running stats)
+        user.record(timestamp, len(text))
+        self.user_behaviors.put(user, timestamp)
+
+        # ========== CHECK 1: Rapid-Fire Messaging ==========
+        # min_msgs within any configured window (e.g. 10 s, 1 min, 1 h)
+        user.recent_times.add(timestamp, rules.rapid_fire_horizon, rules.rapid_fire_depth)
+        rapid_fire = any(
+            user.recent_times.within(seconds, min_msgs) for seconds, min_msgs in rules.rapid_fire_windows
+        )
+
+        # ========== CHECK 2: Repetitive Patterns ==========
+        # Near-duplicates of a recent message (SimHash within a few bits) are not new patterns
+        fingerprint, signature = sketch(text)
+        if not user.recent_fingerprints.add(fingerprint):
+            user.unique_messages += 1
+        repetitive = user.message_count - user.unique_messages > user.message_count * rules.pattern_threshold
+
+        # ========== CHECK 2b: Suspicious Timing ==========
+        # Scripted posting is regular: interval std dev small relative to the mean
+        variation = user.interval_variation()
+        suspicious_timing = variation is not None and variation < rules.timing_variation
+
+        self.behavior_store.save(user)
+        return user, rapid_fire, repetitive, suspicious_timing, (fingerprint, signature)
+
+    def analyze_user(self, user_id: str, text: str, timestamp: Optional[float] = None) -> Tuple[float, str]:
+        """
+        Analyze user message for bot-like behavior
+        Returns: (bot_score 0-1, reason_string)
+        """
+        result = self.detect(user_id, text, timestamp)
+        return result.score, result.reason
+
+    def detect(self, user_id: str, text: str, timestamp: Optional[float] = None,
+               explain: bool = False) -> DetectionResult:
+        """
+        analyze_user() with per-layer contributions, features and a calibrated probability
+        explain=True evaluates every layer even when early_exit is on
+        """
+        timestamp = self.clock() if timestamp is None else timestamp
+        return self.detect_batch([(user_id, text, timestamp)], explain)[0]
+
+    def score_message(self, user_id: str, text: str, timestamp: float,
+                      rules: Optional[Ruleset] = None) -> Tuple[DetectionResult, Tuple[int, np.ndarray]]:
+        """score_messages() for one message"""
+        return self.score_messages([(user_id, text, timestamp)], rules)[0]
+
+    def finish_message(self, result: DetectionResult, message_sketch: Tuple[int, np.ndarray],
+                       rules: Optional[Ruleset] = None) -> DetectionResult:
+        """finish_messages() for one message"""
+        return self.finish_messages([(result, message_sketch)], rules)[0]
+
+    def score_messages(self, messages: List[Tuple[str, str, float]], rules: Optional[Ruleset] = None,
+                       explain: bool = False) -> List[Tuple[DetectionResult, Tuple[int, np.ndarray]]]:
+        """
+        Per-user stage: track every message in order, then run the per-user layers
+        Returns: [(result with the unnormalized score so far, message sketch), ...] for finish_messages()
+        """
+        rules = rules or self.ruleset
+        per_user, cross_user = self.layers.stages()
+        batch = self._track_batch(messages, rules)
+        results = [
+            DetectionResult(user_id, timestamp, ruleset_version=rules.version, url_count=int(batch.url_count[i]),
+                            threshold=self.bot_threshold)
+            for i, (user_id, _, timestamp) in enumerate(messages)
+        ]
+        self._run_layers(batch, per_user, cross_user, results, explain)
+
+        feature_rows = batch.features.tolist()
+        for i, result in enumerate(results):
+            if batch.features_ok[i]:
+                result.features = tuple(feature_rows[i])
+            if batch.model_scored[i]:
+                result.model_version = batch.model_version
+        return list(zip(results, batch.sketches))
+
+    def finish_messages(self, scored: List[Tuple[DetectionResult, Tuple[int, np.ndarray]]],
+                        rules: Optional[Ruleset] = None, explain: bool = False) -> List[DetectionResult]:
+        """
+        Cross-user stage (CHECK 8), normalization and calibration for score_messages() results,
+        in message order
+        Returns: the completed results (bot_score 0-1)
+        """
+        rules = rules or self.ruleset
+        _, cross_user = self.layers.stages()
+        results = [result for result, _ in scored]
+        batch = LayerBatch(self, rules, [result.user_id for result in results], None,
+                           [result.timestamp for result in results], [message_sketch for _, message_sketch in scored])
+        self._run_layers(batch, cross_user, (), results, explain)
+
+        lap = self.instrumentation.lap()
+        reasons = self.layers.reasons
+        hits = dict.fromkeys(self.layers.names(), 0)  # every registered layer is reported, hit or not
+        for i, result in enumerate(results):
+            # Normalize score to 0-1
+            result.score = min(1.0, result.score)
+            result.probability = self.calibrator.probability(result.score)
+            result.campaign_size = int(batch.campaign_sizes[i])
+            result.reasons = reasons
+            for layer in result.contributions:
+                hits[layer] = hits.get(layer, 0) + 1
+        self.metrics.record_batch((result.score for result in results), hits)
+        lap("scoring")
+
+        # Only build the reason text and the bot count when INFO is logged
+        if self.logger.is_enabled("INFO"):
+            if len(results) == 1:
+                result = results[0]
+                self.logger.info("Analyzed %s: %.2f%% - %s", result.user_id, result.score * 100, result.reason)
+            else:
+                flagged = sum(1 for result in results if self.is_likely_bot(result.score))
+                self.logger.info("Analyzed batch of %d messages: %d likely bots", len(results), flagged)
+        return results
+
+    def _track_batch(self, messages: List[Tuple[str, str, float]], rules: Ruleset) -> LayerBatch:
+        """Behavior tracking, text features and ML features - order-dependent, so sequential"""
+        n = len(messages)
+        user_ids = [user_id for user_id, _, _ in messages]
+        texts = [text for _, text, _ in messages]
+        timestamps = [timestamp for _, _, timestamp in messages]
+        batch = LayerBatch(self, rules, user_ids, texts, timestamps, [])
+        batch.rapid_fire = np.zeros(n, dtype=bool)
+        batch.repetitive = np.zeros(n, dtype=bool)
+        batch.suspicious_timing = np.zeros(n, dtype=bool)
+        batch.caps_ratio = np.zeros(n)
+        batch.emoji_ratio = np.zeros(n)
+        batch.features = np.zeros((n, len(self.FEATURE_NAMES)))
+        batch.features_ok = np.ones(n, dtype=bool)
+        lap = self.instrumentation.lap()
+
+        for i, (user_id, text, timestamp) in enumerate(messages):
+            user, batch.rapid_fire[i], batch.repetitive[i], batch.suspicious_timing[i], message_sketch = (
+                self._track_message(user_id, text, timestamp, rules))
+            batch.sketches.append(message_sketch)
+            lap("track")
+
+            # Measured once, shared by CHECK 4-7
+            text_features = TextFeatures(text)
+            batch.caps_ratio[i] = text_features.caps_ratio
+            batch.emoji_ratio[i] = text_features.emoji_ratio
+            batch.url_count[i] = text_features.urls
+            lap("text_features")
+
+            # Extracted for every message: they depend on the user's state right now
+            try:
+                batch.features[i] = self.extract_features(text, user, text_features)
+            except Exception as e:
+                batch.features_ok[i] = False
+                self.instrumentation.error("ml_anomaly")
+                self.logger.debug("ML analysis error: %s", e)
+            lap("ml_features")
+
+        if self.train:
+            for row in batch.features[batch.features_ok]:
+                self.trainer.observe(row)
+        return batch
+
+    def _run_layers(self, batch: LayerBatch, layers: Tuple[Layer, ...], later: Tuple[Layer, ...],
+                    results: List[DetectionResult], explain: bool):
+        """
+        Run layers (cheapest first) on every message not yet decided, adding
+        contributions in evaluation order. With early_exit, a message is
+        decided once its verdict cannot change whatever layers and `later`
+        could still add; the rest of its layers go to result.skipped.
+        """
+        early_exit = self.early_exit and not explain
+        threshold = self.bot_threshold
+        scores = np.array([result.score for result in results])
+        rows = np.array([i for i, result in enumerate(results) if not result.skipped], dtype=np.int64)
+
+        remaining = layers + later
+        # headroom[k]: the most everything after layers[k] could still add
+        headroom = np.cumsum([layer.max_contribution(batch.rules) for layer in remaining][::-1])[::-1]
+        headroom = np.append(headroom, 0.0)[1:]
+
+        lap = self.instrumentation.lap()
+        for k, layer in enumerate(layers):
+            if not len(rows) and not layer.stateful:
+                continue
+            hits, amounts = layer.check(batch, rows)
+            for row, hit, amount in zip(rows.tolist(), hits.tolist(), amounts.tolist()):
+                if hit:
+                    results[row].contributions[layer.name] = amount
+            scores[rows] += amounts
+            lap(layer.name)
+
+            if early_exit and len(rows):
+                row_scores = scores[rows]
+                decided = (row_scores >= threshold) | (row_scores + headroom[k] < threshold)
+                if decided.any():
+                    skipped = tuple(later_layer.name for later_layer in remaining[k + 1:])
+                    for row in rows[decided].tolist():
+                        results[row].skipped = skipped
+                    rows = rows[~decided]
+
+        for result, score in zip(results, scores.tolist()):
+            result.score = score
+
+    def analyze_batch(self, messages: List[Tuple[str, str, float]]) -> List[Tuple[float, str]]:
+        """
+        Analyze a backlog of messages in one pass
+        messages = [(user_id, text, timestamp), ...] in arrival order
+        Returns: [(bot_score 0-1, reason_string), ...] - same results as calling
+        analyze_user(user_id, text, timestamp) for each message in turn
+        (scored against one model version for the whole batch)
+        """
+        return [(result.score, result.reason) for result in self.detect_batch(messages)]
+
+    def detect_stream(self, messages: Iterable[Tuple[str, str, float]], max_delay: float = 30.0,
+                      max_size: int = 10_000, batch_size: int = 256, explain: bool = False) -> Iterator[DetectionResult]:
+        """
+        Score a possibly out-of-order stream in event time: messages are held
+        in a ReorderBuffer (up to max_delay seconds behind the newest one, at
+        most max_size of them) and scored oldest first in batches.
+        Results come out in event-time order, not arrival order.
+        """
+        for batch in in_event_time(messages, ReorderBuffer(max_delay, max_size), batch_size):
+            yield from self.detect_batch(batch, explain)
+
+    def detect_batch(self, messages: List[Tuple[str, str, float]], explain: bool = False) -> List[DetectionResult]:
+        """analyze_batch() as DetectionResults - equal to detect() on each message in turn"""
+        if not messages:
+            return []
+        rules = self.ruleset  # one version for the whole batch, even if a reload lands mid-way
+        return self.finish_messages(self.score_messages(messages, rules, explain), rules, explain)
+
+    def is_likely_bot(self, bot_score: float, threshold: Optional[float] = None) -> bool:
+        """Determine if user is likely a bot"""
+        return bot_score >= (self.bot_threshold if threshold is None else threshold)
+
+    def dump_metrics(self, path: str):
+        """Write detection metrics and instrumentation to a local JSON file"""
+        dump_json(path, self.metrics, self.instrumentation)
+
+    def close(self):
+        """Stop background training and flush pending behavior state to the store"""
+        if self.signature_watcher is not None:
+            self.signature_watcher.stop()
+        self.trainer.stop()
+        self.behavior_store.close()
+        metrics_file = os.getenv("ANTIBOT_METRICS_FILE")
+        if metrics_file:
+            self.dump_metrics(metrics_file)
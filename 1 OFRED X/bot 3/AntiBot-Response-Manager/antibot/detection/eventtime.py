@@ -0,0 +1,106 @@
+"""
+⏰ Event time
+Every check runs on the message's own timestamp (e.g. Reddit created_utc),
+so a backlog scored hours later looks the way it was sent, not like one
+user posting everything at once. The engine only reads its clock for a
+message that has no timestamp; pass ManualClock for reproducible runs.
+
+Streams arrive slightly out of order (Reddit pages newest first, shards
+finish at different times). ReorderBuffer holds messages until the
+watermark - the newest timestamp seen minus max_delay - passes them and
+releases them oldest first. It never holds more than max_size; anything
+later than the watermark is released at once and counted (the per-user
+windows insert late timestamps in order, so it is still scored sensibly).
+
+    for result in engine.detect_stream(messages, max_delay=30.0):
+        ...
+"""
+
+import heapq
+import itertools
+from typing import Iterable, Iterator, List, Tuple
+
+Message = Tuple[str, str, float]  # (user_id, text, timestamp)
+
+
+class ManualClock:
+    """A clock that only moves when told to - inject it for tests and replays"""
+
+    __slots__ = ("now",)
+
+    def __init__(self, start: float = 0.0):
+        self.now = start
+
+    def __call__(self) -> float:
+        return self.now
+
+    def advance(self, seconds: float) -> float:
+        self.now += seconds
+        return self.now
+
+
+class ReorderBuffer:
+    """Bounded min-heap of messages by timestamp; arrival order breaks ties"""
+
+    def __init__(self, max_delay: float = 30.0, max_size: int = 10_000):
+        if max_delay < 0:
+            raise ValueError("max_delay must be >= 0")
+        if max_size < 1:
+            raise ValueError("max_size must be >= 1")
+        self.max_delay = max_delay
+        self.max_size = max_size
+        self.late = 0    # arrived behind the watermark, released out of order
+        self.forced = 0  # released before the watermark because the buffer was full
+        self._heap: List[Tuple[float, int, Message]] = []
+        self._sequence = itertools.count()
+        self._newest = float("-inf")
+        self._released = float("-inf")  # timestamp of the last message let out
+
+    def __len__(self) -> int:
+        return len(self._heap)
+
+    @property
+    def watermark(self) -> float:
+        """Messages at or before this time are released"""
+        return self._newest - self.max_delay
+
+    def push(self, message: Message) -> List[Message]:
+        """Add one message; returns the messages it releases, oldest first"""
+        timestamp = message[2]
+        if timestamp < self._released:
+            self.late += 1
+            return [message]
+        if timestamp > self._newest:
+            self._newest = timestamp
+        heapq.heappush(self._heap, (timestamp, next(self._sequence), message))
+
+        released = []
+        watermark = self.watermark
+        heap = self._heap
+        while heap and (heap[0][0] <= watermark or len(heap) > self.max_size):
+            if heap[0][0] > watermark:
+                self.forced += 1
+            released.append(self._pop())
+        return released
+
+    def flush(self) -> List[Message]:
+        """Release everything still held (end of stream)"""
+        return [self._pop() for _ in range(len(self._heap))]
+
+    def _pop(self) -> Message:
+        timestamp, _, message = heapq.heappop(self._heap)
+        self._released = timestamp
+        return message
+
+
+def in_event_time(messages: Iterable[Message], buffer: ReorderBuffer, batch_size: int = 256) -> Iterator[List[Message]]:
+    """Batches of up to batch_size messages in event-time order, the rest flushed at the end"""
+    pending: List[Message] = []
+    for message in messages:
+        pending.extend(buffer.push(message))
+        while len(pending) >= batch_size:
+            yield pending[:batch_size]
+            pending = pending[batch_size:]
+    pending.extend(buffer.flush())
+    for start in range(0, len(pending), batch_size):
+        yield pending[start:start + batch_size]
@@ -0,0 +1,49 @@
+"""
+📐 Text features shared by the rule checks and the ML layer
+Every message is measured once; the caps/emoji/URL checks and
+extract_features() all read the same TextFeatures instead of re-scanning
+the text with their own regexes.
+"""
+
+import re
+
+# Emoji ranges used by the detectors (compiled once, not per call)
+EMOJI_RE = re.compile(r'[😀-🙏🌀-🗿]')          # emoticons + symbols & pictographs
+TRANSPORT_EMOJI_RE = re.compile(r'[🚀-🛿]')     # transport & map symbols
+URL_RE = re.compile(r'http[s]?://\S+')
+PUNCTUATION = '!?.,-;:'
+
+
+class TextFeatures:
+    """
+    Counts for one message. Each count is a single C-level scan
+    (str.isupper via map, str.count, precompiled regex) - measured faster
+    than one Python-level loop over the characters doing all of them.
+    """
+
+    __slots__ = ("length", "word_count", "unique_words", "caps", "punct", "emoji", "transport_emoji", "urls")
+
+    def __init__(self, text: str):
+        self.length = len(text)
+        words = text.lower().split()
+        self.word_count = len(words)
+        self.unique_words = len(set(words))
+        self.caps = sum(map(str.isupper, text))
+        self.punct = sum(map(text.count, PUNCTUATION))
+        self.emoji = len(EMOJI_RE.findall(text))
+        self.transport_emoji = len(TRANSPORT_EMOJI_RE.findall(text))
+        self.urls = len(URL_RE.findall(text))
+
+    @property
+    def caps_ratio(self) -> float:
+        """Uppercase share of the message (rule-check denominator)"""
+        return self.caps / max(self.length, 1)
+
+    @property
+    def emoji_ratio(self) -> float:
+        """Emoji share of the message (rule-check denominator)"""
+        return self.emoji / max(self.length, 1)
+
+    def __repr__(self) -> str:
+        fields = ", ".join(f"{name}={getattr(self, name)}" for name in self.__slots__)
+        return f"TextFeatures({fields})"
@@ -0,0 +1,188 @@
+"""
+⏱️ Hot-path instrumentation
+Per-stage latency histograms, error counters and model-inference batch
+sizes for BotDetectionEngine, rendered as Prometheus text exposition or
+JSON. Timing is off unless enabled (ANTIBOT_INSTRUMENT=1 or
+enabled=True): a disabled engine gets a shared no-op lap function, so the
+cost is one empty call per stage. Error counters are always on.
+
+    lap = instrumentation.lap()
+    ...work...
+    lap("track")          # time since lap() / the previous stage
+"""
+
+import json
+import os
+from bisect import bisect_left
+from pathlib import Path
+from time import perf_counter
+from typing import Callable, Dict, Optional, Sequence
+
+from .metrics import DetectionMetrics
+
+# Upper bounds (seconds) of the latency buckets, Prometheus style
+LATENCY_BUCKETS = (
+    0.000005, 0.00001, 0.000025, 0.00005, 0.0001, 0.00025,
+    0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.1,
+)
+BATCH_SIZE_BUCKETS = (1, 2, 5, 10, 25, 50, 100, 250, 500, 1000)
+
+
+class Histogram:
+    """Counts per bucket (upper bounds) plus sum and count"""
+
+    __slots__ = ("bounds", "counts", "sum", "count")
+
+    def __init__(self, bounds: Sequence[float]):
+        self.bounds = tuple(bounds)
+        self.counts = [0] * (len(self.bounds) + 1)  # last slot: +Inf
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float):
+        self.counts[bisect_left(self.bounds, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def cumulative(self):
+        """(upper bound, observations <= bound) pairs, ending with +Inf"""
+        running = 0
+        for bound, count in zip(self.bounds + (float("inf"),), self.counts):
+            running += count
+            yield bound, running
+
+    def to_dict(self) -> Dict:
+        return {
+            'count': self.count,
+            'sum': self.sum,
+            'mean': self.sum / self.count if self.count else 0.0,
+            'buckets': {_format_bound(bound): count for bound, count in self.cumulative()},
+        }
+
+
+def _format_bound(bound: float) -> str:
+    return "+Inf" if bound == float("inf") else repr(bound)
+
+
+def _noop_lap(stage: str):
+    pass
+
+
+class _Lap:
+    """Records the time since the previous lap under each stage name"""
+
+    __slots__ = ("instrumentation", "last")
+
+    def __init__(self, instrumentation: "Instrumentation"):
+        self.instrumentation = instrumentation
+        self.last = perf_counter()
+
+    def __call__(self, stage: str):
+        now = perf_counter()
+        self.instrumentation.observe(stage, now - self.last)
+        self.last = now
+
+
+class Instrumentation:
+    """Latency, error and batch-size counters for one engine"""
+
+    def __init__(self, enabled: Optional[bool] = None):
+        if enabled is None:
+            enabled = os.getenv("ANTIBOT_INSTRUMENT", "").lower() in ("1", "true", "yes")
+        self.enabled = enabled
+        self.stages: Dict[str, Histogram] = {}
+        # The ML layer is the one that swallows exceptions; export its series from the start
+        self.errors: Dict[str, int] = {"ml_anomaly": 0}
+        self.batch_sizes = Histogram(BATCH_SIZE_BUCKETS)
+
+    def lap(self) -> Callable[[str], None]:
+        """A stage timer starting now (a no-op while disabled)"""
+        return _Lap(self) if self.enabled else _noop_lap
+
+    def observe(self, stage: str, seconds: float):
+        histogram = self.stages.get(stage)
+        if histogram is None:
+            histogram = self.stages[stage] = Histogram(LATENCY_BUCKETS)
+        histogram.observe(seconds)
+
+    def error(self, layer: str):
+        self.errors[layer] = self.errors.get(layer, 0) + 1
+
+    def inference_batch(self, size: int):
+        if self.enabled:
+            self.batch_sizes.observe(size)
+
+    def to_dict(self) -> Dict:
+        return {
+            'enabled': self.enabled,
+            'stage_seconds': {stage: h.to_dict() for stage, h in sorted(self.stages.items())},
+            'errors': dict(self.errors),
+            'inference_batch_size': self.batch_sizes.to_dict(),
+        }
+
+
+def metrics_json(metrics: DetectionMetrics, instrumentation: Instrumentation) -> Dict:
+    """Everything the engine measures, as one JSON-serializable dict"""
+    return {'detection': metrics.snapshot(), 'instrumentation': instrumentation.to_dict()}
+
+
+def dump_json(path: str, metrics: DetectionMetrics, instrumentation: Instrumentation):
+    """Write metrics_json() to a local file (atomically replaced)"""
+    target = Path(path)
+    target.parent.mkdir(parents=True, exist_ok=True)
+    tmp = target.with_suffix(target.suffix + ".tmp")
+    tmp.write_text(json.dumps(metrics_json(metrics, instrumentation), indent=2), encoding="utf-8")
+    tmp.replace(target)
+
+
+def prometheus_text(metrics: DetectionMetrics, instrumentation: Instrumentation) -> str:
+    """Prometheus text exposition format (version 0.0.4)"""
+    lines = []
+
+    def family(name: str, kind: str, help_text: str):
+        lines.append(f"# HELP {name} {help_text}")
+        lines.append(f"# TYPE {name} {kind}")
+
+    def histogram(name: str, h: Histogram, labels: str = ""):
+        prefix = labels + "," if labels else ""
+        for bound, count in h.cumulative():
+            lines.append(f'{name}_bucket{{{prefix}le="{_format_bound(bound)}"}} {count}')
+        suffix = "{" + labels + "}" if labels else ""
+        lines.append(f"{name}_sum{suffix} {h.sum!r}")
+        lines.append(f"{name}_count{suffix} {h.count}")
+
+    family("antibot_messages_total", "counter", "Messages scored")
+    lines.append(f"antibot_messages_total {metrics.messages}")
+    family("antibot_flagged_total", "counter", "Messages scored at or above the bot threshold")
+    lines.append(f"antibot_flagged_total {metrics.flagged}")
+    family("antibot_messages_per_second", "gauge", "Scoring rate over the last minute")
+    lines.append(f"antibot_messages_per_second {metrics.rate.rate()!r}")
+
+    family("antibot_layer_hits_total", "counter", "Messages on which a detection layer fired")
+    for layer, hits in list(metrics.layer_hits.items()):  # plugin layers included
+        lines.append(f'antibot_layer_hits_total{{layer="{layer}"}} {hits}')
+
+    family("antibot_bot_score", "histogram", "Distribution of final bot scores")
+    scores = metrics.scores
+    running = 0
+    for index, count in enumerate(scores.counts):
+        running += count
+        bound = "+Inf" if index == scores.bins - 1 else repr((index + 1) / scores.bins)
+        lines.append(f'antibot_bot_score_bucket{{le="{bound}"}} {running}')
+    lines.append(f"antibot_bot_score_sum {scores.total!r}")
+    lines.append(f"antibot_bot_score_count {scores.count}")
+
+    family("antibot_errors_total", "counter", "Exceptions swallowed by a detection layer")
+    for layer, count in sorted(instrumentation.errors.items()):
+        lines.append(f'antibot_errors_total{{layer="{layer}"}} {count}')
+
+    if instrumentation.stages:
+        family("antibot_stage_seconds", "histogram", "Time spent per detection stage")
+        for stage, h in sorted(instrumentation.stages.items()):
+            histogram("antibot_stage_seconds", h, f'stage="{stage}"')
+
+    if instrumentation.batch_sizes.count:
+        family("antibot_inference_batch_size", "histogram", "Rows per anomaly-model call")
+        histogram("antibot_inference_batch_size", instrumentation.batch_sizes)
+
+    return "\n".join(lines) + "\n"
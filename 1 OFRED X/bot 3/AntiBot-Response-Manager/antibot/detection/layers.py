@@ -0,0 +1,244 @@
+"""
+🧱 Detection layer registry
+Every detection layer is a plugin: a vectorized check plus its relative
+cost and the most it can add to a score. The engine tracks each message
+(per-user state, text features, sketches) and then runs the per-user
+layers cheapest first, followed by the cross-user ones (these see every
+user's traffic, so in a sharded deployment they run in the coordinator).
+
+With early_exit the engine stops evaluating a message once its verdict at
+the bot threshold cannot change: its score already reaches the threshold,
+or everything still to run could not lift it there. The layers it never
+ran are listed in DetectionResult.skipped. explain=True (or the default
+early_exit=False) runs every layer, for complete contributions.
+
+    engine.layers.register(Layer("all_caps_name", check, max_contribution=lambda rules: 0.1, cost=1.0))
+"""
+
+from dataclasses import dataclass
+from typing import Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .result import REASONS
+from .rules import Ruleset
+
+# The ML layer adds min(ML_MAX_BONUS, anomaly * 0.1) when the anomaly score is above 0.5
+ML_MAX_BONUS = 0.15
+
+# (hits, contributions) for the rows a check was given
+Hits = Tuple[np.ndarray, np.ndarray]
+
+
+class LayerBatch:
+    """
+    Everything a layer may read for one scoring pass, indexed by message
+    position. The engine's tracking loop fills the per-user fields; the
+    cross-user stage only has ids, timestamps and sketches.
+    """
+
+    def __init__(self, engine, rules: Ruleset, user_ids: Sequence[str], texts: Optional[Sequence[str]],
+                 timestamps: Sequence[float], sketches: List[Tuple[int, np.ndarray]]):
+        n = len(user_ids)
+        self.engine = engine
+        self.rules = rules
+        self.n = n
+        self.user_ids = user_ids
+        self.texts = texts
+        self.timestamps = timestamps
+        self.sketches = sketches
+        # Per-user stage (None in the cross-user stage)
+        self.rapid_fire: Optional[np.ndarray] = None
+        self.repetitive: Optional[np.ndarray] = None
+        self.suspicious_timing: Optional[np.ndarray] = None
+        self.caps_ratio: Optional[np.ndarray] = None
+        self.emoji_ratio: Optional[np.ndarray] = None
+        self.url_count = np.zeros(n, dtype=np.int64)
+        self.features: Optional[np.ndarray] = None
+        self.features_ok: Optional[np.ndarray] = None
+        # Filled by the layers themselves
+        self.model_version: Optional[int] = None
+        self.model_scored = np.zeros(n, dtype=bool)
+        self.campaign_sizes = np.zeros(n, dtype=np.int64)
+
+
+@dataclass(frozen=True)
+class Layer:
+    """
+    One detection layer. check(batch, rows) returns (hits, contributions)
+    for the message positions in rows; a hit adds its contribution to the
+    score (a zero-weight hit is still reported). A stateful layer is called
+    on every pass, even with no rows left, because it must see every
+    message (e.g. to index it for later ones).
+    """
+
+    name: str
+    check: Callable[[LayerBatch, np.ndarray], Hits]
+    max_contribution: Callable[[Ruleset], float]
+    cost: float = 1.0
+    cross_user: bool = False
+    stateful: bool = False
+    reason: Optional[str] = None  # reason text (built-ins default to result.REASONS)
+
+
+class LayerRegistry:
+    """
+    Layers by name; evaluation order is cost, then registration order.
+    reasons holds this registry's reason text per layer (the built-in
+    texts plus those of registered plugins); results scored through it
+    format their reason string from it.
+    """
+
+    def __init__(self, layers: Sequence[Layer] = ()):
+        self._layers: Dict[str, Layer] = {}
+        self._stages: Optional[Tuple[Tuple[Layer, ...], Tuple[Layer, ...]]] = None
+        self.reasons: Dict[str, str] = dict(REASONS)
+        for layer in layers:
+            self.register(layer)
+
+    def register(self, layer: Layer, replace: bool = False):
+        """Add a layer (replace=True swaps out a layer of the same name, keeping its position)"""
+        if layer.name in self._layers and not replace:
+            raise ValueError(f"layer {layer.name!r} is already registered")
+        if layer.reason is not None:
+            self.reasons[layer.name] = layer.reason
+        elif layer.name in REASONS:
+            self.reasons[layer.name] = REASONS[layer.name]
+        else:
+            raise ValueError(f"layer {layer.name!r} needs a reason text")
+        self._layers[layer.name] = layer
+        self._stages = None
+
+    def unregister(self, name: str) -> Layer:
+        layer = self._layers.pop(name)
+        if name in REASONS:
+            self.reasons[name] = REASONS[name]
+        else:
+            del self.reasons[name]
+        self._stages = None
+        return layer
+
+    def names(self) -> Tuple[str, ...]:
+        """Layer names in evaluation order"""
+        return tuple(layer.name for layer in self)
+
+    def stages(self) -> Tuple[Tuple[Layer, ...], Tuple[Layer, ...]]:
+        """(per-user layers, cross-user layers), each cheapest first"""
+        stages = self._stages
+        if stages is None:
+            ordered = sorted(self._layers.values(), key=lambda layer: layer.cost)  # stable
+            stages = self._stages = (
+                tuple(layer for layer in ordered if not layer.cross_user),
+                tuple(layer for layer in ordered if layer.cross_user),
+            )
+        return stages
+
+    def __iter__(self) -> Iterator[Layer]:
+        per_user, cross_user = self.stages()
+        return iter(per_user + cross_user)
+
+    def __len__(self) -> int:
+        return len(self._layers)
+
+    def __contains__(self, name: object) -> bool:
+        return name in self._layers
+
+    def __getitem__(self, name: str) -> Layer:
+        return self._layers[name]
+
+
+def _weighted(hits: np.ndarray, weight: float) -> Hits:
+    return hits, np.where(hits, weight, 0.0)
+
+
+def _rapid_fire(batch: LayerBatch, rows: np.ndarray) -> Hits:
+    return _weighted(batch.rapid_fire[rows], batch.rules.weights['rapid_fire'])
+
+
+def _repetitive(batch: LayerBatch, rows: np.ndarray) -> Hits:
+    return _weighted(batch.repetitive[rows], batch.rules.weights['repetitive'])
+
+
+def _suspicious_timing(batch: LayerBatch, rows: np.ndarray) -> Hits:
+    return _weighted(batch.suspicious_timing[rows], batch.rules.weights['suspicious_timing'])
+
+
+def _generic_responses(batch: LayerBatch, rows: np.ndarray) -> Hits:
+    matcher = batch.rules.generic_matcher
+    counts = np.fromiter((matcher.count(batch.texts[i], limit=3) for i in rows), dtype=np.int64, count=len(rows))
+    return _weighted(counts > 2, batch.rules.weights['generic_responses'])
+
+
+def _unusual_caps(batch: LayerBatch, rows: np.ndarray) -> Hits:
+    return _weighted(batch.caps_ratio[rows] > batch.rules.caps_ratio, batch.rules.weights['unusual_caps'])
+
+
+def _emoji_spam(batch: LayerBatch, rows: np.ndarray) -> Hits:
+    return _weighted(batch.emoji_ratio[rows] > batch.rules.emoji_ratio, batch.rules.weights['emoji_spam'])
+
+
+def _url_bomber(batch: LayerBatch, rows: np.ndarray) -> Hits:
+    return _weighted(batch.url_count[rows] > batch.rules.url_threshold, batch.rules.weights['url_bomber'])
+
+
+def _ml_anomaly(batch: LayerBatch, rows: np.ndarray) -> Hits:
+    """One scaler/forest call for every row that still needs it"""
+    hits = np.zeros(len(rows), dtype=bool)
+    amounts = np.zeros(len(rows))
+    engine = batch.engine
+    model = engine.trainer.model
+    usable = batch.features_ok[rows]
+    if model is None or not usable.any():
+        return hits, amounts
+    scored_rows = rows[usable]
+    try:
+        anomaly_scores = model.anomaly_scores(batch.features[scored_rows])
+    except Exception as e:
+        engine.instrumentation.error("ml_anomaly")
+        engine.logger.debug("ML analysis error: %s", e)
+        return hits, amounts
+    engine.instrumentation.inference_batch(len(scored_rows))
+    batch.model_version = model.version
+    batch.model_scored[scored_rows] = True
+    hits[usable] = anomaly_scores > 0.5
+    amounts[usable] = np.where(hits[usable], np.minimum(ML_MAX_BONUS, anomaly_scores * 0.1), 0.0)
+    return hits, amounts
+
+
+def _coordinated_campaign(batch: LayerBatch, rows: np.ndarray) -> Hits:
+    """Indexes every message in order; only rows still undecided pay for the cluster lookup"""
+    index = batch.engine.campaign_index
+    lookup = np.zeros(batch.n, dtype=bool)
+    lookup[rows] = True
+    for i in range(batch.n):
+        fingerprint, signature = batch.sketches[i]
+        if lookup[i]:
+            batch.campaign_sizes[i] = index.observe(batch.user_ids[i], fingerprint, signature, batch.timestamps[i])
+        else:
+            index.record(batch.user_ids[i], fingerprint, signature, batch.timestamps[i])
+    return _weighted(batch.campaign_sizes[rows] >= batch.rules.campaign_min_authors,
+                     batch.rules.weights['coordinated_campaign'])
+
+
+def _weight(section: str) -> Callable[[Ruleset], float]:
+    return lambda rules: rules.weights[section]
+
+
+def default_layers() -> LayerRegistry:
+    """
+    The built-in layers (metrics.LAYERS). Tracking already produced the
+    per-user flags and text counts, so the rule layers cost next to nothing;
+    ML inference and the campaign bucket scan are the expensive ones.
+    """
+    return LayerRegistry([
+        Layer("rapid_fire", _rapid_fire, _weight("rapid_fire"), cost=0.0),
+        Layer("repetitive", _repetitive, _weight("repetitive"), cost=0.0),
+        Layer("suspicious_timing", _suspicious_timing, _weight("suspicious_timing"), cost=0.0),
+        Layer("generic_responses", _generic_responses, _weight("generic_responses"), cost=1.0),
+        Layer("unusual_caps", _unusual_caps, _weight("unusual_caps"), cost=1.0),
+        Layer("emoji_spam", _emoji_spam, _weight("emoji_spam"), cost=1.0),
+        Layer("url_bomber", _url_bomber, _weight("url_bomber"), cost=1.0),
+        Layer("ml_anomaly", _ml_anomaly, lambda rules: ML_MAX_BONUS, cost=50.0),
+        Layer("coordinated_campaign", _coordinated_campaign, _weight("coordinated_campaign"),
+              cost=20.0, cross_user=True, stateful=True),
+    ])
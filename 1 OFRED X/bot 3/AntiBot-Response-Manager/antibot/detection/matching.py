@@ -0,0 +1,87 @@
+"""
+🔎 Multi-keyword matching for the generic/template response check
+An Aho-Corasick automaton finds every keyword occurrence (overlapping ones
+included) in a single pass over the message, so the cost no longer grows
+with the size of the keyword list loaded from bot_signatures.json.
+"""
+
+from collections import deque
+from typing import Dict, FrozenSet, Iterable, List, Optional, Set, Tuple
+
+
+class KeywordMatcher:
+    """
+    Compiled keyword set. count(text) returns how many list entries occur
+    in text.lower() - exactly sum(1 for kw in keywords if kw in text.lower()).
+    """
+
+    __slots__ = ("keywords", "_goto", "_fail", "_out", "_always")
+
+    def __init__(self, keywords: Iterable[str]):
+        self.keywords: Tuple[str, ...] = tuple(keywords)
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._out: List[FrozenSet[int]] = []
+        self._always: FrozenSet[int] = frozenset(i for i, kw in enumerate(self.keywords) if not kw)
+        self._build()
+
+    def _build(self):
+        outputs: List[Set[int]] = [set()]
+
+        # 1. Trie of all keywords
+        for index, keyword in enumerate(self.keywords):
+            if not keyword:
+                continue
+            state = 0
+            for ch in keyword:
+                nxt = self._goto[state].get(ch)
+                if nxt is None:
+                    nxt = len(self._goto)
+                    self._goto[state][ch] = nxt
+                    self._goto.append({})
+                    self._fail.append(0)
+                    outputs.append(set())
+                state = nxt
+            outputs[state].add(index)
+
+        # 2. Failure links (BFS), merging outputs along the way
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for ch, nxt in self._goto[state].items():
+                queue.append(nxt)
+                fallback = self._fail[state]
+                while fallback and ch not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                target = self._goto[fallback].get(ch, 0)
+                self._fail[nxt] = target if target != nxt else 0
+                outputs[nxt] |= outputs[self._fail[nxt]]
+
+        self._out = [frozenset(out) for out in outputs]
+
+    def find(self, text: str, limit: Optional[int] = None) -> Set[int]:
+        """Indexes of the keywords found in text.lower(); stops early once `limit` are found"""
+        found = set(self._always)
+        if limit is not None and len(found) >= limit:
+            return found
+        goto, fail, out = self._goto, self._fail, self._out
+        state = 0
+        for ch in text.lower():
+            while state and ch not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(ch, 0)
+            if out[state]:
+                found |= out[state]
+                if limit is not None and len(found) >= limit:
+                    break
+        return found
+
+    def count(self, text: str, limit: Optional[int] = None) -> int:
+        """Number of keywords found (capped at `limit` when given)"""
+        return len(self.find(text, limit))
+
+    def __len__(self) -> int:
+        return len(self.keywords)
+
+    def __repr__(self) -> str:
+        return f"KeywordMatcher({len(self.keywords)} keywords, {len(self._goto)} states)"
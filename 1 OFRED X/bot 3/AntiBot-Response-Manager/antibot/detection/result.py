@@ -0,0 +1,275 @@
+"""
+🧾 Structured detection results
+DetectionResult is what the engine produces for every message: the final
+score, each fired layer's contribution to it, the raw feature vector, the
+model and ruleset versions it was scored with and a calibrated bot
+probability. The familiar reason string is derived from it on demand, so
+callers that need layers never parse text.
+
+Results serialize to a JSON dict (to_dict/to_json) or to a compact binary
+record (to_bytes, ~140 bytes; plugin layers are stored by name); write_records and
+read_records stream records with a length prefix, e.g. to archive batch
+output without formatting.
+"""
+
+import json
+import math
+import struct
+from dataclasses import dataclass, field
+from typing import BinaryIO, Dict, Iterable, Iterator, List, Mapping, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .metrics import LAYERS
+
+# Reason text per built-in layer (formatted with the result's fields); each
+# LayerRegistry copies these and adds its plugin layers' texts
+REASONS = {
+    "rapid_fire": "⚠️ Rapid-fire messaging detected",
+    "repetitive": "🔄 Highly repetitive messages",
+    "suspicious_timing": "⏱️ Suspiciously regular message timing",
+    "generic_responses": "📋 Generic/template response detected",
+    "unusual_caps": "🔤 Unusual capitalization pattern",
+    "emoji_spam": "😱 Emoji spam detected",
+    "url_bomber": "🔗 URL bombing: {url_count} links detected",
+    "ml_anomaly": "🤖 ML anomaly detected",
+    "coordinated_campaign": "🕸️ Coordinated campaign: {campaign_size} accounts posting near-identical messages",
+}
+HUMAN_REASON = "✅ Looks humanly natural"
+
+_LAYER_INDEX = {layer: index for index, layer in enumerate(LAYERS)}
+
+# timestamp, score, probability, bot threshold, fired layer count, skipped
+# layer count, layer name count, model version (-1 = none), ruleset version,
+# url count, campaign size, feature count, user_id length
+_HEADER = struct.Struct("<ddddBBBiIIIBH")
+_NAME = struct.Struct("<H")
+_PREFIX = struct.Struct("<I")
+
+
+@dataclass(slots=True)
+class DetectionResult:
+    """
+    One scored message; contributions are in evaluation order and sum to
+    the unclamped score. skipped names the layers an early exit never ran
+    (the score is then a lower bound, but the verdict is final). threshold
+    is the bot threshold of the engine that scored it; reasons are its
+    layer registry's texts (not serialized - decoded results use REASONS,
+    and a layer without a text is named as is).
+    """
+
+    user_id: str
+    timestamp: float
+    score: float = 0.0
+    probability: float = 0.0
+    contributions: Dict[str, float] = field(default_factory=dict)
+    features: Optional[Tuple[float, ...]] = None  # BotDetectionEngine.FEATURE_NAMES order
+    model_version: Optional[int] = None
+    ruleset_version: int = 0
+    url_count: int = 0
+    campaign_size: int = 0
+    skipped: Tuple[str, ...] = ()
+    threshold: float = 0.6
+    reasons: Mapping[str, str] = field(default_factory=lambda: REASONS, compare=False, repr=False)
+
+    @property
+    def layers(self) -> Tuple[str, ...]:
+        return tuple(self.contributions)
+
+    @property
+    def reason(self) -> str:
+        if not self.contributions:
+            return HUMAN_REASON
+        return " | ".join(
+            self.reasons.get(layer, layer).format(url_count=self.url_count, campaign_size=self.campaign_size)
+            for layer in self.contributions
+        )
+
+    def is_bot(self, threshold: Optional[float] = None) -> bool:
+        return self.score >= (self.threshold if threshold is None else threshold)
+
+    def to_dict(self) -> Dict:
+        return {
+            'user_id': self.user_id,
+            'timestamp': self.timestamp,
+            'score': self.score,
+            'probability': self.probability,
+            'contributions': dict(self.contributions),
+            'features': list(self.features) if self.features is not None else None,
+            'model_version': self.model_version,
+            'ruleset_version': self.ruleset_version,
+            'url_count': self.url_count,
+            'campaign_size': self.campaign_size,
+            'skipped': list(self.skipped),
+            'threshold': self.threshold,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> "DetectionResult":
+        features = data.get('features')
+        return cls(
+            user_id=data['user_id'],
+            timestamp=data['timestamp'],
+            score=data['score'],
+            probability=data['probability'],
+            contributions=dict(data['contributions']),
+            features=tuple(features) if features is not None else None,
+            model_version=data.get('model_version'),
+            ruleset_version=data.get('ruleset_version', 0),
+            url_count=data.get('url_count', 0),
+            campaign_size=data.get('campaign_size', 0),
+            skipped=tuple(data.get('skipped', ())),
+            threshold=data.get('threshold', 0.6),
+        )
+
+    def to_json(self) -> str:
+        return json.dumps(self.to_dict(), separators=(",", ":"), ensure_ascii=False)
+
+    def to_bytes(self) -> bytes:
+        """
+        Binary record: fixed header, user_id, the names of any plugin layers
+        (length-prefixed UTF-8), one byte per fired then skipped layer (its
+        LAYERS index, or len(LAYERS) + its position among the names, in
+        evaluation order), then features and the fired layers' contributions
+        as float64
+        """
+        user_id = self.user_id.encode("utf-8")
+        features = self.features or ()
+        names: List[str] = []
+        fired = _layer_codes(self.contributions, names)
+        skipped = _layer_codes(self.skipped, names)
+        encoded = [name.encode("utf-8") for name in names]
+        table = b"".join(_NAME.pack(len(name)) + name for name in encoded)
+        header = _HEADER.pack(
+            self.timestamp, self.score, self.probability, self.threshold, len(fired), len(skipped), len(names),
+            -1 if self.model_version is None else self.model_version,
+            self.ruleset_version, self.url_count, self.campaign_size,
+            len(features) if self.features is not None else 255, len(user_id),
+        )
+        values = list(features) + list(self.contributions.values())
+        return header + user_id + table + fired + skipped + struct.pack(f"<{len(values)}d", *values)
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> "DetectionResult":
+        (timestamp, score, probability, threshold, n_fired, n_skipped, n_names, model_version,
+         ruleset_version, url_count, campaign_size, n_features, user_id_length) = _HEADER.unpack_from(data)
+        offset = _HEADER.size
+        user_id = data[offset:offset + user_id_length].decode("utf-8")
+        offset += user_id_length
+        table = list(LAYERS)
+        for _ in range(n_names):
+            (length,) = _NAME.unpack_from(data, offset)
+            offset += _NAME.size
+            table.append(data[offset:offset + length].decode("utf-8"))
+            offset += length
+        fired = [table[code] for code in data[offset:offset + n_fired]]
+        offset += n_fired
+        skipped = tuple(table[code] for code in data[offset:offset + n_skipped])
+        offset += n_skipped
+        values = struct.unpack_from(f"<{(len(data) - offset) // 8}d", data, offset)
+        features = None
+        if n_features != 255:
+            features, values = tuple(values[:n_features]), values[n_features:]
+        return cls(
+            user_id=user_id,
+            timestamp=timestamp,
+            score=score,
+            probability=probability,
+            contributions=dict(zip(fired, values)),
+            features=features,
+            model_version=None if model_version < 0 else model_version,
+            ruleset_version=ruleset_version,
+            url_count=url_count,
+            campaign_size=campaign_size,
+            skipped=skipped,
+            threshold=threshold,
+        )
+
+
+def _layer_codes(layers: Iterable[str], names: List[str]) -> bytes:
+    """One byte per layer; layers without a LAYERS index are appended to names"""
+    codes = bytearray()
+    for layer in layers:
+        code = _LAYER_INDEX.get(layer)
+        if code is None:
+            if layer not in names:
+                names.append(layer)
+            code = len(LAYERS) + names.index(layer)
+        codes.append(code)
+    return bytes(codes)
+
+
+def write_records(fp: BinaryIO, results: Iterable[DetectionResult]) -> int:
+    """Append length-prefixed binary records to fp; returns how many were written"""
+    count = 0
+    for result in results:
+        record = result.to_bytes()
+        fp.write(_PREFIX.pack(len(record)))
+        fp.write(record)
+        count += 1
+    return count
+
+
+def read_records(fp: BinaryIO) -> Iterator[DetectionResult]:
+    """Records written by write_records, in order"""
+    while True:
+        prefix = fp.read(_PREFIX.size)
+        if len(prefix) < _PREFIX.size:
+            return
+        (length,) = _PREFIX.unpack(prefix)
+        yield DetectionResult.from_bytes(fp.read(length))
+
+
+class ScoreCalibrator:
+    """
+    Platt scaling: probability = sigmoid(slope * score + intercept).
+    The defaults put the 0.6 bot threshold at probability 0.5 until fit()
+    has been given labelled scores.
+    """
+
+    __slots__ = ("slope", "intercept")
+
+    def __init__(self, slope: float = 10.0, intercept: float = -6.0):
+        self.slope = slope
+        self.intercept = intercept
+
+    def probability(self, score: float) -> float:
+        # tanh form of the sigmoid: no overflow for large |z|
+        return 0.5 * (1.0 + math.tanh(0.5 * (self.slope * score + self.intercept)))
+
+    def probabilities(self, scores: np.ndarray) -> np.ndarray:
+        z = self.slope * np.asarray(scores, dtype=float) + self.intercept
+        return 0.5 * (1.0 + np.tanh(0.5 * z))
+
+    def fit(self, scores: Sequence[float], labels: Sequence[bool],
+            iterations: int = 50, regularization: float = 1e-3) -> "ScoreCalibrator":
+        """Newton-Raphson logistic regression of labels (True = bot) on scores"""
+        x = np.asarray(scores, dtype=float)
+        y = np.asarray(labels, dtype=float)
+        if len(x) != len(y) or len(x) == 0:
+            raise ValueError("need the same, non-zero number of scores and labels")
+        # Platt's smoothed targets keep the fit finite on separable data
+        positives = y.sum()
+        negatives = len(y) - positives
+        target = np.where(y > 0, (positives + 1) / (positives + 2), 1 / (negatives + 2))
+
+        # Start from the prior odds (Platt's choice): Newton can diverge from a far-off curve
+        w = np.array([0.0, math.log((positives + 1) / (negatives + 1))])
+        design = np.column_stack([x, np.ones_like(x)])
+        for _ in range(iterations):
+            p = 0.5 * (1.0 + np.tanh(0.5 * design @ w))
+            gradient = design.T @ (p - target) + regularization * w
+            hessian = (design.T * (p * (1 - p))) @ design + regularization * np.eye(2)
+            step = np.linalg.solve(hessian, gradient)
+            w -= step
+            if np.max(np.abs(step)) < 1e-9:
+                break
+        self.slope, self.intercept = float(w[0]), float(w[1])
+        return self
+
+    def to_dict(self) -> Dict:
+        return {'slope': self.slope, 'intercept': self.intercept}
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> "ScoreCalibrator":
+        return cls(data['slope'], data['intercept'])
@@ -0,0 +1,278 @@
+"""
+📐 Bot signature rulesets
+bot_signatures.json is validated against SCHEMA and compiled once into an
+immutable Ruleset: keyword matcher, thresholds and per-layer weights.
+The engine holds one Ruleset and reads it once per message (or batch), so
+a reload that swaps in a new one never splits a score across versions.
+SignatureWatcher polls the file (inotify does not cross every Docker
+volume mount) and reloads on change; an invalid file is logged and the
+current ruleset stays in place.
+"""
+
+import hashlib
+import json
+import logging
+import threading
+from dataclasses import dataclass
+from pathlib import Path
+from types import MappingProxyType
+from typing import Any, Callable, Dict, List, Mapping, Optional, Tuple
+
+from .matching import KeywordMatcher
+
+logger = logging.getLogger(__name__)
+
+# Largest min_msgs a rate window may ask for (bounds per-user timestamp memory)
+MAX_RATE_DEPTH = 1000
+
+DEFAULT_SIGNATURES = {
+    # Fires when min_msgs messages land within time_window seconds, or within
+    # any of the extra windows (10 s / 1 min / 1 h by default)
+    "rapid_fire": {
+        "min_msgs": 5, "time_window": 10,
+        "windows": [{"seconds": 60, "min_msgs": 15}, {"seconds": 3600, "min_msgs": 120}],
+        "weight": 0.25
+    },
+    # Fires when more than pattern_threshold of a user's messages repeat an
+    # earlier one (near-duplicates included)
+    "repetitive": {"pattern_threshold": 0.7, "weight": 0.20},
+    "generic_responses": {
+        "keywords": [
+            "check out my profile", "subscribe now", "link in bio",
+            "follow for more", "dm me", "click here", "only fans",
+            "🔥🔥🔥", "💯💯💯", "👀👀👀"
+        ],
+        "weight": 0.15
+    },
+    # Fires when the std dev of recent inter-message intervals is below this
+    # fraction of their mean (scripted, metronome-like posting)
+    "suspicious_timing": {"std_dev_threshold": 0.5, "weight": 0.10},
+    "unusual_caps": {"ratio_threshold": 0.4, "weight": 0.15},
+    "emoji_spam": {"threshold": 0.3, "weight": 0.10},
+    "url_bomber": {"url_threshold": 3, "weight": 0.10},
+    "coordinated_campaign": {"min_authors": 3, "window": 3600, "weight": 0.20}
+}
+
+
+class RulesetError(ValueError):
+    """bot_signatures.json is unreadable or does not match SCHEMA"""
+
+    def __init__(self, problems: List[str], source: Optional[str] = None):
+        self.problems = problems
+        where = f"{source}: " if source else ""
+        super().__init__(where + "; ".join(problems))
+
+
+def _number(low: float, high: float = float("inf"), integer: bool = False) -> Callable[[Any], Optional[str]]:
+    kind = "an integer" if integer else "a number"
+
+    def check(value: Any) -> Optional[str]:
+        if isinstance(value, bool) or not isinstance(value, int if integer else (int, float)):
+            return f"expected {kind}, got {value!r}"
+        if not low <= value <= high:
+            return f"expected {kind} in [{low}, {high}], got {value!r}"
+        return None
+    return check
+
+
+def _windows(value: Any) -> Optional[str]:
+    if not isinstance(value, list):
+        return "expected a list of {\"seconds\": ..., \"min_msgs\": ...} objects"
+    for index, window in enumerate(value):
+        if not isinstance(window, dict) or window.keys() != {"seconds", "min_msgs"}:
+            return f"window {index}: expected an object with exactly 'seconds' and 'min_msgs'"
+        problem = _number(0.0)(window["seconds"]) or _number(2, MAX_RATE_DEPTH, integer=True)(window["min_msgs"])
+        if problem:
+            return f"window {index}: {problem}"
+    return None
+
+
+def _keywords(value: Any) -> Optional[str]:
+    if not isinstance(value, list) or not all(isinstance(kw, str) and kw for kw in value):
+        return "expected a list of non-empty strings"
+    return None
+
+
+_weight = _number(0.0, 1.0)
+_ratio = _number(0.0, 1.0)
+
+# section -> field -> check(value) returning a problem or None
+SCHEMA = {
+    "rapid_fire": {
+        "min_msgs": _number(2, MAX_RATE_DEPTH, integer=True), "time_window": _number(0.0),
+        "windows": _windows, "weight": _weight,
+    },
+    "repetitive": {"pattern_threshold": _ratio, "weight": _weight},
+    "generic_responses": {"keywords": _keywords, "weight": _weight},
+    "suspicious_timing": {"std_dev_threshold": _number(0.0), "weight": _weight},
+    "unusual_caps": {"ratio_threshold": _ratio, "weight": _weight},
+    "emoji_spam": {"threshold": _ratio, "weight": _weight},
+    "url_bomber": {"url_threshold": _number(0, integer=True), "weight": _weight},
+    "coordinated_campaign": {"min_authors": _number(2, integer=True), "window": _number(0.0), "weight": _weight},
+}
+
+
+def validate_signatures(signatures: Any, source: Optional[str] = None) -> Dict[str, Dict[str, Any]]:
+    """
+    Check a parsed bot_signatures.json against SCHEMA.
+    Missing sections and fields take their DEFAULT_SIGNATURES value (config
+    files older than a layer keep working); unknown ones are errors, so a
+    typo cannot silently disable a threshold.
+    Returns: a complete signatures dict. Raises RulesetError listing every problem.
+    """
+    if not isinstance(signatures, dict):
+        raise RulesetError([f"expected a JSON object, got {type(signatures).__name__}"], source)
+
+    problems = []
+    complete = {}
+    for section in signatures.keys() - SCHEMA.keys():
+        problems.append(f"unknown section {section!r}")
+    for section, fields in SCHEMA.items():
+        values = signatures.get(section, {})
+        if not isinstance(values, dict):
+            problems.append(f"{section}: expected an object")
+            continue
+        for field in values.keys() - fields.keys():
+            problems.append(f"{section}.{field}: unknown field")
+        complete[section] = {}
+        for field, check in fields.items():
+            value = values.get(field, DEFAULT_SIGNATURES[section][field])
+            problem = check(value)
+            if problem:
+                problems.append(f"{section}.{field}: {problem}")
+            complete[section][field] = value
+
+    if problems:
+        raise RulesetError(sorted(problems), source)
+    return complete
+
+
+@dataclass(frozen=True)
+class Ruleset:
+    """Validated, precompiled signatures; replaced as a whole, never mutated"""
+
+    version: int
+    digest: str
+    signatures: Mapping[str, Mapping[str, Any]]
+    weights: Mapping[str, float]
+    generic_matcher: KeywordMatcher
+    rapid_fire_windows: Tuple[Tuple[float, int], ...]  # (seconds, min_msgs), configured order
+    rapid_fire_horizon: float  # longest window
+    rapid_fire_depth: int  # largest min_msgs
+    pattern_threshold: float
+    timing_variation: float
+    caps_ratio: float
+    emoji_ratio: float
+    url_threshold: int
+    campaign_min_authors: int
+    campaign_window: float
+
+    @classmethod
+    def compile(cls, signatures: Any, version: int = 1, source: Optional[str] = None) -> "Ruleset":
+        """Validate and precompile parsed signatures (raises RulesetError)"""
+        sig = validate_signatures(signatures, source)
+        rapid = sig["rapid_fire"]
+        windows = ((rapid["time_window"], rapid["min_msgs"]),) + tuple(
+            (window["seconds"], window["min_msgs"]) for window in rapid["windows"]
+        )
+        canonical = json.dumps(sig, sort_keys=True, separators=(",", ":"), ensure_ascii=False)
+        return cls(
+            version=version,
+            digest=hashlib.sha256(canonical.encode("utf-8")).hexdigest()[:12],
+            signatures=_freeze(sig),
+            weights=MappingProxyType({section: float(fields["weight"]) for section, fields in sig.items()}),
+            generic_matcher=KeywordMatcher(sig["generic_responses"]["keywords"]),
+            rapid_fire_windows=windows,
+            rapid_fire_horizon=max(seconds for seconds, _ in windows),
+            rapid_fire_depth=max(min_msgs for _, min_msgs in windows),
+            pattern_threshold=sig["repetitive"]["pattern_threshold"],
+            timing_variation=sig["suspicious_timing"]["std_dev_threshold"],
+            caps_ratio=sig["unusual_caps"]["ratio_threshold"],
+            emoji_ratio=sig["emoji_spam"]["threshold"],
+            url_threshold=sig["url_bomber"]["url_threshold"],
+            campaign_min_authors=sig["coordinated_campaign"]["min_authors"],
+            campaign_window=sig["coordinated_campaign"]["window"],
+        )
+
+    @classmethod
+    def load(cls, path: str, version: int = 1) -> "Ruleset":
+        """Read, validate and compile a bot_signatures.json file (raises RulesetError)"""
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                signatures = json.load(f)
+        except (OSError, ValueError) as e:
+            raise RulesetError([f"cannot read: {e}"], path) from e
+        return cls.compile(signatures, version, source=path)
+
+    def to_dict(self) -> Dict[str, Dict[str, Any]]:
+        """Plain JSON-compatible copy of the signatures (e.g. to send to another process)"""
+        return _thaw(self.signatures)
+
+
+def _freeze(value: Any) -> Any:
+    if isinstance(value, dict):
+        return MappingProxyType({key: _freeze(item) for key, item in value.items()})
+    if isinstance(value, list):
+        return tuple(_freeze(item) for item in value)
+    return value
+
+
+def _thaw(value: Any) -> Any:
+    if isinstance(value, Mapping):
+        return {key: _thaw(item) for key, item in value.items()}
+    if isinstance(value, tuple):
+        return [_thaw(item) for item in value]
+    return value
+
+
+class SignatureWatcher:
+    """
+    Polls a file's (mtime, size, inode) every `interval` seconds on a daemon
+    thread and calls on_change() when it differs. Exceptions from
+    on_change() are logged; the file is not retried until it changes again.
+    """
+
+    def __init__(self, path: str, on_change: Callable[[], Any], interval: float = 2.0):
+        self.path = Path(path)
+        self.on_change = on_change
+        self.interval = interval
+        self._stamp = self._read_stamp()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def _read_stamp(self) -> Optional[Tuple[int, int, int]]:
+        try:
+            stat = self.path.stat()
+        except OSError:
+            return None
+        return stat.st_mtime_ns, stat.st_size, stat.st_ino
+
+    def check(self) -> bool:
+        """Poll once; True if the file changed and on_change() succeeded"""
+        stamp = self._read_stamp()
+        if stamp is None or stamp == self._stamp:
+            return False
+        self._stamp = stamp
+        try:
+            self.on_change()
+        except Exception as e:
+            logger.warning("Keeping the current signatures, reload of %s failed: %s", self.path, e)
+            return False
+        return True
+
+    def start(self):
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="SignatureWatcher", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: Optional[float] = 5.0):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            self.check()
@@ -0,0 +1,228 @@
+"""
+🧩 Multi-process sharded detection
+analyze_user() is pure Python and bound by the GIL, so one engine uses one
+core. ShardedDetector routes each message by a crc32 hash of its user_id
+to one of N worker processes; every worker owns a BotDetectionEngine with
+its shard of user_behaviors and runs the per-user layers (score_messages).
+The parent runs the cross-user layers (finish_messages) on the results in
+arrival order. Workers score against a frozen model snapshot
+(train=False), so scores match a single-process engine only when that
+engine is frozen on the same snapshot too. Workers run the built-in
+layers only (default_layers()).
+Each worker keeps its behavior state in its own store_dir/shard-N, flushed
+like any SQLiteBehaviorStore and at every checkpoint (routing depends on
+the worker count, so keep it across restarts). Only the coordinator
+watches the signature file; a new ruleset is pushed to every worker
+between batches, so all processes score a batch against the same version.
+"""
+
+import multiprocessing
+import os
+import time
+import traceback
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from .engine import BotDetectionEngine
+from .eventtime import ReorderBuffer, in_event_time
+from .result import DetectionResult
+from .rules import Ruleset
+from .store import BehaviorStore, SQLiteBehaviorStore, shard_for
+
+
+def _worker_main(conn, options: Dict):
+    """
+    Worker process loop: ("score", (messages, explain)) / ("rules", (version, signatures))
+    / ("checkpoint", None) / ("close", None)
+    """
+    store_dir = options['store_dir']
+    store = SQLiteBehaviorStore(store_dir) if store_dir else BehaviorStore()
+    engine = BotDetectionEngine(
+        config_path=options['config_path'],
+        behavior_store=store,
+        model_dir=options['model_dir'],
+        train=False,
+        early_exit=options['early_exit'],
+        bot_threshold=options['bot_threshold'],
+    )
+    while True:
+        command, payload = conn.recv()
+        try:
+            if command == "score":
+                messages, explain = payload
+                result = engine.score_messages(messages, explain=explain)
+            elif command == "rules":
+                version, signatures = payload
+                engine.set_ruleset(Ruleset.compile(signatures, version))
+                result = version
+            elif command == "checkpoint":
+                engine.behavior_store.flush()
+                result = len(engine.user_behaviors)
+            elif command == "close":
+                engine.close()
+                conn.send(("ok", None))
+                return
+            else:
+                raise ValueError(f"unknown command {command!r}")
+        except Exception:
+            conn.send(("error", traceback.format_exc()))
+        else:
+            conn.send(("ok", result))
+
+
+class ShardedDetector:
+    """
+    Drop-in for BotDetectionEngine.analyze_user/analyze_batch on N processes.
+    Results come back in input order; state is checkpointed to store_dir
+    every checkpoint_interval seconds (checked between batches) and on close().
+    A shard that fails a command raises RuntimeError once every shard has
+    replied, so the next batch starts clean; if a worker process dies the
+    detector refuses further work.
+    """
+
+    def __init__(self, workers: Optional[int] = None, config_path: Optional[str] = None,
+                 store_dir: Optional[str] = None, model_dir: Optional[str] = None,
+                 checkpoint_interval: float = 30.0, watch_config: bool = False,
+                 clock: Callable[[], float] = time.time, early_exit: bool = False, bot_threshold: float = 0.6):
+        self.workers = workers or os.cpu_count() or 1
+        self.clock = clock
+        self.checkpoint_interval = checkpoint_interval
+        self.last_checkpoint = time.monotonic()
+        self._broken: Optional[str] = None
+
+        # Runs only CHECK 8 + normalization, over every shard's traffic
+        self.coordinator = BotDetectionEngine(config_path=config_path, train=False, watch_config=watch_config,
+                                              early_exit=early_exit, bot_threshold=bot_threshold)
+        self._worker_rules_version = self.coordinator.ruleset.version
+
+        options = {'config_path': config_path, 'store_dir': store_dir, 'model_dir': model_dir,
+                   'early_exit': early_exit, 'bot_threshold': bot_threshold}
+        # spawn: workers must not inherit the parent's threads (logger, trainer)
+        context = multiprocessing.get_context("spawn")
+        self._connections = []
+        self._processes = []
+        for index in range(self.workers):
+            # One store per shard: workers never contend for the same SQLite files
+            shard_options = dict(options, store_dir=os.path.join(store_dir, f"shard-{index}") if store_dir else None)
+            parent_end, child_end = context.Pipe()
+            process = context.Process(
+                target=_worker_main, args=(child_end, shard_options),
+                name=f"detector-shard-{index}", daemon=True,
+            )
+            process.start()
+            child_end.close()
+            self._connections.append(parent_end)
+            self._processes.append(process)
+
+    @property
+    def metrics(self):
+        """Every shard's traffic passes through the coordinator's finish_messages"""
+        return self.coordinator.metrics
+
+    def shard_of(self, user_id: str) -> int:
+        return shard_for(user_id, self.workers)
+
+    def _check(self):
+        if self._broken:
+            raise RuntimeError(f"ShardedDetector is unusable, {self._broken}; create a new one")
+
+    def _collect(self, shards: List[int]) -> List:
+        """
+        One reply from each of shards, in order. Every reply is read before
+        an error is raised: one left in a pipe would be taken for the answer
+        to the next command.
+        """
+        replies = []
+        errors = []
+        for shard in shards:
+            try:
+                status, payload = self._connections[shard].recv()
+            except (EOFError, OSError) as e:
+                self._broken = f"detector shard {shard} exited ({e!r})"
+                status, payload = "error", self._broken
+            if status != "ok":
+                errors.append(f"Detector shard {shard} failed:\n{payload}")
+            replies.append(payload)
+        if errors:
+            raise RuntimeError("\n".join(errors))
+        return replies
+
+    def _broadcast(self, command: str, payload=None) -> List:
+        self._check()
+        for conn in self._connections:
+            conn.send((command, payload))
+        return self._collect(list(range(self.workers)))
+
+    def analyze_batch(self, messages: List[Tuple[str, str, float]]) -> List[Tuple[float, str]]:
+        """
+        messages = [(user_id, text, timestamp), ...] in arrival order
+        Returns: [(bot_score 0-1, reason_string), ...] in the same order
+        """
+        return [(result.score, result.reason) for result in self.detect_batch(messages)]
+
+    def detect_batch(self, messages: List[Tuple[str, str, float]], explain: bool = False) -> List[DetectionResult]:
+        """analyze_batch() as DetectionResults, in input order"""
+        self._check()
+        rules = self.coordinator.ruleset
+        if rules.version != self._worker_rules_version:
+            self._broadcast("rules", (rules.version, rules.to_dict()))
+            self._worker_rules_version = rules.version
+
+        chunks: List[List[Tuple[str, str, float]]] = [[] for _ in range(self.workers)]
+        positions: List[List[int]] = [[] for _ in range(self.workers)]
+        for position, message in enumerate(messages):
+            shard = self.shard_of(message[0])
+            chunks[shard].append(message)
+            positions[shard].append(position)
+
+        # All shards work at once; each keeps its users' messages in order
+        busy = [shard for shard, chunk in enumerate(chunks) if chunk]
+        for shard in busy:
+            self._connections[shard].send(("score", (chunks[shard], explain)))
+        partial: List = [None] * len(messages)
+        for shard, scored_chunk in zip(busy, self._collect(busy)):
+            for position, scored in zip(positions[shard], scored_chunk):
+                partial[position] = scored
+
+        results = self.coordinator.finish_messages(partial, rules, explain) if partial else []
+
+        if time.monotonic() - self.last_checkpoint >= self.checkpoint_interval:
+            self.checkpoint()
+        return results
+
+    def analyze_user(self, user_id: str, text: str, timestamp: Optional[float] = None) -> Tuple[float, str]:
+        return self.analyze_batch([(user_id, text, self.clock() if timestamp is None else timestamp)])[0]
+
+    def detect_stream(self, messages: Iterable[Tuple[str, str, float]], max_delay: float = 30.0,
+                      max_size: int = 10_000, batch_size: int = 256, explain: bool = False) -> Iterator[DetectionResult]:
+        """BotDetectionEngine.detect_stream() across the shards"""
+        for batch in in_event_time(messages, ReorderBuffer(max_delay, max_size), batch_size):
+            yield from self.detect_batch(batch, explain)
+
+    def checkpoint(self) -> int:
+        """Write every shard's pending behavior state; returns users tracked across shards"""
+        tracked = sum(self._broadcast("checkpoint"))
+        self.last_checkpoint = time.monotonic()
+        return tracked
+
+    def close(self, timeout: Optional[float] = 10.0):
+        if not self._processes:
+            return
+        try:
+            if not self._broken:
+                self._broadcast("close")
+        finally:
+            for process in self._processes:
+                process.join(timeout)
+                if process.is_alive():
+                    process.terminate()
+            for conn in self._connections:
+                conn.close()
+            self._processes = []
+            self._connections = []
+            self.coordinator.close()
+
+    def __enter__(self) -> "ShardedDetector":
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
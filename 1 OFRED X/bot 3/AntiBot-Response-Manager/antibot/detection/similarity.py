@@ -0,0 +1,143 @@
+"""
+🧬 Near-duplicate detection for the repetitive-pattern check
+A 64-bit SimHash over character shingles maps messages that differ by an
+emoji or a word to fingerprints a few bits apart, where an exact hash
+would change completely. Each user keeps only a fixed-size window of
+recent fingerprints, compared by Hamming distance (int.bit_count).
+MinHash signatures of the same shingles are what the cross-user
+CampaignIndex buckets on (see campaign.py).
+"""
+
+import hashlib
+import re
+from array import array
+from typing import Iterable, Iterator, Tuple
+
+import numpy as np
+
+# Characters per shingle; short enough that one changed word/emoji only
+# touches a handful of shingles
+SHINGLE_SIZE = 4
+# Fingerprints within this many differing bits count as the same message
+DEFAULT_MAX_DISTANCE = 12
+# Recent fingerprints kept per user
+DEFAULT_INDEX_SIZE = 32
+# MinHash signature length (hash functions)
+MINHASH_PERMUTATIONS = 32
+
+_WHITESPACE_RE = re.compile(r'\s+')
+_BIT_WEIGHTS = np.uint64(1) << np.arange(64, dtype=np.uint64)
+
+# Fixed multiply-add hash family for MinHash (odd multipliers, wrap mod 2**64)
+_rng = np.random.RandomState(0x5EED)
+_PERM_A = _rng.randint(0, 2**63, size=128, dtype=np.uint64) * np.uint64(2) + np.uint64(1)
+_PERM_B = _rng.randint(0, 2**63, size=128, dtype=np.uint64)
+del _rng
+
+
+def _shingles(text: str, size: int) -> Iterator[str]:
+    normalized = _WHITESPACE_RE.sub(' ', text.lower()).strip()
+    if len(normalized) <= size:
+        yield normalized
+        return
+    for i in range(len(normalized) - size + 1):
+        yield normalized[i:i + size]
+
+
+def _shingle_hashes(text: str, size: int) -> np.ndarray:
+    digests = b"".join(
+        hashlib.blake2b(shingle.encode("utf-8"), digest_size=8).digest()
+        for shingle in _shingles(text, size)
+    )
+    return np.frombuffer(digests, dtype="<u8")
+
+
+def _simhash(hashes: np.ndarray) -> int:
+    # Per bit position: set in more than half of the shingle hashes?
+    bits = np.unpackbits(hashes.view(np.uint8).reshape(-1, 8), axis=1, bitorder="little")
+    majority = bits.sum(axis=0) * 2 > len(hashes)
+    return int(_BIT_WEIGHTS[majority].sum())
+
+
+def _minhash(hashes: np.ndarray, num_perm: int) -> np.ndarray:
+    if not 1 <= num_perm <= len(_PERM_A):
+        raise ValueError(f"num_perm must be between 1 and {len(_PERM_A)}")
+    with np.errstate(over="ignore"):
+        return (hashes[:, None] * _PERM_A[:num_perm] + _PERM_B[:num_perm]).min(axis=0)
+
+
+def simhash(text: str, shingle_size: int = SHINGLE_SIZE) -> int:
+    """64-bit SimHash of the lowercased, whitespace-collapsed text"""
+    return _simhash(_shingle_hashes(text, shingle_size))
+
+
+def minhash(text: str, num_perm: int = MINHASH_PERMUTATIONS, shingle_size: int = SHINGLE_SIZE) -> np.ndarray:
+    """MinHash signature (uint64 array) of the same shingles simhash() uses"""
+    return _minhash(_shingle_hashes(text, shingle_size), num_perm)
+
+
+def sketch(text: str, num_perm: int = MINHASH_PERMUTATIONS,
+           shingle_size: int = SHINGLE_SIZE) -> Tuple[int, np.ndarray]:
+    """(simhash, minhash) from a single shingling pass"""
+    hashes = _shingle_hashes(text, shingle_size)
+    return _simhash(hashes), _minhash(hashes, num_perm)
+
+
+def hamming(a: int, b: int) -> int:
+    return (a ^ b).bit_count()
+
+
+class NearDuplicateIndex:
+    """Fixed-size window of recent fingerprints (array('Q'), oldest overwritten)"""
+
+    __slots__ = ("_data", "_next", "_capacity", "max_distance")
+
+    def __init__(self, capacity: int = DEFAULT_INDEX_SIZE, max_distance: int = DEFAULT_MAX_DISTANCE):
+        if capacity < 1:
+            raise ValueError("capacity must be >= 1")
+        self._data = array("Q")
+        self._next = 0
+        self._capacity = capacity
+        self.max_distance = max_distance
+
+    @property
+    def capacity(self) -> int:
+        return self._capacity
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def __iter__(self) -> Iterator[int]:
+        """Oldest to newest"""
+        if len(self._data) < self._capacity:
+            return iter(self._data)
+        return iter(self._data[self._next:] + self._data[:self._next])
+
+    def contains_similar(self, fingerprint: int) -> bool:
+        """True if a recent fingerprint is within max_distance bits"""
+        max_distance = self.max_distance
+        return any((fingerprint ^ other).bit_count() <= max_distance for other in self._data)
+
+    def add(self, fingerprint: int) -> bool:
+        """Check, then remember the fingerprint; returns contains_similar() from before the insert"""
+        similar = self.contains_similar(fingerprint)
+        self._push(fingerprint)
+        return similar
+
+    def _push(self, fingerprint: int):
+        if len(self._data) < self._capacity:
+            self._data.append(fingerprint)
+        else:
+            self._data[self._next] = fingerprint
+            self._next = (self._next + 1) % self._capacity
+
+    def __repr__(self) -> str:
+        return f"NearDuplicateIndex({len(self)}/{self.capacity}, max_distance={self.max_distance})"
+
+    @classmethod
+    def from_values(cls, values: Iterable[int], capacity: int = DEFAULT_INDEX_SIZE,
+                    max_distance: int = DEFAULT_MAX_DISTANCE) -> "NearDuplicateIndex":
+        index = cls(capacity, max_distance)
+        for value in list(values)[-capacity:]:
+            index._push(value)
+        return index
@@ -0,0 +1,128 @@
+"""
+📦 On-disk snapshots of the fitted anomaly model
+Each engine variant has a feature schema (its ordered feature names); the
+schema hash is part of every snapshot file name and is checked again on
+load, so a 5-feature model can never be handed to the 8-feature engine.
+Snapshots are plain joblib dumps loaded with mmap_mode='r': the forest's
+node arrays are mapped, not read, so loading costs the same for any size.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import time
+from pathlib import Path
+from typing import Optional, Sequence
+
+from .training import FittedModel
+
+logger = logging.getLogger(__name__)
+
+# Bump when the snapshot payload layout changes
+SNAPSHOT_FORMAT = 1
+
+
+def feature_schema_hash(feature_names: Sequence[str]) -> str:
+    """Short stable id for an ordered list of feature names"""
+    payload = json.dumps(list(feature_names), separators=(",", ":")).encode("utf-8")
+    return hashlib.sha256(payload).hexdigest()[:16]
+
+
+class ModelSnapshotStore:
+    """Versioned model snapshots for one feature schema, newest one tracked by a pointer file"""
+
+    def __init__(self, directory: str, feature_names: Sequence[str], keep: int = 3):
+        self.directory = Path(directory)
+        self.feature_names = tuple(feature_names)
+        self.schema = feature_schema_hash(self.feature_names)
+        self.keep = keep
+
+    @property
+    def pointer_path(self) -> Path:
+        return self.directory / f"latest-{self.schema}.json"
+
+    def _snapshot_path(self, version: int) -> Path:
+        return self.directory / f"model-{self.schema}-v{version:06d}.joblib"
+
+    def save(self, model: FittedModel) -> Path:
+        """Write model atomically (temp file + rename), then move the pointer"""
+        import joblib
+
+        self.directory.mkdir(parents=True, exist_ok=True)
+        path = self._snapshot_path(model.version)
+        payload = {
+            'format': SNAPSHOT_FORMAT,
+            'schema': self.schema,
+            'feature_names': self.feature_names,
+            'version': model.version,
+            'n_samples': model.n_samples,
+            'fitted_at': model.fitted_at,
+            'scaler': model.scaler,
+            'forest': model.forest,
+        }
+        tmp = path.with_suffix(".tmp")
+        joblib.dump(payload, tmp)
+        os.replace(tmp, path)
+
+        pointer = {
+            'format': SNAPSHOT_FORMAT,
+            'schema': self.schema,
+            'version': model.version,
+            'file': path.name,
+            'saved_at': time.time(),
+        }
+        tmp_pointer = self.pointer_path.with_suffix(".tmp")
+        tmp_pointer.write_text(json.dumps(pointer), encoding="utf-8")
+        os.replace(tmp_pointer, self.pointer_path)
+
+        self._prune(model.version)
+        return path
+
+    def load_latest(self) -> Optional[FittedModel]:
+        """Newest compatible snapshot, or None (missing, stale schema or unreadable)"""
+        import joblib
+
+        try:
+            pointer = json.loads(self.pointer_path.read_text(encoding="utf-8"))
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as e:
+            logger.warning("Ignoring unreadable model pointer %s: %s", self.pointer_path, e)
+            return None
+
+        if pointer.get('format') != SNAPSHOT_FORMAT or pointer.get('schema') != self.schema:
+            logger.warning("Ignoring stale model pointer %s", self.pointer_path)
+            return None
+
+        path = self.directory / pointer['file']
+        try:
+            payload = joblib.load(path, mmap_mode="r")
+        except Exception as e:
+            logger.warning("Ignoring unreadable model snapshot %s: %s", path, e)
+            return None
+
+        if (payload.get('format') != SNAPSHOT_FORMAT
+                or payload.get('schema') != self.schema
+                or tuple(payload.get('feature_names', ())) != self.feature_names
+                or getattr(payload['scaler'], 'n_features_in_', None) != len(self.feature_names)):
+            logger.warning("Rejecting model snapshot %s: feature schema mismatch", path)
+            return None
+
+        return FittedModel(
+            payload['scaler'],
+            payload['forest'],
+            version=payload['version'],
+            n_samples=payload['n_samples'],
+            fitted_at=payload['fitted_at'],
+        )
+
+    def _prune(self, current_version: int):
+        """Keep only the newest `keep` snapshots for this schema"""
+        snapshots = sorted(self.directory.glob(f"model-{self.schema}-v*.joblib"))
+        for path in snapshots[:-self.keep] if self.keep > 0 else []:
+            if path != self._snapshot_path(current_version):
+                try:
+                    path.unlink()
+                except OSError:
+                    pass
@@ -0,0 +1,122 @@
+"""
+💾 Persistent user-behavior stores
+The engine keeps hot users in its user_behaviors cache and asks a store for
+anyone it has not seen this session. Nothing is read at startup, so opening
+a store costs the same with 10 or 10 million tracked users.
+"""
+
+import json
+import sqlite3
+import threading
+import time
+import zlib
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from .behavior import UserBehavior
+
+
+def shard_for(user_id: str, shards: int) -> int:
+    """Stable shard index for a user (crc32, unlike hash() it survives restarts)"""
+    return zlib.crc32(user_id.encode("utf-8")) % shards
+
+
+class BehaviorStore:
+    """In-memory no-op store: behavior lives only as long as the engine"""
+
+    def load(self, user_id: str) -> Optional[UserBehavior]:
+        """Return the saved state for user_id, or None if unknown"""
+        return None
+
+    def save(self, user: UserBehavior):
+        """Record that user changed (implementations may defer the write)"""
+
+    def flush(self):
+        """Write out anything still pending"""
+
+    def close(self):
+        self.flush()
+
+
+class SQLiteBehaviorStore(BehaviorStore):
+    """
+    Sharded SQLite store - one WAL-mode database file per shard.
+    Writes are buffered per shard and flushed in one transaction after
+    flush_every changes or flush_interval seconds, whichever comes first.
+    """
+
+    SCHEMA = "CREATE TABLE IF NOT EXISTS behaviors (user_id TEXT PRIMARY KEY, state TEXT NOT NULL)"
+
+    def __init__(self, directory: str = "data/behaviors", shards: int = 8,
+                 flush_every: int = 64, flush_interval: float = 2.0):
+        if shards < 1:
+            raise ValueError("shards must be >= 1")
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.shards = shards
+        self.flush_every = flush_every
+        self.flush_interval = flush_interval
+        self._connections: List[Optional[sqlite3.Connection]] = [None] * shards
+        self._pending: List[Dict[str, UserBehavior]] = [{} for _ in range(shards)]
+        self._pending_count = 0
+        self._last_flush = time.monotonic()
+        self._lock = threading.RLock()
+
+    def _connection(self, shard: int) -> sqlite3.Connection:
+        """Open shard databases lazily, on first use"""
+        conn = self._connections[shard]
+        if conn is None:
+            path = self.directory / f"behaviors-{shard:02d}.sqlite3"
+            conn = sqlite3.connect(str(path), check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(self.SCHEMA)
+            self._connections[shard] = conn
+        return conn
+
+    def load(self, user_id: str) -> Optional[UserBehavior]:
+        shard = shard_for(user_id, self.shards)
+        with self._lock:
+            pending = self._pending[shard].get(user_id)
+            if pending is not None:
+                return pending
+            row = self._connection(shard).execute(
+                "SELECT state FROM behaviors WHERE user_id = ?", (user_id,)
+            ).fetchone()
+        return UserBehavior.from_state(json.loads(row[0])) if row else None
+
+    def save(self, user: UserBehavior):
+        shard = shard_for(user.user_id, self.shards)
+        with self._lock:
+            if user.user_id not in self._pending[shard]:
+                self._pending_count += 1
+            self._pending[shard][user.user_id] = user
+            if (self._pending_count >= self.flush_every
+                    or time.monotonic() - self._last_flush >= self.flush_interval):
+                self.flush()
+
+    def flush(self):
+        with self._lock:
+            for shard, pending in enumerate(self._pending):
+                if not pending:
+                    continue
+                rows = [
+                    (user_id, json.dumps(user.to_state(), separators=(",", ":")))
+                    for user_id, user in pending.items()
+                ]
+                conn = self._connection(shard)
+                with conn:
+                    conn.executemany(
+                        "INSERT OR REPLACE INTO behaviors (user_id, state) VALUES (?, ?)", rows
+                    )
+                pending.clear()
+            self._pending_count = 0
+            self._last_flush = time.monotonic()
+
+    def close(self):
+        with self._lock:
+            self.flush()
+            for shard, conn in enumerate(self._connections):
+                if conn is not None:
+                    conn.close()
+                    self._connections[shard] = None
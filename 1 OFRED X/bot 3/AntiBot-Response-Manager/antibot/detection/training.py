@@ -0,0 +1,233 @@
+"""
+🧠 Online training for the ML anomaly layer
+Real feature vectors from extract_features() go into a bounded reservoir
+sample; a background thread refits StandardScaler + IsolationForest on a
+schedule (or when the live feature distribution drifts) and swaps the new
+model in with a single attribute assignment. Scoring only ever reads the
+current model, so it never waits for a fit.
+"""
+
+import logging
+import random
+import threading
+import time
+from typing import TYPE_CHECKING, Optional, Sequence
+
+import numpy as np
+
+if TYPE_CHECKING:
+    from .snapshots import ModelSnapshotStore
+
+logger = logging.getLogger(__name__)
+
+
+class FeatureReservoir:
+    """Uniform sample of every feature vector seen (reservoir sampling, Algorithm R)"""
+
+    def __init__(self, n_features: int, capacity: int = 5000, seed: Optional[int] = None):
+        self.n_features = n_features
+        self.capacity = capacity
+        self.seen = 0
+        self._data = np.zeros((capacity, n_features))
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return min(self.seen, self.capacity)
+
+    def add(self, features: Sequence[float]):
+        with self._lock:
+            if self.seen < self.capacity:
+                self._data[self.seen] = features
+            else:
+                slot = self._rng.randrange(self.seen + 1)
+                if slot < self.capacity:
+                    self._data[slot] = features
+            self.seen += 1
+
+    def sample(self) -> np.ndarray:
+        """Copy of the current sample, safe to fit on while add() continues"""
+        with self._lock:
+            return self._data[:len(self)].copy()
+
+
+class FittedModel:
+    """Immutable scaler + forest pair; replaced as a whole, never mutated"""
+
+    __slots__ = ("scaler", "forest", "version", "n_samples", "fitted_at")
+
+    def __init__(self, scaler, forest, version: int, n_samples: int, fitted_at: float):
+        self.scaler = scaler
+        self.forest = forest
+        self.version = version
+        self.n_samples = n_samples
+        self.fitted_at = fitted_at
+
+    def anomaly_scores(self, features) -> np.ndarray:
+        """Higher = more anomalous (negated IsolationForest score_samples)"""
+        return -self.forest.score_samples(self.scaler.transform(features))
+
+
+def _drift(model: FittedModel, running_mean: np.ndarray) -> float:
+    return float(np.max(np.abs(running_mean - model.scaler.mean_) / model.scaler.scale_))
+
+
+class ModelTrainer:
+    """
+    Collects features and keeps a FittedModel up to date.
+    A refit runs when the first min_samples vectors are in, every
+    refit_interval seconds while new data arrives, and early when the
+    running feature mean drifts more than drift_threshold scaler
+    standard deviations away from what the current model was fitted on.
+    With a snapshot store, the trainer thread first warm-starts from the
+    newest saved model and every refit is saved for the next run.
+    """
+
+    def __init__(self, n_features: int, capacity: int = 5000, min_samples: int = 50,
+                 refit_interval: float = 300.0, drift_threshold: float = 1.0,
+                 drift_alpha: float = 0.02, contamination: float = 0.1,
+                 n_estimators: int = 100, random_state: int = 42,
+                 snapshots: Optional["ModelSnapshotStore"] = None):
+        self.n_features = n_features
+        self.min_samples = min_samples
+        self.refit_interval = refit_interval
+        self.drift_threshold = drift_threshold
+        self.drift_alpha = drift_alpha
+        self.contamination = contamination
+        self.n_estimators = n_estimators
+        self.random_state = random_state
+        self.snapshots = snapshots
+
+        self.reservoir = FeatureReservoir(n_features, capacity, seed=random_state)
+        self.model: Optional[FittedModel] = None
+        self.seen_since_fit = 0
+
+        # seen_since_fit, model and _drift_mean change together: observe() runs on
+        # the scoring thread(s) while refit() swaps the model on the trainer thread
+        self._drift_mean: Optional[np.ndarray] = None
+        self._state_lock = threading.Lock()
+        self._fit_lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def samples_seen(self) -> int:
+        return self.reservoir.seen
+
+    def observe(self, features: Sequence[float]):
+        """Record one feature vector; may wake the trainer thread, never fits inline"""
+        self.reservoir.add(features)
+        vector = np.asarray(features, dtype=float)
+
+        with self._state_lock:
+            self.seen_since_fit += 1
+            model = self.model
+            if model is None:
+                wake = len(self.reservoir) >= self.min_samples
+            else:
+                if self._drift_mean is None:
+                    self._drift_mean = model.scaler.mean_.copy()
+                self._drift_mean += self.drift_alpha * (vector - self._drift_mean)
+                wake = (self.seen_since_fit >= self.min_samples
+                        and _drift(model, self._drift_mean) > self.drift_threshold)
+        if wake:
+            self._wake.set()
+
+    def drift_score(self) -> float:
+        """Largest shift of the running feature mean, in fitted standard deviations"""
+        with self._state_lock:
+            model = self.model
+            if model is None or self._drift_mean is None:
+                return 0.0
+            return _drift(model, self._drift_mean)
+
+    def refit(self) -> Optional[FittedModel]:
+        """Fit on the current reservoir and swap the model in; None if too little data"""
+        # sklearn is only needed once there is something to fit
+        from sklearn.ensemble import IsolationForest
+        from sklearn.preprocessing import StandardScaler
+
+        with self._fit_lock:
+            sample = self.reservoir.sample()
+            if len(sample) < self.min_samples:
+                return None
+            with self._state_lock:
+                seen_at_sample = self.seen_since_fit
+
+            scaler = StandardScaler().fit(sample)
+            forest = IsolationForest(
+                contamination=self.contamination,
+                random_state=self.random_state,
+                n_estimators=self.n_estimators,
+            ).fit(scaler.transform(sample))
+
+            previous = self.model
+            model = FittedModel(
+                scaler,
+                forest,
+                version=previous.version + 1 if previous else 1,
+                n_samples=len(sample),
+                fitted_at=time.time(),
+            )
+            with self._state_lock:
+                self.model = model
+                self._drift_mean = None
+                self.seen_since_fit = max(0, self.seen_since_fit - seen_at_sample)
+            logger.info("Refitted anomaly model v%d on %d samples", model.version, model.n_samples)
+
+        if self.snapshots is not None:
+            try:
+                self.snapshots.save(model)
+            except Exception:
+                logger.exception("Could not save model snapshot v%d", model.version)
+        return model
+
+    def load_snapshot(self) -> Optional[FittedModel]:
+        """Swap in the newest saved model if it is newer than the current one"""
+        if self.snapshots is None:
+            return None
+        model = self.snapshots.load_latest()
+        with self._fit_lock:
+            current = self.model
+            if model is None or (current is not None and current.version >= model.version):
+                return None
+            with self._state_lock:
+                self.model = model
+                self._drift_mean = None
+        logger.info("Loaded anomaly model snapshot v%d (%d samples)", model.version, model.n_samples)
+        return model
+
+    def start(self):
+        """Run refits on a daemon thread"""
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="ModelTrainer", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: Optional[float] = 5.0):
+        self._stop.set()
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def _run(self):
+        # Warm start off the caller's thread, so engine construction stays instant
+        try:
+            self.load_snapshot()
+        except Exception:
+            logger.exception("Model snapshot load failed")
+
+        while not self._stop.is_set():
+            self._wake.wait(self.refit_interval)
+            self._wake.clear()
+            if self._stop.is_set():
+                break
+            if self.seen_since_fit == 0:
+                continue
+            try:
+                self.refit()
+            except Exception:
+                logger.exception("Anomaly model refit failed")
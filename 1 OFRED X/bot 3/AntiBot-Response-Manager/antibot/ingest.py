@@ -0,0 +1,317 @@
+"""
+📥 Streaming inbox ingest (read-only)
+An async source pages through the inbox, already-seen message ids are
+dropped, and the rest are scored by BotDetectionEngine in micro-batches
+and written to a local SQLite review store. Fetching and scoring overlap:
+the fetcher fills a bounded queue (backpressure - it waits when scoring
+falls behind) while batches are scored on a worker thread.
+Nothing is ever marked read, replied to or otherwise written to Reddit.
+
+    source = RedditInboxSource(credentials)      # or FakeInboxSource(...)
+    ingester = InboxIngester(engine, source, ScoredMessageStore("data/inbox.sqlite3"))
+    ingester.start_background()                  # GUI: poll ingester.results
+"""
+
+import asyncio
+import json
+import queue
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Executor, ThreadPoolExecutor
+from pathlib import Path
+from typing import AsyncIterator, Callable, Dict, Iterable, List, Optional
+
+from .logger import Logger
+
+# Inbox message as produced by every source:
+# {'id', 'author', 'subject', 'body', 'created'}
+InboxMessage = Dict
+
+
+class InboxSource:
+    """Async stream of inbox messages"""
+
+    async def stream(self) -> AsyncIterator[InboxMessage]:
+        raise NotImplementedError
+        yield  # pragma: no cover
+
+    async def close(self):
+        pass
+
+
+class RedditInboxSource(InboxSource):
+    """
+    Unread private messages via asyncpraw. With follow=True the inbox is
+    polled again every poll_interval seconds until the ingester stops;
+    otherwise one pass over up to `limit` messages.
+    """
+
+    def __init__(self, credentials: Dict, limit: Optional[int] = 100,
+                 follow: bool = False, poll_interval: float = 30.0):
+        self.credentials = credentials
+        self.limit = limit
+        self.follow = follow
+        self.poll_interval = poll_interval
+        self._reddit = None
+
+    async def stream(self) -> AsyncIterator[InboxMessage]:
+        # asyncpraw is only needed when actually talking to Reddit
+        import asyncpraw
+        from asyncpraw.models import Message
+
+        self._reddit = asyncpraw.Reddit(**self.credentials)
+        while True:
+            async for item in self._reddit.inbox.unread(limit=self.limit):
+                if isinstance(item, Message):
+                    yield {
+                        'id': item.id,
+                        'author': item.author.name if item.author else "[deleted]",
+                        'subject': item.subject,
+                        'body': item.body,
+                        'created': item.created_utc,
+                    }
+            if not self.follow:
+                return
+            await asyncio.sleep(self.poll_interval)
+
+    async def close(self):
+        if self._reddit is not None:
+            await self._reddit.close()
+            self._reddit = None
+
+
+class FakeInboxSource(InboxSource):
+    """Local stand-in for the Reddit inbox: a list of message dicts (or a JSON file of them)"""
+
+    def __init__(self, messages: Iterable[InboxMessage], delay: float = 0.0):
+        self.messages = list(messages)
+        self.delay = delay
+
+    @classmethod
+    def from_file(cls, path: str, delay: float = 0.0) -> "FakeInboxSource":
+        with open(path, 'r', encoding='utf-8') as f:
+            return cls(json.load(f), delay)
+
+    async def stream(self) -> AsyncIterator[InboxMessage]:
+        for message in self.messages:
+            if self.delay:
+                await asyncio.sleep(self.delay)  # simulated fetch latency
+            yield message
+
+
+class ScoredMessageStore:
+    """SQLite table of scored inbox messages, keyed by message id"""
+
+    SCHEMA = """CREATE TABLE IF NOT EXISTS scored_messages (
+        id TEXT PRIMARY KEY, author TEXT, subject TEXT, body TEXT, created REAL,
+        score REAL, is_bot INTEGER, reason TEXT, scored_at REAL)"""
+
+    def __init__(self, path: str = "data/inbox.sqlite3"):
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self.path = path
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(self.SCHEMA)
+        self._lock = threading.Lock()
+
+    def known(self, message_ids: List[str]) -> set:
+        """Which of these ids are already stored"""
+        if not message_ids:
+            return set()
+        placeholders = ",".join("?" * len(message_ids))
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT id FROM scored_messages WHERE id IN ({placeholders})", message_ids
+            ).fetchall()
+        return {row[0] for row in rows}
+
+    def save_many(self, results: List[Dict]):
+        rows = [
+            (r['id'], r['author'], r['subject'], r['body'], r['created'],
+             r['score'], int(r['is_bot']), r['reason'], r['scored_at'])
+            for r in results
+        ]
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "INSERT OR IGNORE INTO scored_messages VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)", rows
+            )
+
+    def recent(self, limit: int = 50) -> List[Dict]:
+        with self._lock:
+            cursor = self._conn.execute(
+                "SELECT * FROM scored_messages ORDER BY created DESC LIMIT ?", (limit,)
+            )
+            names = [column[0] for column in cursor.description]
+            return [dict(zip(names, row)) for row in cursor.fetchall()]
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM scored_messages").fetchone()[0]
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+class InboxIngester:
+    """
+    Fetch -> dedupe -> micro-batch score -> store.
+    A batch is scored once batch_size messages are waiting or max_latency
+    seconds after its first message arrived. Scored results also go to
+    `results` (a thread-safe queue) and to on_scored, if given.
+    """
+
+    def __init__(self, engine, source: InboxSource, store: Optional[ScoredMessageStore] = None,
+                 batch_size: int = 32, max_latency: float = 0.5, queue_size: int = 256,
+                 seen_capacity: int = 100_000,
+                 on_scored: Optional[Callable[[List[Dict]], None]] = None,
+                 executor: Optional[Executor] = None):
+        self.engine = engine
+        self.source = source
+        self.store = store
+        self.batch_size = batch_size
+        self.max_latency = max_latency
+        self.queue_size = queue_size
+        self.seen_capacity = seen_capacity
+        self.on_scored = on_scored
+        self.logger = Logger("InboxIngester")
+
+        self.results: "queue.Queue[Dict]" = queue.Queue()
+        self.fetched = 0
+        self.duplicates = 0
+        self.scored = 0
+        self.done = threading.Event()
+        self.error: Optional[BaseException] = None
+
+        self._seen: "OrderedDict[str, None]" = OrderedDict()
+        # Scoring thread; pass a shared serial executor when other code also uses the engine
+        self._owns_executor = executor is None
+        self._executor = executor or ThreadPoolExecutor(max_workers=1, thread_name_prefix="ingest-score")
+        self._stop: Optional[asyncio.Event] = None
+        self._stop_requested = False
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+
+    def _remember(self, message_id: str) -> bool:
+        """False if message_id was already seen in this session (bounded LRU)"""
+        if message_id in self._seen:
+            self._seen.move_to_end(message_id)
+            return False
+        self._seen[message_id] = None
+        if len(self._seen) > self.seen_capacity:
+            self._seen.popitem(last=False)
+        return True
+
+    async def run(self):
+        """Ingest until the source is exhausted or stop() is called"""
+        self._loop = asyncio.get_running_loop()
+        self._stop = asyncio.Event()
+        if self._stop_requested:
+            self._stop.set()
+        pending: asyncio.Queue = asyncio.Queue(self.queue_size)
+        fetcher = asyncio.create_task(self._fetch(pending))
+        try:
+            await self._consume(pending, fetcher)
+        finally:
+            fetcher.cancel()
+            await asyncio.gather(fetcher, return_exceptions=True)
+            await self.source.close()
+
+    async def _fetch(self, pending: asyncio.Queue):
+        try:
+            async for message in self.source.stream():
+                if self._stop.is_set():
+                    break
+                self.fetched += 1
+                if not self._remember(message['id']):
+                    self.duplicates += 1
+                    continue
+                await pending.put(message)  # blocks while scoring is behind
+        except asyncio.CancelledError:
+            # run() has stopped reading the queue, which may be full:
+            # waiting to hand over the end marker would never return
+            raise
+        except Exception:
+            await pending.put(None)
+            raise
+        await pending.put(None)
+
+    async def _consume(self, pending: asyncio.Queue, fetcher: asyncio.Task):
+        loop = asyncio.get_running_loop()
+        finished = False
+        while not finished and not self._stop.is_set():
+            first = await pending.get()
+            if first is None:
+                break
+            batch = [first]
+            deadline = loop.time() + self.max_latency
+            while len(batch) < self.batch_size:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    message = await asyncio.wait_for(pending.get(), timeout)
+                except asyncio.TimeoutError:
+                    break
+                if message is None:
+                    finished = True
+                    break
+                batch.append(message)
+
+            # Scoring and the store write run on the worker thread while the
+            # fetcher keeps paging
+            results = await loop.run_in_executor(self._executor, self._score, batch)
+            self.scored += len(results)
+            for result in results:
+                self.results.put(result)
+            if self.on_scored is not None:
+                self.on_scored(results)
+
+        if fetcher.done() and fetcher.exception() is not None:
+            raise fetcher.exception()
+
+    def _score(self, batch: List[InboxMessage]) -> List[Dict]:
+        if self.store is not None:
+            # Also skip ids scored in an earlier session
+            known = self.store.known([message['id'] for message in batch])
+            self.duplicates += len(known)
+            batch = [message for message in batch if message['id'] not in known]
+        # Oldest first, so per-user timing sees messages in the order they were sent
+        batch.sort(key=lambda message: message['created'])
+        scored = self.engine.analyze_batch([
+            (message['author'], message['body'], message['created']) for message in batch
+        ])
+        now = time.time()
+        results = [
+            dict(message, score=score, is_bot=bool(self.engine.is_likely_bot(score)),
+                 reason=reason, scored_at=now)
+            for message, (score, reason) in zip(batch, scored)
+        ]
+        if self.store is not None and results:
+            self.store.save_many(results)
+        return results
+
+    def stop(self):
+        """Ask run() to finish after the batch in progress (thread-safe)"""
+        self._stop_requested = True
+        if self._loop is not None and self._stop is not None:
+            self._loop.call_soon_threadsafe(self._stop.set)
+
+    def start_background(self) -> threading.Thread:
+        """Run on a daemon thread with its own event loop (for the GUI)"""
+        def target():
+            try:
+                asyncio.run(self.run())
+            except BaseException as e:
+                self.error = e
+                self.logger.error("Inbox ingest failed: %s", e)
+            finally:
+                if self._owns_executor:
+                    self._executor.shutdown(wait=False)
+                self.done.set()
+
+        self._thread = threading.Thread(target=target, name="InboxIngester", daemon=True)
+        self._thread.start()
+        return self._thread
@@ -0,0 +1,216 @@
+"""
+📝 Buffered logging backend for the scripts' Logger
+Logger.log() only checks the level, formats and enqueues; a single writer
+thread owns the console and the log file, writes records in batches,
+flushes once the queue runs dry and handles daily/size rotation.
+Environment (after load_dotenv): ANTIBOT_LOG_LEVEL (default DEBUG),
+ANTIBOT_LOG_JSON=1 for JSON-lines files, ANTIBOT_LOG_DIR (default logs).
+"""
+
+import atexit
+import json
+import os
+import queue
+import sys
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import List, Optional, TextIO, Tuple
+
+LEVELS = {"DEBUG": 10, "INFO": 20, "WARNING": 30, "ERROR": 40}
+
+# (created, level, name, message)
+_Record = Tuple[float, str, str, str]
+
+
+class LogWriter:
+    """
+    Queue-fed writer thread with one persistent file handle.
+    Files are named {prefix}_YYYYMMDD.log (.jsonl with json_lines), a new
+    one starts each day, and a file over max_bytes is rotated to .1, .2 ...
+    keeping backup_count of them.
+    """
+
+    def __init__(self, directory: str = "logs", prefix: str = "antibot",
+                 max_bytes: int = 10 * 1024 * 1024, backup_count: int = 5,
+                 json_lines: bool = False, console: bool = True,
+                 flush_interval: float = 1.0, queue_size: int = 10000, batch_size: int = 512):
+        self.directory = Path(directory)
+        self.prefix = prefix
+        self.max_bytes = max_bytes
+        self.backup_count = backup_count
+        self.json_lines = json_lines
+        self.console = console
+        self.flush_interval = flush_interval
+        self.batch_size = batch_size
+
+        self._queue: "queue.Queue[Optional[_Record]]" = queue.Queue(queue_size)
+        self._file: Optional[TextIO] = None
+        self._day: Optional[str] = None
+        self._size = 0
+        self._thread: Optional[threading.Thread] = None
+        self._start_lock = threading.Lock()
+
+    @property
+    def path(self) -> Optional[Path]:
+        """Current log file (None until the first record is written)"""
+        return self._path_for(self._day) if self._day else None
+
+    def _path_for(self, day: str) -> Path:
+        suffix = "jsonl" if self.json_lines else "log"
+        return self.directory / f"{self.prefix}_{day}.{suffix}"
+
+    def submit(self, record: _Record):
+        """Enqueue one record; blocks only if the writer is queue_size records behind"""
+        if self._thread is None:
+            self.start()
+        self._queue.put(record)
+
+    def start(self):
+        with self._start_lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._thread = threading.Thread(target=self._run, name="LogWriter", daemon=True)
+            self._thread.start()
+
+    def flush(self):
+        """Wait until everything submitted so far is written and flushed"""
+        if self._thread is not None:
+            self._queue.join()
+
+    def close(self, timeout: Optional[float] = 5.0):
+        if self._thread is None:
+            return
+        self._queue.put(None)
+        self._thread.join(timeout)
+        self._thread = None
+
+    def _run(self):
+        while True:
+            try:
+                first = self._queue.get(timeout=self.flush_interval)
+            except queue.Empty:
+                continue
+            batch = [first]
+            while len(batch) < self.batch_size:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+
+            stop = None in batch
+            try:
+                self._write([record for record in batch if record is not None])
+            except Exception as e:
+                sys.stderr.write(f"LogWriter: could not write {len(batch)} records: {e}\n")
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+            if stop:
+                self._close_file()
+                return
+
+    def _write(self, records: List[_Record]):
+        console_lines = []
+        for created, level, name, message in records:
+            moment = datetime.fromtimestamp(created)
+            text = f"[{moment:%Y-%m-%d %H:%M:%S}] [{level}] [{name}] {message}"
+            if self.console:
+                console_lines.append(text)
+            if self.json_lines:
+                line = json.dumps({
+                    'time': moment.isoformat(timespec="milliseconds"),
+                    'level': level,
+                    'logger': name,
+                    'message': message,
+                }, ensure_ascii=False)
+            else:
+                line = text
+            size = len(line.encode("utf-8")) + 1
+            self._file_for(moment, size).write(line + "\n")
+            self._size += size
+
+        if console_lines and sys.stdout is not None:
+            sys.stdout.write("\n".join(console_lines) + "\n")
+            sys.stdout.flush()
+        if self._file is not None and self._queue.qsize() == 0:
+            self._file.flush()
+
+    def _file_for(self, moment: datetime, incoming: int) -> TextIO:
+        day = moment.strftime("%Y%m%d")
+        if day != self._day or self._file is None:
+            self._close_file()
+            self._open(day)
+        elif self.max_bytes and self._size + incoming > self.max_bytes and self._size > 0:
+            self._close_file()
+            self._rotate(self._path_for(day))
+            self._open(day)
+        return self._file
+
+    def _open(self, day: str):
+        self.directory.mkdir(parents=True, exist_ok=True)
+        path = self._path_for(day)
+        self._file = open(path, "a", encoding="utf-8")
+        self._day = day
+        self._size = path.stat().st_size
+
+    def _rotate(self, path: Path):
+        if self.backup_count <= 0:
+            path.unlink(missing_ok=True)
+            return
+        for index in range(self.backup_count - 1, 0, -1):
+            older = path.with_name(f"{path.name}.{index}")
+            if older.exists():
+                os.replace(older, path.with_name(f"{path.name}.{index + 1}"))
+        os.replace(path, path.with_name(f"{path.name}.1"))
+
+    def _close_file(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+
+_default_writer: Optional[LogWriter] = None
+_default_lock = threading.Lock()
+
+
+def default_writer() -> LogWriter:
+    """Process-wide writer configured from the environment, flushed at exit"""
+    global _default_writer
+    with _default_lock:
+        if _default_writer is None:
+            _default_writer = LogWriter(
+                directory=os.getenv("ANTIBOT_LOG_DIR", "logs"),
+                json_lines=os.getenv("ANTIBOT_LOG_JSON", "").lower() in ("1", "true", "yes"),
+            )
+            atexit.register(_default_writer.close)
+        return _default_writer
+
+
+class Logger:
+    """
+    Drop-in for the scripts' Logger: info/warning/error/debug(msg, *args).
+    Disabled levels return before any formatting; pass values as %-style
+    args (logger.debug("error: %s", e)) to skip building the string too.
+    """
+
+    def __init__(self, name: str, level: Optional[str] = None, writer: Optional[LogWriter] = None):
+        self.name = name
+        self.level = LEVELS[(level or os.getenv("ANTIBOT_LOG_LEVEL") or "DEBUG").upper()]
+        self.writer = writer or default_writer()
+
+    def is_enabled(self, level: str) -> bool:
+        return LEVELS[level] >= self.level
+
+    def log(self, level: str, message: str, *args):
+        if LEVELS[level] < self.level:
+            return
+        if args:
+            message = message % args
+        self.writer.submit((time.time(), level, self.name, message))
+
+    def info(self, msg: str, *args): self.log("INFO", msg, *args)
+    def error(self, msg: str, *args): self.log("ERROR", msg, *args)
+    def warning(self, msg: str, *args): self.log("WARNING", msg, *args)
+    def debug(self, msg: str, *args): self.log("DEBUG", msg, *args)
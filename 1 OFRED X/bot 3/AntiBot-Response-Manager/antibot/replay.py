@@ -0,0 +1,286 @@
+"""
+🔁 Offline replay and evaluation
+Replays a recorded message stream through BotDetectionEngine in event
+time (each message's own timestamp - never the wall clock), scores it
+against labels and sweeps many bot_signatures.json variants in parallel,
+one process per config, so weights can be tuned before they go live.
+
+    python -m antibot.replay day.jsonl --labels users.json \\
+        --config config/bot_signatures.json --grid grid.json --workers 8
+
+Stream: JSONL (or Parquet, via pandas) with user_id, text, timestamp and
+an optional per-message label (true/1/"bot" = bot). --labels adds user
+level labels {"user_id": true, ...} for messages without one; unlabelled
+messages are still replayed (they build behavior state) but not scored.
+Grid: {"rapid_fire.weight": [0.2, 0.3], "unusual_caps.ratio_threshold": [0.4, 0.6]}
+expands every --config (or the defaults) into the cartesian product.
+The model is frozen: --model-dir loads its newest snapshot, otherwise the
+ML layer stays off, so every config sees the same anomaly scores.
+"""
+
+import argparse
+import copy
+import itertools
+import json
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from time import perf_counter
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+from sklearn.metrics import average_precision_score, precision_recall_curve, roc_auc_score, roc_curve
+
+from .detection import BotDetectionEngine, DetectionResult, ScoreCalibrator
+from .detection.metrics import LAYERS
+from .detection.rules import DEFAULT_SIGNATURES, Ruleset
+
+Message = Tuple[str, str, float]
+
+BATCH_SIZE = 1024
+
+# (messages, labels, options), set in each sweep worker by _init_worker
+# (shared copy-on-write where processes fork)
+_worker_stream: Optional[Tuple[List[Message], List[Optional[bool]], Dict]] = None
+
+
+def parse_label(value: Any) -> Optional[bool]:
+    """True for a bot, False for a human, None when unlabelled"""
+    if value is None:
+        return None
+    if isinstance(value, (bool, int, float)):
+        return bool(value)
+    text = str(value).strip().lower()
+    if text in ("bot", "true", "1", "yes"):
+        return True
+    if text in ("human", "false", "0", "no"):
+        return False
+    if text == "":
+        return None
+    raise ValueError(f"unrecognised label {value!r}")
+
+
+def load_stream(path: str, user_labels: Optional[Dict[str, Any]] = None
+                ) -> Tuple[List[Message], List[Optional[bool]]]:
+    """
+    Read a recorded stream (.jsonl / .parquet), sorted by timestamp.
+    Returns: (messages, labels) - labels[i] belongs to messages[i]
+    """
+    if Path(path).suffix.lower() in (".parquet", ".pq"):
+        # pandas (+ pyarrow) is only needed for Parquet streams
+        import pandas as pd
+        records = pd.read_parquet(path).to_dict("records")
+    else:
+        with open(path, "r", encoding="utf-8") as f:
+            records = [json.loads(line) for line in f if line.strip()]
+
+    user_labels = {user_id: parse_label(label) for user_id, label in (user_labels or {}).items()}
+    rows = []
+    for index, record in enumerate(records):
+        try:
+            user_id, text, timestamp = str(record['user_id']), str(record['text']), float(record['timestamp'])
+        except (KeyError, TypeError, ValueError) as e:
+            raise ValueError(f"{path}: record {index + 1}: expected user_id, text and timestamp ({e})") from e
+        label = parse_label(record.get('label'))
+        if label is None:
+            label = user_labels.get(user_id)
+        rows.append((timestamp, index, (user_id, text, timestamp), label))
+
+    rows.sort(key=lambda row: row[:2])  # event time; ties keep file order
+    return [row[2] for row in rows], [row[3] for row in rows]
+
+
+def replay(messages: Sequence[Message], signatures: Optional[Dict] = None,
+           model_dir: Optional[str] = None, batch_size: int = BATCH_SIZE,
+           **engine_options) -> List[DetectionResult]:
+    """Score messages in order with a fresh engine (no training, no hot reload, every layer run)"""
+    engine = BotDetectionEngine(model_dir=model_dir, train=False, **engine_options)
+    try:
+        if signatures is not None:
+            engine.set_ruleset(Ruleset.compile(signatures, source="replay"))
+        results = []
+        for start in range(0, len(messages), batch_size):
+            results.extend(engine.detect_batch(list(messages[start:start + batch_size]), explain=True))
+        return results
+    finally:
+        engine.close()
+
+
+def evaluate(results: Sequence[DetectionResult], labels: Sequence[Optional[bool]],
+             threshold: float = 0.6, layers: Iterable[str] = LAYERS) -> Dict[str, Any]:
+    """
+    Precision/recall/F1 at threshold, ROC and PR summaries and per-layer hit
+    counts for layers (pass engine.layers.names() when plugins are registered;
+    any other layer that fired is counted too)
+    """
+    pairs = [(result, label) for result, label in zip(results, labels) if label is not None]
+    if not pairs:
+        raise ValueError("no labelled messages to evaluate")
+    scores = np.array([result.score for result, _ in pairs])
+    truth = np.array([label for _, label in pairs], dtype=bool)
+    predicted = scores >= threshold
+
+    tp = int(np.sum(predicted & truth))
+    fp = int(np.sum(predicted & ~truth))
+    fn = int(np.sum(~predicted & truth))
+    tn = int(np.sum(~predicted & ~truth))
+    precision = tp / (tp + fp) if tp + fp else 0.0
+    recall = tp / (tp + fn) if tp + fn else 0.0
+
+    layer_hits = {layer: {'bots': 0, 'humans': 0} for layer in layers}
+    for result, label in pairs:
+        for layer in result.contributions:
+            layer_hits.setdefault(layer, {'bots': 0, 'humans': 0})['bots' if label else 'humans'] += 1
+
+    report = {
+        'messages': len(results),
+        'labelled': len(pairs),
+        'bots': int(truth.sum()),
+        'humans': int((~truth).sum()),
+        'threshold': threshold,
+        'confusion': {'tp': tp, 'fp': fp, 'fn': fn, 'tn': tn},
+        'precision': precision,
+        'recall': recall,
+        'f1': 2 * precision * recall / (precision + recall) if precision + recall else 0.0,
+        'false_positive_rate': fp / (fp + tn) if fp + tn else 0.0,
+        'roc_auc': None,
+        'average_precision': None,
+        'best_f1': None,
+        'roc': [],
+        'calibration': None,
+        'layers': layer_hits,
+    }
+    if truth.all() or not truth.any():
+        return report  # ROC and calibration need both classes
+
+    report['roc_auc'] = float(roc_auc_score(truth, scores))
+    report['average_precision'] = float(average_precision_score(truth, scores))
+    fpr, tpr, thresholds = roc_curve(truth, scores)
+    # Scores are sums of a few weights, so the curve has few distinct points
+    # [fpr, tpr, threshold]; the first point (nothing flagged) has no threshold
+    report['roc'] = [[float(f), float(t), float(s) if np.isfinite(s) else None]
+                     for f, t, s in zip(fpr, tpr, thresholds)]
+    curve_precision, curve_recall, curve_thresholds = precision_recall_curve(truth, scores)
+    f1 = 2 * curve_precision * curve_recall / np.maximum(curve_precision + curve_recall, 1e-12)
+    best = int(np.argmax(f1[:-1]))  # the last point has no threshold
+    report['best_f1'] = {'threshold': float(curve_thresholds[best]), 'f1': float(f1[best]),
+                         'precision': float(curve_precision[best]), 'recall': float(curve_recall[best])}
+    report['calibration'] = ScoreCalibrator().fit(scores, truth).to_dict()
+    return report
+
+
+def expand_grid(base: Dict, grid: Dict[str, Iterable]) -> List[Tuple[str, Dict]]:
+    """Every combination of grid values ("section.field" -> values) applied to base"""
+    keys = list(grid)
+    for key in keys:
+        if key.count(".") != 1:
+            raise ValueError(f"grid key {key!r} must look like 'section.field'")
+    variants = []
+    for values in itertools.product(*(grid[key] for key in keys)):
+        signatures = copy.deepcopy(base)
+        for key, value in zip(keys, values):
+            section, field = key.split(".")
+            signatures.setdefault(section, {})[field] = value
+        variants.append((",".join(f"{key}={value}" for key, value in zip(keys, values)), signatures))
+    return variants
+
+
+def _init_worker(messages: List[Message], labels: List[Optional[bool]], options: Dict):
+    global _worker_stream
+    _worker_stream = (messages, labels, options)
+
+
+def _run_config(job: Tuple[str, Dict]) -> Tuple[str, Dict]:
+    name, signatures = job
+    messages, labels, options = _worker_stream
+    options = dict(options)
+    threshold = options.pop('threshold')
+    start = perf_counter()
+    results = replay(messages, signatures, bot_threshold=threshold, **options)
+    report = evaluate(results, labels, threshold)
+    report['ruleset'] = Ruleset.compile(signatures).digest
+    report['seconds'] = perf_counter() - start
+    return name, report
+
+
+def sweep(messages: List[Message], labels: List[Optional[bool]], configs: Sequence[Tuple[str, Dict]],
+          workers: Optional[int] = None, threshold: float = 0.6, **replay_options) -> Dict[str, Dict]:
+    """Replay and evaluate every (name, signatures) config, one process per config at a time"""
+    for name, signatures in configs:
+        Ruleset.compile(signatures, source=name)  # fail fast, before any process starts
+    options = dict(replay_options, threshold=threshold)
+    workers = max(1, min(workers or os.cpu_count() or 1, len(configs)))
+    if workers == 1:
+        _init_worker(messages, labels, options)
+        return dict(_run_config(job) for job in configs)
+    with ProcessPoolExecutor(workers, initializer=_init_worker, initargs=(messages, labels, options)) as pool:
+        return dict(pool.map(_run_config, configs))
+
+
+def format_reports(reports: Dict[str, Dict]) -> str:
+    def number(value):
+        return f"{value:.3f}" if value is not None else "-"
+
+    width = max([len("config")] + [len(name) for name in reports])
+    lines = [f"{'config':<{width}}  {'ROC AUC':>7}  {'AP':>5}  {'prec':>5}  {'recall':>6}  {'F1':>5}  "
+             f"{'FPR':>5}  best F1 @ threshold"]
+    ranked = sorted(reports.items(), key=lambda item: item[1]['roc_auc'] or 0.0, reverse=True)
+    for name, r in ranked:
+        best = r['best_f1']
+        lines.append(
+            f"{name:<{width}}  {number(r['roc_auc']):>7}  {number(r['average_precision']):>5}  "
+            f"{r['precision']:>5.3f}  {r['recall']:>6.3f}  {r['f1']:>5.3f}  {r['false_positive_rate']:>5.3f}  "
+            + (f"{best['f1']:.3f} @ {best['threshold']:.2f}" if best else "-")
+        )
+    return "\n".join(lines)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Replay a recorded stream and evaluate bot signatures")
+    parser.add_argument("stream", help="recorded messages (.jsonl or .parquet)")
+    parser.add_argument("--labels", help="JSON object mapping user_id to a label (true = bot)")
+    parser.add_argument("--config", action="append", default=[], help="bot signatures JSON (repeatable)")
+    parser.add_argument("--grid", help="JSON object of 'section.field' -> list of values to sweep")
+    parser.add_argument("--model-dir", help="frozen model snapshots for the ML layer")
+    parser.add_argument("--threshold", type=float, default=0.6, help="bot score threshold")
+    parser.add_argument("--workers", type=int, default=None, help="processes (default: one per CPU)")
+    parser.add_argument("--output", help="write the full reports (ROC points, layers) as JSON")
+    args = parser.parse_args(argv)
+
+    os.environ.setdefault("ANTIBOT_LOG_LEVEL", "WARNING")  # one engine per config, keep logs quiet
+
+    user_labels = None
+    if args.labels:
+        with open(args.labels, "r", encoding="utf-8") as f:
+            user_labels = json.load(f)
+    messages, labels = load_stream(args.stream, user_labels)
+
+    bases = []
+    for path in args.config:
+        with open(path, "r", encoding="utf-8") as f:
+            bases.append((Path(path).stem, json.load(f)))
+    bases = bases or [("defaults", copy.deepcopy(DEFAULT_SIGNATURES))]
+    configs = bases
+    if args.grid:
+        with open(args.grid, "r", encoding="utf-8") as f:
+            grid = json.load(f)
+        configs = [(f"{base}:{variant}" if len(bases) > 1 else variant, signatures)
+                   for base, signatures_base in bases
+                   for variant, signatures in expand_grid(signatures_base, grid)]
+
+    start = perf_counter()
+    reports = sweep(messages, labels, configs, workers=args.workers,
+                    threshold=args.threshold, model_dir=args.model_dir)
+    elapsed = perf_counter() - start
+    print(format_reports(reports))
+    print(f"\n{len(messages)} messages x {len(configs)} configs in {elapsed:.1f} s "
+          f"({len(messages) * len(configs) / elapsed:.0f} msgs/s)")
+    if args.output:
+        Path(args.output).write_text(json.dumps(reports, indent=2) + "\n", encoding="utf-8")
+        print(f"💾 Reports written to {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
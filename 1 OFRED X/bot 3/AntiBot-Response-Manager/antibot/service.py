@@ -0,0 +1,198 @@
+"""
+🌐 Headless scoring service
+Keeps one BotDetectionEngine resident (behavior store + warm model
+snapshots) and serves it over HTTP/JSON with aiohttp - no display server,
+no GUI imports.
+
+    python -m antibot.service --host 0.0.0.0 --port 8080
+
+POST /score        {"user_id": "u1", "text": "...", "timestamp": 1700000000.0}
+POST /score/batch  {"messages": [{"user_id": ..., "text": ..., "timestamp": ...}, ...]}
+GET  /health
+GET  /metrics       Prometheus text exposition
+GET  /metrics.json  the same counters as JSON
+timestamp is optional (defaults to the engine clock when the request arrives).
+With --early-exit, add "explain": true to either body for every layer's contribution.
+"""
+
+import argparse
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from aiohttp import web
+
+from .detection import BotDetectionEngine, DetectionResult, SQLiteBehaviorStore
+from .detection.instrumentation import metrics_json, prometheus_text
+from .logger import Logger
+
+# Request limits - keep a single request from monopolizing the engine
+MAX_BATCH = 1000
+MAX_TEXT_LENGTH = 10000
+
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+ENGINE_KEY = web.AppKey("engine", BotDetectionEngine)
+EXECUTOR_KEY = web.AppKey("executor", ThreadPoolExecutor)
+
+
+class RequestError(ValueError):
+    """Invalid request payload (answered with 400)"""
+
+
+def _parse_message(item, now: float) -> Tuple[str, str, float]:
+    if not isinstance(item, dict):
+        raise RequestError("message must be a JSON object")
+    user_id = item.get('user_id')
+    text = item.get('text')
+    timestamp = item.get('timestamp', now)
+    if not isinstance(user_id, str) or not user_id:
+        raise RequestError("'user_id' must be a non-empty string")
+    if not isinstance(text, str):
+        raise RequestError("'text' must be a string")
+    if len(text) > MAX_TEXT_LENGTH:
+        raise RequestError(f"'text' is longer than {MAX_TEXT_LENGTH} characters")
+    if isinstance(timestamp, bool) or not isinstance(timestamp, (int, float)):
+        raise RequestError("'timestamp' must be a number (unix seconds)")
+    return user_id, text, float(timestamp)
+
+
+def _explain(payload) -> bool:
+    explain = payload.get('explain', False) if isinstance(payload, dict) else False
+    if not isinstance(explain, bool):
+        raise RequestError("'explain' must be true or false")
+    return explain
+
+
+def _result(engine: BotDetectionEngine, result: DetectionResult) -> Dict:
+    return {
+        'user_id': result.user_id,
+        'score': result.score,
+        'is_bot': bool(engine.is_likely_bot(result.score)),
+        'reason': result.reason,
+        'probability': result.probability,
+        'contributions': result.contributions,
+        'skipped': list(result.skipped),
+    }
+
+
+async def _read_json(request: web.Request):
+    try:
+        return await request.json()
+    except ValueError:
+        raise RequestError("body must be valid JSON") from None
+
+
+async def _run(request: web.Request, func, *args):
+    # The engine is stateful and order-dependent: every call goes through one
+    # worker thread, so the event loop stays free and messages stay ordered
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(request.app[EXECUTOR_KEY], func, *args)
+
+
+async def score(request: web.Request) -> web.Response:
+    try:
+        payload = await _read_json(request)
+        user_id, text, timestamp = _parse_message(payload, request.app[ENGINE_KEY].clock())
+        explain = _explain(payload)
+    except RequestError as e:
+        return web.json_response({'error': str(e)}, status=400)
+
+    engine = request.app[ENGINE_KEY]
+    result = await _run(request, engine.detect, user_id, text, timestamp, explain)
+    return web.json_response(_result(engine, result))
+
+
+async def score_batch(request: web.Request) -> web.Response:
+    try:
+        payload = await _read_json(request)
+        items = payload.get('messages') if isinstance(payload, dict) else None
+        if not isinstance(items, list):
+            raise RequestError("'messages' must be a list")
+        if len(items) > MAX_BATCH:
+            return web.json_response({'error': f"at most {MAX_BATCH} messages per batch"}, status=413)
+        now = request.app[ENGINE_KEY].clock()
+        messages: List[Tuple[str, str, float]] = [_parse_message(item, now) for item in items]
+        explain = _explain(payload)
+    except RequestError as e:
+        return web.json_response({'error': str(e)}, status=400)
+
+    engine = request.app[ENGINE_KEY]
+    results = await _run(request, engine.detect_batch, messages, explain)
+    return web.json_response({'results': [_result(engine, result) for result in results]})
+
+
+async def health(request: web.Request) -> web.Response:
+    engine = request.app[ENGINE_KEY]
+    model = engine.trainer.model
+    return web.json_response({
+        'status': 'ok',
+        'tracked_users': len(engine.user_behaviors),
+        'evicted_users': engine.user_behaviors.evicted,
+        'model_version': model.version if model else None,
+        'training_samples': engine.trainer.samples_seen,
+    })
+
+
+async def metrics(request: web.Request) -> web.Response:
+    engine = request.app[ENGINE_KEY]
+    # Rendered on the engine thread so counters are not read mid-update
+    body = await _run(request, prometheus_text, engine.metrics, engine.instrumentation)
+    return web.Response(text=body, headers={'Content-Type': PROMETHEUS_CONTENT_TYPE})
+
+
+async def metrics_dump(request: web.Request) -> web.Response:
+    engine = request.app[ENGINE_KEY]
+    return web.json_response(await _run(request, metrics_json, engine.metrics, engine.instrumentation))
+
+
+def create_app(engine: BotDetectionEngine, close_engine: bool = True) -> web.Application:
+    """aiohttp application around an already constructed engine"""
+    app = web.Application()
+    app[ENGINE_KEY] = engine
+    app[EXECUTOR_KEY] = ThreadPoolExecutor(max_workers=1, thread_name_prefix="engine")
+    app.router.add_post("/score", score)
+    app.router.add_post("/score/batch", score_batch)
+    app.router.add_get("/health", health)
+    app.router.add_get("/metrics", metrics)
+    app.router.add_get("/metrics.json", metrics_dump)
+
+    async def shutdown(app: web.Application):
+        app[EXECUTOR_KEY].shutdown(wait=True)
+        if close_engine:
+            app[ENGINE_KEY].close()
+
+    app.on_cleanup.append(shutdown)
+    return app
+
+
+def main(argv: Optional[Sequence[str]] = None):
+    parser = argparse.ArgumentParser(description="Headless AntiBot scoring service")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--config", default="config/bot_signatures.json", help="bot signatures JSON")
+    parser.add_argument("--data-dir", default="data", help="behavior store and model snapshots")
+    parser.add_argument("--no-instrument", action="store_true", help="skip per-stage latency timers")
+    parser.add_argument("--no-watch-config", action="store_true", help="load the signatures once, no hot reload")
+    parser.add_argument("--max-users", type=int, default=100_000, help="users kept in memory (rest stay in the store)")
+    parser.add_argument("--idle-ttl", type=float, default=86400.0, help="seconds before an idle user is evicted")
+    parser.add_argument("--early-exit", action="store_true",
+                        help="stop scoring a message once its verdict is settled (partial contributions)")
+    args = parser.parse_args(argv)
+
+    engine = BotDetectionEngine(
+        config_path=args.config,
+        behavior_store=SQLiteBehaviorStore(f"{args.data_dir}/behaviors"),
+        model_dir=f"{args.data_dir}/models",
+        watch_config=not args.no_watch_config,
+        max_users=args.max_users,
+        idle_ttl=args.idle_ttl,
+        early_exit=args.early_exit,
+    )
+    engine.instrumentation.enabled = not args.no_instrument
+    Logger("Service").info("Scoring service listening on %s:%d", args.host, args.port)
+    web.run_app(create_app(engine), host=args.host, port=args.port, print=None)
+
+
+if __name__ == "__main__":
+    main()
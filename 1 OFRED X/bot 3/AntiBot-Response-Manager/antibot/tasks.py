@@ -0,0 +1,244 @@
+"""
+🧵 GUI task executor
+Runs blocking work (network calls, scoring, scans) on worker threads and
+hands results back on the UI thread. Completions and progress reports are
+queued by the workers and drained by a pump that the UI toolkit schedules
+every frame (Tk: `after`), with a per-frame time budget so a burst of
+results never stalls redrawing.
+
+    tasks = TaskExecutor(self.after)
+    tasks.submit(engine.analyze_user, user, text, lane="engine", on_done=self.show_result)
+
+Work that touches shared, non-thread-safe state (BotDetectionEngine) goes
+to a named serial lane; everything else shares the thread pool. Inside a
+task, current_task() gives access to progress reporting and cancellation.
+"""
+
+import queue
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+from .logger import Logger
+
+_local = threading.local()
+
+
+class TaskCancelled(Exception):
+    """Raised by Task.check() inside a task that has been cancelled"""
+
+
+def current_task() -> Optional["Task"]:
+    """The Task running on this worker thread, if any"""
+    return getattr(_local, 'task', None)
+
+
+class Task:
+    """Handle for submitted work: cancel(), progress reporting and state"""
+
+    def __init__(self, executor: "TaskExecutor", name: str, key: Optional[str],
+                 on_done: Optional[Callable], on_error: Optional[Callable],
+                 on_progress: Optional[Callable], on_cancel: Optional[Callable]):
+        self.executor = executor
+        self.name = name
+        self.key = key
+        self.on_done = on_done
+        self.on_error = on_error
+        self.on_progress = on_progress
+        self.on_cancel = on_cancel
+        self.future: Optional[Future] = None
+        self.progress: Optional[float] = None
+        self.message = ""
+        self._cancelled = threading.Event()
+        self._delivered = False  # on_done/on_error already ran
+        self._cancel_callbacks: List[Callable[[], None]] = []
+        self._lock = threading.Lock()
+
+    @property
+    def cancelled(self) -> bool:
+        return self._cancelled.is_set()
+
+    @property
+    def done(self) -> bool:
+        return self.future is not None and self.future.done()
+
+    def cancel(self):
+        """Stop delivering callbacks; queued work is dropped, running work sees `cancelled`"""
+        with self._lock:
+            if self._cancelled.is_set() or self._delivered:
+                return
+            self._cancelled.set()
+            callbacks = list(self._cancel_callbacks)
+        if self.future is not None:
+            self.future.cancel()
+        for callback in callbacks:
+            try:
+                callback()
+            except Exception as e:
+                self.executor.logger.error("Cancel callback for %s failed: %s", self.name, e)
+        self.executor._post(self, 'cancel', None)
+
+    def add_cancel_callback(self, callback: Callable[[], None]):
+        """Called (on the cancelling thread) when the task is cancelled, e.g. to stop an I/O loop"""
+        with self._lock:
+            if not self._cancelled.is_set():
+                self._cancel_callbacks.append(callback)
+                return
+        callback()
+
+    def check(self):
+        """Raise TaskCancelled if cancelled - call between steps of long work"""
+        if self._cancelled.is_set():
+            raise TaskCancelled(self.name)
+
+    def report(self, progress: Optional[float] = None, message: str = ""):
+        """Progress from the worker: fraction 0-1 (or None if unknown) and a status line"""
+        self.progress = progress
+        self.message = message
+        self.executor._post(self, 'progress', (progress, message))
+
+
+class TaskExecutor:
+    """
+    Thread pool + per-frame result marshaling for a UI thread.
+    schedule(ms, callback) must run callback on the UI thread after ms
+    milliseconds - Tk's widget.after fits as is.
+    """
+
+    def __init__(self, schedule: Callable[[int, Callable[[], None]], Any], workers: int = 4,
+                 lanes: Iterable[str] = ("engine",), frame_ms: int = 16, budget_ms: float = 8.0):
+        self.schedule = schedule
+        self.frame_ms = frame_ms
+        self.budget = budget_ms / 1000.0
+        self.logger = Logger("TaskExecutor")
+
+        self._pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="gui-task")
+        self._lanes: Dict[str, ThreadPoolExecutor] = {
+            name: ThreadPoolExecutor(max_workers=1, thread_name_prefix=f"gui-{name}")
+            for name in lanes
+        }
+        self._events: "queue.SimpleQueue" = queue.SimpleQueue()
+        self._active: Dict[str, Task] = {}
+        self._pending = 0
+        self._pumping = False
+        self._closed = False
+
+    def lane(self, name: str) -> ThreadPoolExecutor:
+        """The serial executor behind a lane, for code that takes an executor"""
+        return self._lanes[name]
+
+    def submit(self, fn: Callable, *args, on_done: Optional[Callable[[Any], None]] = None,
+               on_error: Optional[Callable[[BaseException], None]] = None,
+               on_progress: Optional[Callable[[Optional[float], str], None]] = None,
+               on_cancel: Optional[Callable[[], None]] = None,
+               lane: Optional[str] = None, key: Optional[str] = None, **kwargs) -> Task:
+        """
+        Run fn(*args, **kwargs) off the UI thread. Callbacks run on the UI
+        thread; a task submitted with the key of a running one replaces it.
+        Must be called from the UI thread.
+        """
+        if self._closed:
+            raise RuntimeError("TaskExecutor is shut down")
+        if key is not None and key in self._active:
+            self._active[key].cancel()
+
+        task = Task(self, getattr(fn, '__name__', repr(fn)), key, on_done, on_error, on_progress, on_cancel)
+        if key is not None:
+            self._active[key] = task
+        executor = self._lanes[lane] if lane is not None else self._pool
+        self._pending += 1
+        task.future = executor.submit(self._run, task, fn, args, kwargs)
+        self._ensure_pump()
+        return task
+
+    def _run(self, task: Task, fn: Callable, args, kwargs):
+        _local.task = task
+        try:
+            task.check()
+            result = fn(*args, **kwargs)
+        except TaskCancelled:
+            pass
+        except BaseException as e:
+            self._post(task, 'error', e)
+        else:
+            self._post(task, 'done', result)
+        finally:
+            _local.task = None
+            self._post(task, 'finished', None)
+
+    def _post(self, task: Task, kind: str, payload):
+        self._events.put((task, kind, payload))
+
+    def _ensure_pump(self):
+        if not self._pumping:
+            self._pumping = True
+            self.schedule(self.frame_ms, self._pump)
+
+    def _pump(self):
+        """One UI frame: deliver queued events until the time budget runs out"""
+        deadline = time.perf_counter() + self.budget
+        progress: Dict[Task, tuple] = {}
+        while time.perf_counter() < deadline:
+            try:
+                task, kind, payload = self._events.get_nowait()
+            except queue.Empty:
+                break
+            if kind == 'progress':
+                progress[task] = payload  # only the latest report per frame is shown
+            elif kind == 'finished':
+                self._pending -= 1
+                if task.key is not None and self._active.get(task.key) is task:
+                    del self._active[task.key]
+            else:
+                progress.pop(task, None)
+                self._deliver(task, kind, payload)
+
+        for task, (fraction, message) in progress.items():
+            if not task.cancelled and task.on_progress is not None:
+                self._call(task, task.on_progress, fraction, message)
+
+        self._pumping = False
+        if not self._closed and (self._pending > 0 or not self._events.empty()):
+            self._ensure_pump()
+
+    def _deliver(self, task: Task, kind: str, payload):
+        if kind == 'cancel':
+            if task.on_cancel is not None:
+                self._call(task, task.on_cancel)
+            if task.future is not None and task.future.cancelled():
+                # Never started, so _run will not report it finished
+                self._post(task, 'finished', None)
+        elif task.cancelled:
+            return
+        else:
+            task._delivered = True
+        if kind == 'done':
+            if task.on_done is not None:
+                self._call(task, task.on_done, payload)
+        elif kind == 'error':
+            self.logger.error("Task %s failed: %s", task.name, payload)
+            if task.on_error is not None:
+                self._call(task, task.on_error, payload)
+
+    def _call(self, task: Task, callback: Callable, *args):
+        try:
+            callback(*args)
+        except Exception as e:
+            self.logger.error("Callback for task %s failed: %s", task.name, e)
+
+    @property
+    def pending(self) -> int:
+        """Tasks submitted but not yet finished"""
+        return self._pending
+
+    def cancel_all(self):
+        for task in list(self._active.values()):
+            task.cancel()
+
+    def shutdown(self, wait: bool = True):
+        """Cancel keyed tasks, drop queued work and (optionally) wait for running work"""
+        self._closed = True
+        self.cancel_all()
+        for executor in [self._pool, *self._lanes.values()]:
+            executor.shutdown(wait=wait, cancel_futures=True)
@@ -0,0 +1,265 @@
+"""
+⏱️ Detection benchmarks
+Replays synthetic human/bot traffic (tests/workload.py) through the
+detector and measures throughput, per-call p50/p99 latency and RSS growth
+for analyze_user, analyze_batch and the ML layer on its own, then compares
+them with a saved baseline; any regression beyond the tolerance exits 1.
+
+    python -m tests.benchmark                  # full run, compare with baseline
+    python -m tests.benchmark --quick          # smaller workload (separate baseline)
+    python -m tests.benchmark --save-baseline  # record this machine's numbers
+
+Baselines are machine-specific: re-record after changing hardware.
+"""
+
+import argparse
+import json
+import os
+import platform
+import resource
+import sys
+import tempfile
+import time
+from pathlib import Path
+from time import perf_counter
+from typing import Dict, List
+
+os.environ.setdefault("ANTIBOT_LOG_LEVEL", "WARNING")
+os.environ.setdefault("ANTIBOT_LOG_DIR", os.path.join(tempfile.gettempdir(), "antibot-benchmark-logs"))
+
+import numpy as np
+
+from antibot.detection import BotDetectionEngine
+from tests.workload import WorkloadConfig, generate
+
+BASELINE_PATH = Path(__file__).with_name("benchmark_baseline.json")
+BATCH_SIZE = 256
+
+# Metrics where a higher value is better; every other metric is lower-is-better
+HIGHER_IS_BETTER = ("msgs_per_sec",)
+# RSS is noisy at small values: growth within this many MB is never a regression
+RSS_SLACK_MB = 16.0
+
+WORKLOADS = {
+    'full': {
+        'stream': WorkloadConfig(humans=100, bots=10, duration=3600.0),
+        'long_run': WorkloadConfig(humans=1000, bots=50, duration=6 * 3600.0, seed=1),
+        'ml_rows': 2000,
+    },
+    'quick': {
+        'stream': WorkloadConfig(humans=50, bots=5, duration=1800.0),
+        'long_run': WorkloadConfig(humans=200, bots=10, duration=3 * 3600.0, seed=1),
+        'ml_rows': 1000,
+    },
+}
+
+
+def rss_mb() -> float:
+    """Current resident set size (peak RSS where /proc is unavailable)"""
+    try:
+        with open("/proc/self/statm") as f:
+            pages = int(f.read().split()[1])
+        return pages * os.sysconf("SC_PAGE_SIZE") / 2 ** 20
+    except (OSError, ValueError):
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak / 2 ** 20 if sys.platform == "darwin" else peak / 2 ** 10
+
+
+def summarize(latencies: List[float], messages: int, elapsed: float) -> Dict[str, float]:
+    """Throughput plus p50/p99 per call, in milliseconds"""
+    p50, p99 = np.percentile(np.asarray(latencies) * 1000.0, [50, 99])
+    return {
+        'msgs_per_sec': messages / elapsed,
+        'p50_ms': float(p50),
+        'p99_ms': float(p99),
+    }
+
+
+def fitted_engine() -> BotDetectionEngine:
+    """A frozen engine (no background refits) with a deterministic anomaly model"""
+    engine = BotDetectionEngine(train=False)
+    rng = np.random.default_rng(0)
+    for row in rng.normal(size=(500, len(engine.FEATURE_NAMES))):
+        engine.trainer.observe(row)
+    engine.trainer.refit()
+    return engine
+
+
+def bench_analyze_user(messages) -> Dict[str, float]:
+    engine = fitted_engine()
+    latencies = []
+    start = perf_counter()
+    for user_id, text, timestamp in messages:
+        t0 = perf_counter()
+        engine.analyze_user(user_id, text, timestamp)
+        latencies.append(perf_counter() - t0)
+    elapsed = perf_counter() - start
+    engine.close()
+    return summarize(latencies, len(messages), elapsed)
+
+
+def bench_analyze_batch(messages) -> Dict[str, float]:
+    engine = fitted_engine()
+    latencies = []
+    start = perf_counter()
+    for i in range(0, len(messages), BATCH_SIZE):
+        t0 = perf_counter()
+        engine.analyze_batch(messages[i:i + BATCH_SIZE])
+        latencies.append(perf_counter() - t0)
+    elapsed = perf_counter() - start
+    engine.close()
+    return summarize(latencies, len(messages), elapsed)
+
+
+def bench_ml(rows: int) -> Dict[str, Dict[str, float]]:
+    """The anomaly model alone: one row per call (analyze_user) vs batches (analyze_batch)"""
+    engine = fitted_engine()
+    model = engine.trainer.model
+    features = np.random.default_rng(1).normal(size=(rows, len(engine.FEATURE_NAMES)))
+
+    latencies = []
+    start = perf_counter()
+    for row in features:
+        t0 = perf_counter()
+        model.anomaly_scores([row])
+        latencies.append(perf_counter() - t0)
+    single = summarize(latencies, rows, perf_counter() - start)
+
+    latencies = []
+    start = perf_counter()
+    for i in range(0, rows, BATCH_SIZE):
+        t0 = perf_counter()
+        model.anomaly_scores(features[i:i + BATCH_SIZE])
+        latencies.append(perf_counter() - t0)
+    batch = summarize(latencies, rows, perf_counter() - start)
+    engine.close()
+    return {'ml_single': single, 'ml_batch': batch}
+
+
+def bench_long_run(messages) -> Dict[str, float]:
+    """analyze_batch over hours of traffic; RSS growth after the first tenth"""
+    engine = fitted_engine()
+    warmup = len(messages) // 10
+    latencies = []
+    rss_start = None
+    start = perf_counter()
+    for i in range(0, len(messages), BATCH_SIZE):
+        if rss_start is None and i >= warmup:
+            rss_start = rss_mb()
+        t0 = perf_counter()
+        engine.analyze_batch(messages[i:i + BATCH_SIZE])
+        latencies.append(perf_counter() - t0)
+    elapsed = perf_counter() - start
+    growth = rss_mb() - (rss_start if rss_start is not None else rss_mb())
+    engine.close()
+    result = summarize(latencies, len(messages), elapsed)
+    result['rss_growth_mb'] = growth
+    return result
+
+
+def run(mode: str = "full") -> Dict[str, Dict[str, float]]:
+    """All benchmark cases for one workload size"""
+    workload = WORKLOADS[mode]
+    stream = generate(workload['stream'])
+    long_run = generate(workload['long_run'])
+
+    results = {
+        'analyze_user': bench_analyze_user(stream),
+        'analyze_batch': bench_analyze_batch(stream),
+    }
+    results.update(bench_ml(workload['ml_rows']))
+    results['long_run'] = bench_long_run(long_run)
+    for case, messages in (('analyze_user', stream), ('analyze_batch', stream), ('long_run', long_run)):
+        results[case]['messages'] = len(messages)
+    return results
+
+
+def compare(results: Dict, baseline: Dict, tolerance: float = 0.3) -> List[str]:
+    """Human-readable regressions of results against baseline (empty if none)"""
+    regressions = []
+    for case, expected in baseline.items():
+        measured = results.get(case)
+        if measured is None:
+            regressions.append(f"{case}: missing from results")
+            continue
+        for metric, base in expected.items():
+            if metric == 'messages' or metric not in measured:
+                continue
+            value = measured[metric]
+            if metric in HIGHER_IS_BETTER:
+                limit = base * (1 - tolerance)
+                failed = value < limit
+            elif metric == 'rss_growth_mb':
+                limit = base + max(abs(base) * tolerance, RSS_SLACK_MB)
+                failed = value > limit
+            else:
+                limit = base * (1 + tolerance)
+                failed = value > limit
+            if failed:
+                regressions.append(f"{case}.{metric}: {value:.3f} vs baseline {base:.3f} (limit {limit:.3f})")
+    return regressions
+
+
+def machine_info() -> Dict[str, str]:
+    return {
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'processor': platform.processor() or platform.machine(),
+        'cpus': str(os.cpu_count()),
+        'numpy': np.__version__,
+        'recorded': time.strftime("%Y-%m-%d"),
+    }
+
+
+def format_results(results: Dict, baseline: Dict) -> str:
+    lines = [f"{'case':<15}{'msgs/s':>12}{'p50 ms':>10}{'p99 ms':>10}{'rss MB':>9}   baseline msgs/s"]
+    for case, r in results.items():
+        base = baseline.get(case, {}).get('msgs_per_sec')
+        rss = f"{r['rss_growth_mb']:+.1f}" if 'rss_growth_mb' in r else "-"
+        lines.append(
+            f"{case:<15}{r['msgs_per_sec']:>12.0f}{r['p50_ms']:>10.3f}{r['p99_ms']:>10.3f}{rss:>9}   "
+            + (f"{base:.0f}" if base else "-")
+        )
+    return "\n".join(lines)
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="AntiBot detection benchmarks")
+    parser.add_argument("--quick", action="store_true", help="smaller workload")
+    parser.add_argument("--baseline", default=str(BASELINE_PATH), help="baseline JSON file")
+    parser.add_argument("--save-baseline", action="store_true", help="record results as the new baseline")
+    parser.add_argument("--tolerance", type=float, default=0.3, help="allowed relative regression (0.3 = 30%%)")
+    args = parser.parse_args(argv)
+
+    mode = "quick" if args.quick else "full"
+    path = Path(args.baseline)
+    saved = json.loads(path.read_text(encoding="utf-8")) if path.exists() else {}
+    baseline = saved.get(mode, {})
+
+    results = run(mode)
+    print(format_results(results, baseline))
+
+    if args.save_baseline:
+        saved[mode] = results
+        saved['machine'] = machine_info()
+        path.write_text(json.dumps(saved, indent=2) + "\n", encoding="utf-8")
+        print(f"\n💾 Baseline saved to {path} ({mode})")
+        return 0
+
+    if not baseline:
+        print(f"\n⚠️ No {mode} baseline in {path}; run with --save-baseline first")
+        return 0
+
+    regressions = compare(results, baseline, args.tolerance)
+    if regressions:
+        print(f"\n❌ PERFORMANCE REGRESSION (tolerance {args.tolerance:.0%}, baseline from "
+              f"{saved.get('machine', {}).get('platform', 'unknown machine')}):", file=sys.stderr)
+        for line in regressions:
+            print(f"   {line}", file=sys.stderr)
+        return 1
+    print(f"\n✅ Within {args.tolerance:.0%} of the {mode} baseline")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
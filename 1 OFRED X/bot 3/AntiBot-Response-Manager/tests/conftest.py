@@ -0,0 +1,24 @@
+"""
+Shared test setup: the process-wide log writer goes to a scratch directory
+"""
+
+import os
+import shutil
+import tempfile
+
+_log_dir = None
+
+
+def pytest_configure(config):
+    # Before any test module builds a Logger, so default_writer() picks it up
+    # (and subprocesses such as shard workers inherit it)
+    global _log_dir
+    _log_dir = tempfile.mkdtemp(prefix="antibot-test-logs-")
+    os.environ["ANTIBOT_LOG_DIR"] = _log_dir
+
+
+def pytest_unconfigure(config):
+    from antibot.logger import default_writer
+
+    default_writer().close()
+    shutil.rmtree(_log_dir, ignore_errors=True)
@@ -0,0 +1,47 @@
+"""
+Tests that analyze_batch scores a backlog exactly like analyze_user
+"""
+
+import unittest
+
+from antibot.detection import BotDetectionEngine
+
+
+def messages():
+    """Two chatty humans, a slow repeater and a rapid-fire spammer, interleaved"""
+    stream = []
+    for i in range(6):
+        stream.append(("alice", f"did anyone watch the match on sunday {i}", 100.0 + 60.0 * i))
+        stream.append(("bob", f"Pretty sure it was a draw, replay number {i}?", 130.0 + 60.0 * i))
+        stream.append(("repeater", "same old line again", 110.0 + 120.0 * i))
+        stream.append(("spammer", "CHECK OUT MY PROFILE link in bio subscribe now", 200.0 + i))
+    stream.append(("links", "http://a.io http://b.io http://c.io http://d.io", 500.0))
+    return stream
+
+
+class TestAnalyzeBatch(unittest.TestCase):
+    """Batch results match the single-message path exactly"""
+
+    def test_matches_analyze_user(self):
+        backlog = messages()
+        batched = BotDetectionEngine()
+        batch = batched.analyze_batch(backlog)
+        engine = BotDetectionEngine()
+        single = [engine.analyze_user(*message) for message in backlog]
+        batched.close()
+        engine.close()
+        self.assertEqual(batch, single)
+
+        reasons = " | ".join(reason for _, reason in batch)
+        self.assertIn("Rapid-fire messaging", reasons)
+        self.assertIn("Highly repetitive messages", reasons)
+        self.assertIn("URL bombing", reasons)
+
+    def test_empty_backlog(self):
+        engine = BotDetectionEngine()
+        self.assertEqual(engine.analyze_batch([]), [])
+        engine.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
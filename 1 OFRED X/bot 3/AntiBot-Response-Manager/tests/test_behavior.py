@@ -0,0 +1,134 @@
+"""
+Tests for the bounded per-user behavior state
+"""
+
+import random
+import unittest
+
+import numpy as np
+
+from antibot.detection.behavior import RecentTimes, RingBuffer, RollingStats, UserBehavior
+
+
+class TestRingBuffer(unittest.TestCase):
+    """Fixed-capacity history window"""
+
+    def test_keeps_last_values_in_order(self):
+        buf = RingBuffer(4)
+        for value in range(10):
+            buf.append(value)
+        self.assertEqual(len(buf), 4)
+        self.assertEqual(list(buf), [6.0, 7.0, 8.0, 9.0])
+        self.assertEqual(buf[-1], 9.0)
+        self.assertEqual(buf[0], 6.0)
+        self.assertEqual(buf[-3:], [7.0, 8.0, 9.0])
+
+    def test_partial_fill(self):
+        buf = RingBuffer(8)
+        buf.append(1.5)
+        buf.append(2.5)
+        self.assertEqual(buf[-5:], [1.5, 2.5])
+        with self.assertRaises(IndexError):
+            buf[2]
+
+    def test_invalid_capacity(self):
+        with self.assertRaises(ValueError):
+            RingBuffer(0)
+
+
+class TestRecentTimes(unittest.TestCase):
+    """Sorted, horizon- and depth-bounded timestamps"""
+
+    def test_trims_to_horizon_and_depth(self):
+        times = RecentTimes()
+        for t in range(100):
+            times.add(float(t), horizon=30.0, depth=50)
+        self.assertEqual(list(times), [float(t) for t in range(70, 100)])
+        for t in range(100, 200):
+            times.add(t / 10 + 90, horizon=30.0, depth=5)
+        self.assertEqual(len(times), 5)
+
+    def test_late_arrivals_stay_sorted(self):
+        times = RecentTimes()
+        for t in (1.0, 5.0, 3.0, 4.0, 2.0):
+            times.add(t, horizon=100.0, depth=10)
+        self.assertEqual(list(times), [1.0, 2.0, 3.0, 4.0, 5.0])
+
+    def test_within_matches_brute_force(self):
+        rng = random.Random(0)
+        times = RecentTimes()
+        seen = []
+        for _ in range(500):
+            t = (seen[-1] if seen else 0.0) + rng.expovariate(0.5)
+            seen.append(t)
+            times.add(t, horizon=60.0, depth=20)
+            for seconds, min_msgs in ((10.0, 5), (60.0, 20)):
+                expected = sum(1 for s in seen if s > t - seconds) >= min_msgs
+                self.assertEqual(times.within(seconds, min_msgs), expected)
+
+
+class TestRollingStats(unittest.TestCase):
+    """Welford running statistics"""
+
+    def test_matches_numpy(self):
+        rng = random.Random(7)
+        values = [rng.uniform(0, 500) for _ in range(1000)]
+        stats = RollingStats()
+        for value in values:
+            stats.push(value)
+        self.assertEqual(stats.count, len(values))
+        self.assertAlmostEqual(stats.mean, np.mean(values), places=9)
+        self.assertAlmostEqual(stats.std, np.std(values), places=9)
+        self.assertEqual(stats.min, min(values))
+        self.assertEqual(stats.max, max(values))
+
+    def test_empty(self):
+        stats = RollingStats()
+        self.assertEqual(stats.variance, 0.0)
+        self.assertEqual(stats.std, 0.0)
+
+    def test_dict_round_trip(self):
+        stats = RollingStats()
+        for value in (3, 5, 11):
+            stats.push(value)
+        restored = RollingStats.from_dict(stats.to_dict())
+        self.assertEqual(restored.to_dict(), stats.to_dict())
+
+
+class TestUserBehavior(unittest.TestCase):
+    """Bounded per-user tracking"""
+
+    def test_window_is_capped_but_stats_cover_history(self):
+        user = UserBehavior("u1", window=5)
+        timestamps = [100.0 + 2.0 * i for i in range(50)]
+        for i, ts in enumerate(timestamps):
+            user.record(ts, 10 + i)
+        self.assertEqual(user.message_count, 50)
+        self.assertEqual(len(user.timestamps), 5)
+        self.assertEqual(user.timestamps[-1], timestamps[-1])
+        self.assertAlmostEqual(user.interval_stats.mean, np.mean(np.diff(timestamps)))
+        self.assertAlmostEqual(user.length_stats.mean, np.mean(range(10, 60)))
+        self.assertEqual(user.to_dict()['message_count'], 50)
+
+    def test_interval_variation(self):
+        user = UserBehavior("u1")
+        for t in range(5):
+            user.record(30.0 * t, 10)
+        self.assertIsNone(user.interval_variation())  # 4 intervals are not enough
+        user.record(150.0, 10)
+        self.assertEqual(user.interval_variation(), 0.0)
+
+        jittery = UserBehavior("u2")
+        times = np.cumsum(np.random.default_rng(0).exponential(30.0, size=30))
+        for t in times:
+            jittery.record(float(t), 10)
+        self.assertAlmostEqual(jittery.interval_variation(), np.std(np.diff(times)) / np.mean(np.diff(times)))
+
+    def test_has_no_instance_dict(self):
+        user = UserBehavior("u1")
+        with self.assertRaises(AttributeError):
+            user.extra = 1
+
+
+if __name__ == "__main__":
+    unittest.main()
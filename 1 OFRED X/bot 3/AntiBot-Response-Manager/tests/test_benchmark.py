@@ -0,0 +1,88 @@
+"""
+Tests for the synthetic workload generator and the benchmark regression check
+Set ANTIBOT_BENCH=1 to also run the quick benchmark against the saved baseline.
+"""
+
+import json
+import os
+import unittest
+
+from antibot.detection import BotDetectionEngine
+from tests import benchmark
+from tests.workload import WorkloadConfig, generate
+
+
+class TestWorkload(unittest.TestCase):
+    """Deterministic, time-ordered human and bot streams"""
+
+    config = WorkloadConfig(humans=20, bots=4, duration=1800.0)
+
+    def test_deterministic_and_sorted(self):
+        messages = generate(self.config)
+        self.assertEqual(messages, generate(self.config))
+        self.assertNotEqual(messages, generate(WorkloadConfig(humans=20, bots=4, duration=1800.0, seed=1)))
+        timestamps = [ts for _, _, ts in messages]
+        self.assertEqual(timestamps, sorted(timestamps))
+
+    def test_users_and_rates(self):
+        messages = generate(self.config)
+        authors = {user_id for user_id, _, _ in messages}
+        self.assertEqual(sum(a.startswith("human") for a in authors), 20)
+        self.assertEqual(sum(a.startswith("bot") for a in authors), 4)
+        per_bot = sum(user_id == "bot0" for user_id, _, _ in messages)
+        per_human = sum(user_id == "human0" for user_id, _, _ in messages)
+        self.assertGreater(per_bot, 3 * per_human)
+
+    def test_bots_score_higher(self):
+        engine = BotDetectionEngine(train=False)
+        results = engine.analyze_batch(generate(self.config))
+        engine.close()
+        scores = {"human": [], "bot": []}
+        for (user_id, _, _), (score, _) in zip(generate(self.config), results):
+            scores["bot" if user_id.startswith("bot") else "human"].append(score)
+        mean = {kind: sum(values) / len(values) for kind, values in scores.items()}
+        self.assertGreater(mean["bot"], mean["human"] + 0.2)
+
+
+class TestCompare(unittest.TestCase):
+    """Regressions beyond the tolerance are reported, noise within it is not"""
+
+    baseline = {
+        'analyze_user': {'msgs_per_sec': 1000.0, 'p50_ms': 1.0, 'p99_ms': 2.0, 'messages': 500},
+        'long_run': {'msgs_per_sec': 2000.0, 'p50_ms': 10.0, 'p99_ms': 20.0, 'rss_growth_mb': 10.0},
+    }
+
+    def test_within_tolerance(self):
+        results = {
+            'analyze_user': {'msgs_per_sec': 800.0, 'p50_ms': 1.2, 'p99_ms': 2.5, 'messages': 900},
+            'long_run': {'msgs_per_sec': 2500.0, 'p50_ms': 9.0, 'p99_ms': 25.0, 'rss_growth_mb': 25.0},
+        }
+        self.assertEqual(benchmark.compare(results, self.baseline, tolerance=0.3), [])
+
+    def test_regressions_reported(self):
+        results = {
+            'analyze_user': {'msgs_per_sec': 500.0, 'p50_ms': 1.0, 'p99_ms': 3.0},
+            'long_run': {'msgs_per_sec': 2000.0, 'p50_ms': 10.0, 'p99_ms': 20.0, 'rss_growth_mb': 40.0},
+        }
+        regressions = benchmark.compare(results, self.baseline, tolerance=0.3)
+        self.assertEqual(len(regressions), 3)
+        self.assertTrue(regressions[0].startswith("analyze_user.msgs_per_sec"))
+        self.assertTrue(regressions[1].startswith("analyze_user.p99_ms"))
+        self.assertTrue(regressions[2].startswith("long_run.rss_growth_mb"))
+        self.assertEqual(benchmark.compare({}, self.baseline), ["analyze_user: missing from results",
+                                                                "long_run: missing from results"])
+
+    def test_saved_baseline_has_every_case(self):
+        saved = json.loads(benchmark.BASELINE_PATH.read_text(encoding="utf-8"))
+        for mode in benchmark.WORKLOADS:
+            self.assertEqual(set(saved[mode]), {'analyze_user', 'analyze_batch', 'ml_single', 'ml_batch', 'long_run'})
+
+
+@unittest.skipUnless(os.getenv("ANTIBOT_BENCH"), "set ANTIBOT_BENCH=1 to run benchmarks")
+class TestBenchmark(unittest.TestCase):
+    def test_quick_benchmark_matches_baseline(self):
+        self.assertEqual(benchmark.main(["--quick"]), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,125 @@
+"""
+Tests for the resident-user cache, idle eviction and counter decay
+"""
+
+import os
+import random
+import tempfile
+import unittest
+
+from antibot.detection import BotDetectionEngine, SQLiteBehaviorStore, UserBehavior, UserCache
+from antibot.detection.behavior import RollingStats
+from antibot.detection.store import BehaviorStore
+
+
+def user(user_id: str, timestamp: float) -> UserBehavior:
+    behavior = UserBehavior(user_id, created_at=0.0)
+    behavior.record(timestamp, 10)
+    return behavior
+
+
+class TestUserCache(unittest.TestCase):
+    """LRU budget plus idle TTL"""
+
+    def test_lru_budget(self):
+        cache = UserCache(BehaviorStore(), max_users=3, idle_ttl=1e9)
+        for i in range(4):
+            cache.put(user(f"u{i}", float(i)), float(i))
+        cache.put(cache.get("u1"), 5.0)  # touch u1
+        cache.put(user("u4", 6.0), 6.0)
+        self.assertEqual(list(cache), ["u3", "u1", "u4"])
+        self.assertEqual(cache.evicted, 2)
+        self.assertNotIn("u0", cache)
+
+    def test_idle_ttl(self):
+        cache = UserCache(BehaviorStore(), max_users=100, idle_ttl=60.0)
+        cache.put(user("old", 0.0), 0.0)
+        cache.put(user("recent", 50.0), 50.0)
+        cache.put(user("now", 100.0), 100.0)
+        self.assertEqual(list(cache), ["recent", "now"])
+        self.assertEqual(len(cache), 2)
+
+    def test_budget_must_be_positive(self):
+        with self.assertRaises(ValueError):
+            UserCache(BehaviorStore(), max_users=0)
+
+
+class TestDecay(unittest.TestCase):
+    def test_rolling_stats_keep_mean_and_variance(self):
+        stats = RollingStats()
+        for value in (1.0, 2.0, 6.0):
+            stats.push(value)
+        mean, variance = stats.mean, stats.variance
+        stats.decay(0.25)
+        self.assertEqual((stats.count, stats.mean), (0.75, mean))
+        self.assertAlmostEqual(stats.variance, variance)
+
+    def test_user_counters(self):
+        behavior = UserBehavior("u", created_at=0.0)
+        for t in range(10):
+            behavior.record(float(t), 10)
+        behavior.unique_messages = 4
+        behavior.decay(0.5)
+        self.assertEqual((behavior.message_count, behavior.unique_messages), (5, 2))
+        self.assertEqual(len(behavior.timestamps), 10)  # history windows are not counters
+
+
+class TestEngineResidency(unittest.TestCase):
+    """Eviction is invisible to scores when a persistent store is attached"""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def store(self, name: str) -> SQLiteBehaviorStore:
+        return SQLiteBehaviorStore(os.path.join(self.tmp.name, name))
+
+    def messages(self, n: int = 400):
+        rng = random.Random(3)
+        timestamp = 0.0
+        messages = []
+        for _ in range(n):
+            timestamp += rng.choice([0.5, 5.0, 3000.0])
+            text = rng.choice(["hello there friend", "SUBSCRIBE NOW link in bio check out my profile", "nice one 😀"])
+            messages.append((f"u{rng.randrange(30)}", text, timestamp))
+        return messages
+
+    def test_small_budget_matches_unbounded(self):
+        messages = self.messages()
+        unbounded = BotDetectionEngine(train=False, behavior_store=self.store("a"), max_users=10_000,
+                                       idle_ttl=7200.0, half_life=3600.0)
+        bounded = BotDetectionEngine(train=False, behavior_store=self.store("b"), max_users=5,
+                                     idle_ttl=7200.0, half_life=3600.0)
+        expected = [unbounded.analyze_user(*message) for message in messages]
+        actual = bounded.analyze_batch(messages[:200])
+        actual += [bounded.analyze_user(*message) for message in messages[200:]]
+        self.assertEqual(actual, expected)
+        self.assertLessEqual(len(bounded.user_behaviors), 5)
+        self.assertGreater(bounded.user_behaviors.evicted, 100)
+        unbounded.close()
+        bounded.close()
+
+    def test_idle_user_decays(self):
+        engine = BotDetectionEngine(train=False, idle_ttl=3600.0, half_life=3600.0)
+        for t in range(8):
+            engine.analyze_user("u1", "same old message", float(t))
+        engine.analyze_user("u1", "same old message", 3600.0)  # idle 3593 s, within the TTL: no decay
+        self.assertEqual(engine.user_behaviors["u1"].message_count, 9)
+
+        engine.analyze_user("u1", "back again", 3 * 3600.0)  # idle for two half-lives
+        self.assertEqual(engine.user_behaviors["u1"].message_count, round(9 / 4) + 1)
+        engine.close()
+
+    def test_without_store_evicted_users_start_over(self):
+        engine = BotDetectionEngine(train=False, max_users=1)
+        engine.analyze_user("u1", "hello", 1.0)
+        engine.analyze_user("u2", "hello", 2.0)
+        engine.analyze_user("u1", "hello", 3.0)
+        self.assertEqual(engine.user_behaviors["u1"].message_count, 1)
+        engine.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,62 @@
+"""
+Tests for the cross-user campaign index
+"""
+
+import unittest
+
+from antibot.detection.campaign import CampaignIndex
+from antibot.detection.similarity import sketch
+
+TEMPLATE = "Hey babe, check out my profile for something special 😍💦 link in bio!"
+
+
+class TestCampaignIndex(unittest.TestCase):
+    """Distinct authors of near-identical messages inside the window"""
+
+    def test_counts_distinct_authors(self):
+        index = CampaignIndex(window=60, min_authors=3)
+        self.assertEqual(index.observe("a", *sketch(TEMPLATE), 0.0), 1)
+        self.assertEqual(index.observe("a", *sketch(TEMPLATE), 1.0), 1)
+        self.assertEqual(index.observe("b", *sketch(TEMPLATE.replace("😍", "🔥")), 2.0), 2)
+        size = index.observe("c", *sketch(TEMPLATE + " 💦"), 3.0)
+        self.assertEqual(size, 3)
+        self.assertTrue(index.is_campaign(size))
+
+    def test_unrelated_messages_do_not_cluster(self):
+        index = CampaignIndex(window=60)
+        texts = [
+            "What time does the game start tonight?",
+            "I think the referee made the wrong call in the second half honestly",
+            "Does anyone know a good recipe for sourdough bread?",
+        ]
+        for i, text in enumerate(texts):
+            self.assertEqual(index.observe(f"user{i}", *sketch(text), float(i)), 1)
+
+    def test_entries_expire_after_window(self):
+        index = CampaignIndex(window=10)
+        fingerprint, signature = sketch(TEMPLATE)
+        index.observe("a", fingerprint, signature, 0.0)
+        index.observe("b", fingerprint, signature, 5.0)
+        self.assertEqual(index.observe("c", fingerprint, signature, 20.0), 1)
+        self.assertEqual(len(index), 1)
+
+    def test_memory_is_bounded(self):
+        index = CampaignIndex(window=1e9, max_entries=100, max_bucket=8)
+        for i in range(1000):
+            index.observe(f"user{i}", *sketch(f"message {i} about topic {i * 7}"), float(i))
+        self.assertEqual(len(index), 100)
+        self.assertLessEqual(index.bucket_count, 100 * index.bands)
+
+    def test_cluster_size_is_capped(self):
+        index = CampaignIndex(window=60, max_authors=5)
+        fingerprint, signature = sketch(TEMPLATE)
+        sizes = [index.observe(f"user{i}", fingerprint, signature, float(i)) for i in range(20)]
+        self.assertEqual(max(sizes), 5)
+
+    def test_invalid_bands(self):
+        with self.assertRaises(ValueError):
+            CampaignIndex(bands=5)
+
+
+if __name__ == "__main__":
+    unittest.main()
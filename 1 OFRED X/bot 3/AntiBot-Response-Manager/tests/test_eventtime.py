@@ -0,0 +1,83 @@
+"""
+Tests for event-time scoring: injectable clock and the reorder buffer
+"""
+
+import random
+import unittest
+
+from antibot.detection import BotDetectionEngine, ManualClock, ReorderBuffer
+from antibot.detection.eventtime import in_event_time
+from tests.workload import WorkloadConfig, generate
+
+
+def message(timestamp: float, user_id: str = "u"):
+    return (user_id, f"message at {timestamp}", float(timestamp))
+
+
+class TestReorderBuffer(unittest.TestCase):
+    def test_releases_in_event_time_behind_the_watermark(self):
+        buffer = ReorderBuffer(max_delay=10.0)
+        self.assertEqual(buffer.push(message(5)), [])
+        self.assertEqual(buffer.push(message(3)), [])
+        self.assertEqual(buffer.push(message(14)), [message(3)])  # watermark 4
+        self.assertEqual(buffer.watermark, 4.0)
+        self.assertEqual(buffer.push(message(30)), [message(5), message(14)])
+        self.assertEqual(buffer.push(message(12)), [message(12)])  # behind 14: late, passed through
+        self.assertEqual(buffer.late, 1)
+        self.assertEqual(buffer.flush(), [message(30)])
+        self.assertEqual(len(buffer), 0)
+
+    def test_size_bound_forces_early_release(self):
+        buffer = ReorderBuffer(max_delay=1000.0, max_size=3)
+        released = []
+        for timestamp in (4, 2, 3, 1, 5):
+            released += buffer.push(message(timestamp))
+        self.assertEqual(released, [message(1), message(2)])
+        self.assertEqual((buffer.forced, len(buffer)), (2, 3))
+        with self.assertRaises(ValueError):
+            ReorderBuffer(max_size=0)
+
+    def test_bounded_disorder_is_fully_repaired(self):
+        rng = random.Random(0)
+        ordered = [message(t, f"u{t % 7}") for t in range(500)]
+        jittered = sorted(ordered, key=lambda m: m[2] + rng.uniform(0, 20))
+        batches = list(in_event_time(jittered, ReorderBuffer(max_delay=20.0), batch_size=64))
+        self.assertEqual([m for batch in batches for m in batch], ordered)
+        self.assertTrue(all(len(batch) <= 64 for batch in batches))
+
+
+class TestEngineEventTime(unittest.TestCase):
+    def test_backlog_uses_message_time(self):
+        # A day of one message an hour, scored in one go long after it was sent
+        clock = ManualClock(10 * 86400.0)
+        engine = BotDetectionEngine(train=False, clock=clock)
+        backlog = [("patient", f"update number {i} on the garden", i * 3600.0) for i in range(24)]
+        self.assertNotIn("rapid_fire", engine.detect_batch(backlog)[-1].contributions)
+        self.assertEqual(engine.user_behaviors["patient"].created_at, 0.0)
+
+        # Without timestamps every message lands at the clock's "now"
+        for text in ("a", "b", "c", "d", "e"):
+            result = engine.detect("stamped", f"hello {text}")
+        self.assertEqual(result.timestamp, clock())
+        self.assertIn("rapid_fire", result.contributions)
+        clock.advance(60.0)
+        self.assertEqual(engine.detect("stamped", "later").timestamp, 10 * 86400.0 + 60.0)
+        engine.close()
+
+    def test_stream_matches_sorted_batch(self):
+        ordered = generate(WorkloadConfig(humans=15, bots=3, duration=900.0))
+        rng = random.Random(1)
+        arrival = sorted(ordered, key=lambda m: m[2] + rng.uniform(0, 5.0))
+        self.assertNotEqual(arrival, ordered)
+
+        streamed = BotDetectionEngine(train=False)
+        batched = BotDetectionEngine(train=False)
+        actual = list(streamed.detect_stream(iter(arrival), max_delay=5.0, batch_size=50))
+        expected = batched.detect_batch(ordered)
+        streamed.close()
+        batched.close()
+        self.assertEqual([r.to_dict() for r in actual], [r.to_dict() for r in expected])
+
+
+if __name__ == "__main__":
+    unittest.main()
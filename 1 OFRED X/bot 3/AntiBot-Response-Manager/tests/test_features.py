@@ -0,0 +1,57 @@
+"""
+Tests for the shared per-message text features
+"""
+
+import random
+import re
+import unittest
+
+from antibot.detection.features import TextFeatures
+
+
+class TestTextFeatures(unittest.TestCase):
+    """Counts must equal the per-check formulas they replace"""
+
+    SAMPLES = [
+        "",
+        "hello",
+        "CHECK OUT MY PROFILE!!! http://a.example https://b.example/x?y=1",
+        "😀😀 🌀🗿 🚀🛿 emoji, mixed; with: punct - ok?",
+        "Ünïcödé ÀÉÎ text ß",
+        "same same SAME words Words",
+    ]
+
+    def assert_matches_original(self, text):
+        tf = TextFeatures(text)
+        self.assertEqual(tf.length, len(text))
+        self.assertEqual(tf.word_count, len(text.split()))
+        self.assertEqual(tf.unique_words, len(set(text.lower().split())))
+        self.assertEqual(tf.caps, sum(1 for c in text if c.isupper()))
+        self.assertEqual(tf.punct, sum(1 for c in text if c in '!?.,-;:'))
+        self.assertEqual(tf.emoji, len(re.findall(r'[😀-🙏🌀-🗿]', text)))
+        self.assertEqual(tf.emoji + tf.transport_emoji,
+                         len(re.findall(r'[😀-🙏🌀-🗿🚀-🛿]', text)))
+        self.assertEqual(tf.urls, len(re.findall(r'http[s]?://\S+', text)))
+        self.assertEqual(tf.caps_ratio, sum(1 for c in text if c.isupper()) / max(len(text), 1))
+        self.assertEqual(tf.emoji_ratio, len(re.findall(r'[😀-🙏🌀-🗿]', text)) / max(len(text), 1))
+
+    def test_samples(self):
+        for text in self.SAMPLES:
+            with self.subTest(text=text):
+                self.assert_matches_original(text)
+
+    def test_random_text(self):
+        rng = random.Random(7)
+        alphabet = "aAzZ !?.,-;:\t\n😀🙏🌀🗿🚀🛿http://sÉß"
+        for _ in range(200):
+            text = "".join(rng.choice(alphabet) for _ in range(rng.randrange(60)))
+            self.assert_matches_original(text)
+
+    def test_empty_text_ratios(self):
+        tf = TextFeatures("")
+        self.assertEqual(tf.caps_ratio, 0.0)
+        self.assertEqual(tf.emoji_ratio, 0.0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,151 @@
+"""
+Tests for the streaming inbox ingester
+"""
+
+import asyncio
+import json
+import tempfile
+import threading
+import time
+import unittest
+from pathlib import Path
+
+from antibot.detection import BotDetectionEngine
+from antibot.ingest import FakeInboxSource, InboxIngester, ScoredMessageStore
+
+
+def inbox(n: int, start: int = 0):
+    return [
+        {'id': f"m{i}", 'author': f"u{i % 5}", 'subject': "hi",
+         'body': f"hello there number {i}", 'created': 1000.0 + i}
+        for i in range(start, start + n)
+    ]
+
+
+class SlowEngine:
+    """Stand-in engine with a fixed scoring cost per batch"""
+
+    def __init__(self, delay: float):
+        self.delay = delay
+        self.batches = []
+        self.ingester = None
+        self.fetched_at_end = []
+
+    def analyze_batch(self, messages):
+        self.batches.append(len(messages))
+        time.sleep(self.delay)
+        if self.ingester is not None:
+            self.fetched_at_end.append(self.ingester.fetched)
+        return [(0.1, "ok") for _ in messages]
+
+    def is_likely_bot(self, score):
+        return score >= 0.6
+
+
+class TestInboxIngester(unittest.TestCase):
+    """Dedupe, micro-batching, store writes and the background thread"""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.store = ScoredMessageStore(str(Path(self.tmp.name) / "inbox.sqlite3"))
+        self.engine = BotDetectionEngine(train=False)
+
+    def tearDown(self):
+        self.engine.close()
+        self.store.close()
+        self.tmp.cleanup()
+
+    def test_scores_and_stores(self):
+        messages = inbox(20)
+        expected = BotDetectionEngine(train=False).analyze_batch(
+            [(m['author'], m['body'], m['created']) for m in messages]
+        )
+        ingester = InboxIngester(self.engine, FakeInboxSource(messages), self.store, batch_size=8)
+        asyncio.run(ingester.run())
+
+        self.assertEqual(ingester.scored, 20)
+        self.assertEqual(len(self.store), 20)
+        stored = {row['id']: row for row in self.store.recent(100)}
+        for message, (score, reason) in zip(messages, expected):
+            self.assertAlmostEqual(stored[message['id']]['score'], score)
+            self.assertEqual(stored[message['id']]['reason'], reason)
+
+    def test_dedupes_within_and_across_runs(self):
+        messages = inbox(10)
+        first = InboxIngester(self.engine, FakeInboxSource(messages + messages[:4]), self.store)
+        asyncio.run(first.run())
+        self.assertEqual((first.fetched, first.duplicates, first.scored), (14, 4, 10))
+
+        second = InboxIngester(self.engine, FakeInboxSource(messages + inbox(3, start=10)), self.store)
+        asyncio.run(second.run())
+        self.assertEqual((second.duplicates, second.scored), (10, 3))
+        self.assertEqual(len(self.store), 13)
+
+    def test_micro_batches_and_backpressure(self):
+        source = FakeInboxSource(inbox(40), delay=0.001)
+        engine = SlowEngine(delay=0.05)
+        ingester = InboxIngester(engine, source, batch_size=10, max_latency=1.0, queue_size=5)
+        engine.ingester = ingester
+        asyncio.run(ingester.run())
+
+        self.assertEqual(sum(engine.batches), 40)
+        self.assertEqual(max(engine.batches), 10)
+        # While a batch is scored the fetcher stops once the queue is full:
+        # at most batch + queue + the one message waiting in put()
+        scored = 0
+        for size, fetched in zip(engine.batches, engine.fetched_at_end):
+            scored += size
+            self.assertLessEqual(fetched, scored + 5 + 1)
+
+    def test_fetch_overlaps_scoring(self):
+        delay = 0.02
+        source = FakeInboxSource(inbox(20), delay=delay)
+        engine = SlowEngine(delay=delay * 5)
+        ingester = InboxIngester(engine, source, batch_size=5, max_latency=10.0)
+        started = time.perf_counter()
+        asyncio.run(ingester.run())
+        elapsed = time.perf_counter() - started
+
+        serial = 20 * delay + len(engine.batches) * delay * 5
+        self.assertLess(elapsed, serial * 0.85)
+
+    def test_background_thread(self):
+        ingester = InboxIngester(self.engine, FakeInboxSource(inbox(12), delay=0.001), self.store)
+        thread = ingester.start_background()
+        self.assertIsInstance(thread, threading.Thread)
+        self.assertTrue(ingester.done.wait(10))
+        self.assertIsNone(ingester.error)
+        results = [ingester.results.get_nowait() for _ in range(ingester.results.qsize())]
+        self.assertEqual(len(results), 12)
+        self.assertTrue(all(isinstance(r['is_bot'], bool) for r in results))
+
+    def test_stop(self):
+        ingester = InboxIngester(self.engine, FakeInboxSource(inbox(1000), delay=0.01), batch_size=4)
+        ingester.start_background()
+        time.sleep(0.1)
+        ingester.stop()
+        self.assertTrue(ingester.done.wait(5))
+        self.assertLess(ingester.scored, 1000)
+
+    def test_stop_with_full_queue(self):
+        # Scoring far behind fetching: the fetcher is parked on a full queue
+        engine = SlowEngine(delay=0.3)
+        ingester = InboxIngester(engine, FakeInboxSource(inbox(1000)), batch_size=4, queue_size=8)
+        thread = ingester.start_background()
+        time.sleep(0.5)
+        ingester.stop()
+        self.assertTrue(ingester.done.wait(5))
+        thread.join(5)
+        self.assertFalse(thread.is_alive())
+        self.assertIsNone(ingester.error)
+        self.assertLess(ingester.scored, 1000)
+
+    def test_fake_inbox_from_file(self):
+        path = Path(self.tmp.name) / "inbox.json"
+        path.write_text(json.dumps(inbox(3)), encoding="utf-8")
+        source = FakeInboxSource.from_file(str(path))
+        self.assertEqual([m['id'] for m in source.messages], ["m0", "m1", "m2"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,111 @@
+"""
+Tests for per-stage instrumentation and the metrics exposition formats
+"""
+
+import json
+import re
+import tempfile
+import unittest
+from pathlib import Path
+
+import numpy as np
+
+from antibot.detection import BotDetectionEngine
+from antibot.detection.instrumentation import Histogram, dump_json, prometheus_text
+
+SAMPLE_LINE = re.compile(r'^[a-z_]+(\{[a-z_]+="[^"]*"(,[a-z_]+="[^"]*")*\})? \S+$')
+
+
+class BrokenModel:
+    version = 1
+
+    def anomaly_scores(self, features):
+        raise ValueError("feature schema mismatch")
+
+
+class TestInstrumentation(unittest.TestCase):
+    """Stage timers, error counters and batch sizes on a real engine"""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.engine = BotDetectionEngine(train=False)
+
+    def tearDown(self):
+        self.engine.close()
+        self.tmp.cleanup()
+
+    def fit_model(self):
+        rng = np.random.default_rng(0)
+        for row in rng.normal(size=(60, len(self.engine.FEATURE_NAMES))):
+            self.engine.trainer.observe(row)
+        self.assertIsNotNone(self.engine.trainer.refit())
+
+    def test_disabled_records_nothing(self):
+        self.engine.instrumentation.enabled = False
+        self.engine.analyze_user("u1", "hello there", 1.0)
+        self.engine.analyze_batch([("u2", "hi", 2.0)])
+        self.assertEqual(self.engine.instrumentation.stages, {})
+        self.assertEqual(self.engine.instrumentation.batch_sizes.count, 0)
+
+    def test_stage_timers_and_batch_sizes(self):
+        self.fit_model()
+        self.engine.instrumentation.enabled = True
+        for t in range(3):
+            self.engine.analyze_user("u1", f"hello there {t}", float(t))
+        self.engine.analyze_batch([(f"u{i}", "hi", 10.0 + i) for i in range(7)])
+
+        stages = self.engine.instrumentation.stages
+        # Tracking is timed per message, every layer and the scoring step per call
+        for stage in ("track", "text_features", "ml_features"):
+            self.assertEqual(stages[stage].count, 3 + 7, stage)
+            self.assertGreater(stages[stage].sum, 0.0)
+        for stage in [layer.name for layer in self.engine.layers] + ["scoring"]:
+            self.assertEqual(stages[stage].count, 3 + 1, stage)
+        sizes = self.engine.instrumentation.batch_sizes
+        self.assertEqual((sizes.count, sizes.sum), (4, 3 + 7))
+
+    def test_ml_errors_are_counted(self):
+        self.engine.trainer.model = BrokenModel()
+        score, _ = self.engine.analyze_user("u1", "hello there", 1.0)
+        self.engine.analyze_batch([("u2", "hi", 2.0)])
+        self.assertIsInstance(score, float)
+        self.assertEqual(self.engine.instrumentation.errors["ml_anomaly"], 2)
+
+    def test_prometheus_text(self):
+        self.engine.instrumentation.enabled = True
+        for t in range(6):
+            self.engine.analyze_user("spammer", "CHECK OUT MY PROFILE link in bio subscribe now", float(t))
+        text = prometheus_text(self.engine.metrics, self.engine.instrumentation)
+
+        samples = [line for line in text.splitlines() if not line.startswith("#")]
+        for line in samples:
+            self.assertRegex(line, SAMPLE_LINE)
+        self.assertIn("antibot_messages_total 6", samples)
+        self.assertIn('antibot_layer_hits_total{layer="generic_responses"} 6', samples)
+        self.assertIn('antibot_errors_total{layer="ml_anomaly"} 0', samples)
+        self.assertIn('antibot_bot_score_bucket{le="+Inf"} 6', samples)
+        self.assertIn('antibot_stage_seconds_count{stage="track"} 6', samples)
+
+        buckets = [int(line.rsplit(" ", 1)[1]) for line in samples if line.startswith("antibot_bot_score_bucket")]
+        self.assertEqual(buckets, sorted(buckets))
+
+    def test_json_dump(self):
+        self.engine.analyze_user("u1", "hello there", 1.0)
+        path = Path(self.tmp.name) / "out" / "metrics.json"
+        dump_json(str(path), self.engine.metrics, self.engine.instrumentation)
+        data = json.loads(path.read_text(encoding="utf-8"))
+        self.assertEqual(data['detection']['messages'], 1)
+        self.assertIn('errors', data['instrumentation'])
+
+
+class TestHistogram(unittest.TestCase):
+    def test_cumulative_buckets(self):
+        histogram = Histogram((1, 5, 10))
+        for value in (0.5, 1, 3, 7, 50):
+            histogram.observe(value)
+        self.assertEqual(list(histogram.cumulative()), [(1, 2), (5, 3), (10, 4), (float("inf"), 5)])
+        self.assertEqual(histogram.to_dict()['buckets']['+Inf'], 5)
+
+
+if __name__ == "__main__":
+    unittest.main()
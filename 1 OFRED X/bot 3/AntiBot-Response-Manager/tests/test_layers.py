@@ -0,0 +1,155 @@
+"""
+Tests for the detection layer registry and early-exit evaluation
+"""
+
+import io
+import unittest
+
+import numpy as np
+
+from antibot import replay
+from antibot.detection import BotDetectionEngine, DetectionResult, format_report, read_records, write_records
+from antibot.detection.instrumentation import prometheus_text
+from antibot.detection.layers import Layer, LayerRegistry, default_layers
+from antibot.detection.metrics import LAYERS
+from antibot.detection.result import REASONS
+from tests.workload import WorkloadConfig, generate
+
+
+def _shouting_name(batch, rows):
+    hits = np.array([batch.user_ids[i].isupper() for i in rows], dtype=bool)
+    return hits, np.where(hits, 0.3, 0.0)
+
+
+SHOUTING = Layer("shouting_name", _shouting_name, lambda rules: 0.3, cost=0.5, reason="📢 All-caps username")
+
+
+class TestRegistry(unittest.TestCase):
+    def test_default_order(self):
+        per_user, cross_user = default_layers().stages()
+        self.assertEqual([layer.name for layer in per_user + cross_user], list(LAYERS))
+        self.assertEqual([layer.name for layer in cross_user], ["coordinated_campaign"])
+
+    def test_register_by_cost(self):
+        registry = default_layers()
+        registry.register(SHOUTING)
+        names = [layer.name for layer in registry]
+        self.assertEqual(names.index("shouting_name"), names.index("suspicious_timing") + 1)
+        self.assertEqual(registry.names(), tuple(names))
+        self.assertEqual(registry.reasons["shouting_name"], "📢 All-caps username")
+
+        with self.assertRaises(ValueError):
+            registry.register(SHOUTING)
+        registry.register(Layer("rapid_fire", _shouting_name, lambda rules: 0.3, cost=0.0), replace=True)
+        self.assertEqual([layer.name for layer in registry], names)
+        self.assertEqual(registry.reasons["rapid_fire"], REASONS["rapid_fire"])
+        self.assertIs(registry.unregister("shouting_name"), SHOUTING)
+        self.assertNotIn("shouting_name", registry)
+        self.assertNotIn("shouting_name", registry.reasons)
+        with self.assertRaises(ValueError):
+            LayerRegistry([Layer("nameless", _shouting_name, lambda rules: 0.1)])
+
+    def test_reasons_stay_with_their_registry(self):
+        first, second = default_layers(), default_layers()
+        first.register(SHOUTING)
+        first.register(Layer("shouting_name", _shouting_name, lambda rules: 0.3, cost=0.5,
+                             reason="📢 Loud username"), replace=True)
+        self.assertEqual(first.reasons["shouting_name"], "📢 Loud username")
+        self.assertNotIn("shouting_name", second.reasons)
+        self.assertNotIn("shouting_name", REASONS)
+
+
+class TestEngineLayers(unittest.TestCase):
+    def setUp(self):
+        self.messages = generate(WorkloadConfig(humans=30, bots=5, duration=1800.0))
+
+    def engine(self, **options) -> BotDetectionEngine:
+        engine = BotDetectionEngine(train=False, **options)
+        rng = np.random.default_rng(0)
+        for row in rng.normal(size=(60, len(engine.FEATURE_NAMES))):
+            engine.trainer.observe(row)
+        engine.trainer.refit()
+        engine.instrumentation.enabled = True
+        return engine
+
+    def test_plugin_layer(self):
+        engine = self.engine()
+        engine.layers.register(SHOUTING)
+        result = engine.detect("LOUD", "hello there", 1.0)
+        self.assertEqual(list(result.contributions), ["shouting_name"])
+        self.assertEqual(result.reason, "📢 All-caps username")
+        self.assertEqual(engine.metrics.layer_hits["shouting_name"], 1)
+        self.assertEqual(engine.detect("quiet", "hello there", 2.0).contributions, {})
+        buffer = io.BytesIO()
+        write_records(buffer, [result])
+        buffer.seek(0)
+        self.assertEqual(list(read_records(buffer)), [result])
+
+        # Reports cover the plugin layer alongside the built-ins
+        self.assertIn("Shouting Name", format_report(engine.metrics.snapshot()))
+        self.assertIn('antibot_layer_hits_total{layer="shouting_name"} 1',
+                      prometheus_text(engine.metrics, engine.instrumentation))
+        report = replay.evaluate([result, engine.detect("LOUDER", "hi", 3.0)], [True, False],
+                                 layers=engine.layers.names())
+        self.assertEqual(report['layers']['shouting_name'], {'bots': 1, 'humans': 1})
+        self.assertEqual(set(report['layers']), set(engine.layers.names()))
+        engine.close()
+
+        # Another engine neither reports nor explains with it
+        other = self.engine()
+        self.assertNotIn("shouting_name", other.metrics.layer_hits)
+        self.assertEqual(DetectionResult("LOUD", 1.0, contributions={"shouting_name": 0.3}).reason, "shouting_name")
+        other.close()
+
+    def test_early_exit_keeps_every_verdict(self):
+        full, early = self.engine(), self.engine(early_exit=True)
+        expected = full.detect_batch(self.messages)
+        actual = early.detect_batch(self.messages)
+
+        self.assertEqual([r.is_bot() for r in actual], [r.is_bot() for r in expected])
+        for fast, complete in zip(actual, expected):
+            self.assertLessEqual(fast.score, complete.score)
+            if not fast.skipped:
+                self.assertEqual(fast.to_dict(), complete.to_dict())
+            for layer, amount in fast.contributions.items():
+                self.assertEqual(complete.contributions[layer], amount)
+                self.assertNotIn(layer, fast.skipped)
+        decided = sum(1 for result in actual if result.skipped)
+        self.assertGreater(decided, len(actual) // 2)
+        # Most messages never reach the model
+        self.assertLess(early.instrumentation.batch_sizes.sum, full.instrumentation.batch_sizes.sum / 2)
+        full.close()
+        early.close()
+
+    def test_single_and_batch_agree_with_early_exit(self):
+        single, batch = self.engine(early_exit=True), self.engine(early_exit=True)
+        expected = [single.detect(*message) for message in self.messages[:300]]
+        actual = batch.detect_batch(self.messages[:300])
+        self.assertEqual([r.to_dict() for r in actual], [r.to_dict() for r in expected])
+        single.close()
+        batch.close()
+
+    def test_skipped_layers_keep_their_state(self):
+        # Early exit must still index every message for later campaign lookups
+        half = len(self.messages) // 2
+        full, early = self.engine(), self.engine(early_exit=True)
+        full.detect_batch(self.messages[:half])
+        early.detect_batch(self.messages[:half])
+        self.assertEqual(len(early.campaign_index), len(full.campaign_index))
+
+        expected = full.detect_batch(self.messages[half:])
+        actual = early.detect_batch(self.messages[half:], explain=True)
+        self.assertEqual([r.to_dict() for r in actual], [r.to_dict() for r in expected])
+        self.assertTrue(any("coordinated_campaign" in r.contributions for r in actual))
+        full.close()
+        early.close()
+
+    def test_skipped_round_trip(self):
+        result = DetectionResult("u", 1.0, score=0.7, contributions={"rapid_fire": 0.25, "generic_responses": 0.45},
+                                 skipped=("ml_anomaly", "coordinated_campaign"))
+        self.assertEqual(DetectionResult.from_bytes(result.to_bytes()), result)
+        self.assertEqual(DetectionResult.from_dict(result.to_dict()), result)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,124 @@
+"""
+Tests for the buffered Logger backend
+"""
+
+import json
+import tempfile
+import time
+import unittest
+from pathlib import Path
+
+from antibot.detection import BotDetectionEngine
+from antibot.logger import Logger, LogWriter
+
+
+class Unformattable:
+    def __str__(self):
+        raise AssertionError("disabled level must not format its arguments")
+
+
+class UnusedReasons(dict):
+    def get(self, key, default=None):
+        raise AssertionError("reason text built for a disabled log line")
+
+
+class TestLogWriter(unittest.TestCase):
+    """Writer thread, rotation and output formats"""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.directory = Path(self.tmp.name)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def make_writer(self, **kwargs) -> LogWriter:
+        writer = LogWriter(str(self.directory), console=False, **kwargs)
+        self.addCleanup(writer.close)
+        return writer
+
+    def test_text_lines_in_daily_file(self):
+        writer = self.make_writer()
+        logger = Logger("Test", level="DEBUG", writer=writer)
+        logger.info("hello %s", "world")
+        logger.error("broken: %d", 3)
+        writer.flush()
+
+        self.assertEqual(writer.path.name, f"antibot_{time.strftime('%Y%m%d')}.log")
+        lines = writer.path.read_text(encoding="utf-8").splitlines()
+        self.assertEqual(len(lines), 2)
+        self.assertTrue(lines[0].endswith("[INFO] [Test] hello world"))
+        self.assertTrue(lines[1].endswith("[ERROR] [Test] broken: 3"))
+
+    def test_json_lines(self):
+        writer = self.make_writer(json_lines=True)
+        Logger("Test", level="DEBUG", writer=writer).warning("emoji 🤖 ok")
+        writer.flush()
+
+        self.assertEqual(writer.path.suffix, ".jsonl")
+        record = json.loads(writer.path.read_text(encoding="utf-8"))
+        self.assertEqual(record['level'], "WARNING")
+        self.assertEqual(record['logger'], "Test")
+        self.assertEqual(record['message'], "emoji 🤖 ok")
+
+    def test_size_rotation(self):
+        writer = self.make_writer(max_bytes=400, backup_count=2)
+        logger = Logger("Test", level="DEBUG", writer=writer)
+        for i in range(40):
+            logger.info("message %03d %s", i, "x" * 40)
+        writer.flush()
+
+        files = sorted(p.name for p in self.directory.iterdir())
+        base = writer.path.name
+        self.assertEqual(files, sorted([base, base + ".1", base + ".2"]))
+        self.assertLessEqual(writer.path.stat().st_size, 400)
+        self.assertIn("message 039", writer.path.read_text(encoding="utf-8"))
+
+    def test_close_drains_queue(self):
+        writer = self.make_writer()
+        logger = Logger("Test", level="DEBUG", writer=writer)
+        for i in range(1000):
+            logger.debug("line %d", i)
+        path_day = time.strftime('%Y%m%d')
+        writer.close()
+        text = (self.directory / f"antibot_{path_day}.log").read_text(encoding="utf-8")
+        self.assertEqual(len(text.splitlines()), 1000)
+
+
+class TestLoggerLevels(unittest.TestCase):
+    """Level filtering happens before formatting"""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.writer = LogWriter(self.tmp.name, console=False)
+
+    def tearDown(self):
+        self.writer.close()
+        self.tmp.cleanup()
+
+    def test_disabled_level_short_circuits(self):
+        logger = Logger("Test", level="WARNING", writer=self.writer)
+        logger.debug("value: %s", Unformattable())
+        logger.info("value: %s", Unformattable())
+        self.assertFalse(logger.is_enabled("INFO"))
+        self.assertTrue(logger.is_enabled("ERROR"))
+        self.assertIsNone(self.writer.path)
+
+    def test_message_without_args_is_not_formatted(self):
+        logger = Logger("Test", level="DEBUG", writer=self.writer)
+        logger.info("100% literal")
+        self.writer.flush()
+        self.assertIn("100% literal", self.writer.path.read_text(encoding="utf-8"))
+
+    def test_engine_skips_reason_text_when_info_is_off(self):
+        engine = BotDetectionEngine(train=False)
+        engine.logger = Logger("BotDetector", level="WARNING", writer=self.writer)
+        engine.layers.reasons = UnusedReasons()
+        engine.detect("spammer", "CHECK OUT MY PROFILE link in bio subscribe now", 1.0)
+        engine.detect_batch([("spammer", "http://a.io http://b.io http://c.io http://d.io", 2.0)] * 3)
+        engine.close()
+        self.assertIsNone(self.writer.path)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,53 @@
+"""
+Tests for the Aho-Corasick keyword matcher
+"""
+
+import random
+import unittest
+
+from antibot.detection.matching import KeywordMatcher
+
+
+def naive_count(keywords, text):
+    return sum(1 for kw in keywords if kw in text.lower())
+
+
+class TestKeywordMatcher(unittest.TestCase):
+    """Single-pass matching must equal the per-keyword substring scan"""
+
+    def test_overlapping_keywords(self):
+        keywords = ['hello', 'hi', 'hey', 'thanks', 'thank you', 'ok', 'okay', 'yes', 'no']
+        matcher = KeywordMatcher(keywords)
+        for text in ["Okay thank you, this is NOT ok", "hey", "", "shi", "yesno", "Thanks!"]:
+            self.assertEqual(matcher.count(text), naive_count(keywords, text), text)
+
+    def test_phrases_and_emoji(self):
+        keywords = ["check out my profile", "link in bio", "🔥🔥🔥", "dm me"]
+        matcher = KeywordMatcher(keywords)
+        text = "CHECK OUT MY PROFILE 🔥🔥🔥🔥 link in bio, dm me"
+        self.assertEqual(matcher.find(text), {0, 1, 2, 3})
+
+    def test_duplicates_and_empty_keyword(self):
+        keywords = ["abc", "abc", ""]
+        matcher = KeywordMatcher(keywords)
+        self.assertEqual(matcher.count("xxabcxx"), naive_count(keywords, "xxabcxx"))
+        self.assertEqual(matcher.count("zzz"), naive_count(keywords, "zzz"))
+
+    def test_limit_stops_early(self):
+        matcher = KeywordMatcher(["a", "b", "c", "d"])
+        self.assertEqual(matcher.count("abcd", limit=3), 3)
+        self.assertEqual(matcher.count("abcd"), 4)
+
+    def test_matches_naive_on_random_input(self):
+        rng = random.Random(5)
+        alphabet = "abcab "
+        for _ in range(200):
+            keywords = ["".join(rng.choice(alphabet) for _ in range(rng.randint(1, 4))) for _ in range(8)]
+            matcher = KeywordMatcher(keywords)
+            for _ in range(10):
+                text = "".join(rng.choice(alphabet + "AB") for _ in range(rng.randint(0, 30)))
+                self.assertEqual(matcher.count(text), naive_count(keywords, text), (keywords, text))
+
+
+if __name__ == "__main__":
+    unittest.main()
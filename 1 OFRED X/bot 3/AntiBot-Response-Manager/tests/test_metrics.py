@@ -0,0 +1,100 @@
+"""
+Tests for the detection metrics registry
+"""
+
+import unittest
+
+from antibot.detection import BotDetectionEngine, DetectionMetrics, format_report
+from antibot.detection.metrics import LAYERS, RateMeter, ScoreHistogram
+
+
+class FakeClock:
+    def __init__(self, now: float = 1000.0):
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class TestScoreHistogram(unittest.TestCase):
+    """Bins, mean and quantiles"""
+
+    def test_bins_and_edges(self):
+        histogram = ScoreHistogram(bins=10)
+        for score in (0.0, 0.05, 0.55, 0.99, 1.0):
+            histogram.add(score)
+        self.assertEqual(histogram.counts, [2, 0, 0, 0, 0, 1, 0, 0, 0, 2])
+        self.assertAlmostEqual(histogram.mean, (0.05 + 0.55 + 0.99 + 1.0) / 5)
+
+    def test_quantiles_within_one_bin(self):
+        histogram = ScoreHistogram(bins=20)
+        scores = [i / 1000 for i in range(1000)]
+        for score in scores:
+            histogram.add(score)
+        for q in (0.1, 0.5, 0.9, 0.99):
+            self.assertAlmostEqual(histogram.quantile(q), q, delta=1 / 20)
+        self.assertEqual(ScoreHistogram().quantile(0.5), 0.0)
+
+
+class TestRateMeter(unittest.TestCase):
+    """Sliding window of one-second buckets"""
+
+    def test_rate_over_window(self):
+        clock = FakeClock()
+        meter = RateMeter(window=10, clock=clock)
+        for _ in range(10):
+            meter.mark(5)
+            clock.now += 1
+        clock.now -= 1
+        self.assertAlmostEqual(meter.rate(), 5.0)
+
+        clock.now += 5  # the five oldest seconds expire
+        self.assertAlmostEqual(meter.rate(), 25 / 10)
+        clock.now += 60
+        self.assertEqual(meter.rate(), 0.0)
+
+    def test_young_meter_uses_elapsed_time(self):
+        clock = FakeClock()
+        meter = RateMeter(window=60, clock=clock)
+        meter.mark(30)
+        clock.now += 1
+        self.assertAlmostEqual(meter.rate(), 15.0)
+
+
+class TestEngineMetrics(unittest.TestCase):
+    """analyze_user and analyze_batch feed the same counters"""
+
+    def messages(self):
+        spam = [("spammer", "CHECK OUT MY PROFILE link in bio subscribe now", float(t)) for t in range(6)]
+        chat = [(f"user{i}", f"what a game last night {i}", 100.0 + i) for i in range(4)]
+        return spam + chat
+
+    def test_single_and_batch_agree(self):
+        single = BotDetectionEngine(train=False)
+        results = [single.analyze_user(*message) for message in self.messages()]
+        batch = BotDetectionEngine(train=False)
+        batch.analyze_batch(self.messages())
+        single.close()
+        batch.close()
+
+        a, b = single.metrics.snapshot(), batch.metrics.snapshot()
+        for key in ('messages', 'flagged', 'layer_hits', 'score_histogram'):
+            self.assertEqual(a[key], b[key], key)
+        self.assertEqual(a['messages'], 10)
+        self.assertEqual(a['flagged'], sum(1 for score, _ in results if single.is_likely_bot(score)))
+        self.assertEqual(a['layer_hits']['rapid_fire'], sum("Rapid-fire" in reason for _, reason in results))
+        self.assertGreater(a['layer_hits']['generic_responses'], 0)
+
+    def test_report_renders(self):
+        metrics = DetectionMetrics()
+        metrics.record(0.9, ["rapid_fire", "coordinated_campaign"])
+        metrics.record(0.1, [])
+        report = format_report(metrics.snapshot())
+        self.assertIn("Messages Scored: 2", report)
+        self.assertIn("Flagged as Bot: 1 (50.0%)", report)
+        self.assertEqual(report.count("│"), 10)
+        self.assertEqual(set(metrics.snapshot()['layer_hits']), set(LAYERS))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,61 @@
+"""
+Tests that antibot.detection stays the single, lightweight detection package
+"""
+
+import ast
+import json
+import subprocess
+import sys
+import unittest
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+# Front-ends that score messages; each must import the engine, not define one
+FRONT_ENDS = [
+    ROOT / "src" / "main.py",
+    ROOT.parent / "complete_antibot_full.py",
+    ROOT.parent.parent / "ANT OFRED X.py",
+    ROOT.parent.parent / "ANTOFRED.py",
+]
+
+HEAVY_MODULES = ["customtkinter", "tkinter", "openai", "praw", "asyncpraw", "aiohttp", "sklearn", "pandas"]
+
+
+class TestDetectionImport(unittest.TestCase):
+    def test_import_is_free_of_gui_and_api_modules(self):
+        # Fresh interpreter: the test run itself has imported plenty
+        code = (
+            "import json, sys\n"
+            "import antibot.detection\n"
+            f"print(json.dumps([m for m in {HEAVY_MODULES!r} if m in sys.modules]))\n"
+        )
+        output = subprocess.run(
+            [sys.executable, "-c", code], cwd=ROOT, capture_output=True, text=True, check=True,
+        ).stdout
+        self.assertEqual(json.loads(output), [])
+
+
+class TestFrontEnds(unittest.TestCase):
+    def test_front_ends_share_the_package_engine(self):
+        checked = 0
+        for path in FRONT_ENDS:
+            if not path.exists():  # shipped without the GUI scripts
+                continue
+            with self.subTest(front_end=path.name):
+                tree = ast.parse(path.read_text(encoding="utf-8"))
+                classes = {node.name for node in ast.walk(tree) if isinstance(node, ast.ClassDef)}
+                self.assertNotIn("BotDetectionEngine", classes)
+                imported = {
+                    alias.name
+                    for node in ast.walk(tree)
+                    if isinstance(node, ast.ImportFrom) and node.module == "antibot.detection"
+                    for alias in node.names
+                }
+                self.assertIn("BotDetectionEngine", imported)
+            checked += 1
+        self.assertGreater(checked, 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
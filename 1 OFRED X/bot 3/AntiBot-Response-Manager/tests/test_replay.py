@@ -0,0 +1,136 @@
+"""
+Tests for offline replay, evaluation and signature sweeps
+"""
+
+import json
+import os
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+from io import StringIO
+
+from antibot import replay
+from antibot.detection import DetectionResult
+from antibot.detection.rules import DEFAULT_SIGNATURES
+from tests.workload import WorkloadConfig, generate
+
+
+class TestLoadAndEvaluate(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, "stream.jsonl")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_load_sorts_by_event_time_and_merges_labels(self):
+        records = [
+            {"user_id": "b", "text": "late", "timestamp": 20.0},
+            {"user_id": "a", "text": "first", "timestamp": 10.0, "label": "human"},
+            {"user_id": "c", "text": "tie", "timestamp": 20.0, "label": 1},
+        ]
+        with open(self.path, "w", encoding="utf-8") as f:
+            f.write("\n".join(json.dumps(r) for r in records) + "\n\n")
+        messages, labels = replay.load_stream(self.path, {"b": "bot", "a": True})
+        self.assertEqual(messages, [("a", "first", 10.0), ("b", "late", 20.0), ("c", "tie", 20.0)])
+        self.assertEqual(labels, [False, True, True])  # the message's own label wins
+
+        with open(self.path, "w", encoding="utf-8") as f:
+            f.write(json.dumps({"user_id": "a", "timestamp": 1}) + "\n")
+        with self.assertRaisesRegex(ValueError, "record 1"):
+            replay.load_stream(self.path)
+        with self.assertRaises(ValueError):
+            replay.parse_label("maybe")
+
+    def test_evaluate_counts(self):
+        results = [DetectionResult(f"u{i}", float(i), score=score, contributions=contributions)
+                   for i, (score, contributions) in enumerate([
+                       (0.9, {"rapid_fire": 0.5, "url_bomber": 0.4}),
+                       (0.7, {"rapid_fire": 0.7}),
+                       (0.3, {"unusual_caps": 0.3}),
+                       (0.65, {"rapid_fire": 0.65}),
+                       (0.0, {}),
+                   ])]
+        report = replay.evaluate(results, [True, True, True, False, None])
+        self.assertEqual(report['confusion'], {'tp': 2, 'fp': 1, 'fn': 1, 'tn': 0})
+        self.assertEqual((report['labelled'], report['bots'], report['humans']), (4, 3, 1))
+        self.assertAlmostEqual(report['precision'], 2 / 3)
+        self.assertAlmostEqual(report['recall'], 2 / 3)
+        self.assertAlmostEqual(report['roc_auc'], 2 / 3)
+        self.assertEqual(report['layers']['rapid_fire'], {'bots': 2, 'humans': 1})
+        self.assertEqual(report['best_f1']['threshold'], 0.3)  # P 3/4, R 1 beats P 1, R 2/3
+        self.assertIsNone(report['roc'][0][2])
+        json.dumps(report)  # the --output file
+
+        one_class = replay.evaluate(results[:2], [True, True])
+        self.assertIsNone(one_class['roc_auc'])
+        with self.assertRaises(ValueError):
+            replay.evaluate(results, [None] * 5)
+
+    def test_expand_grid(self):
+        variants = replay.expand_grid(DEFAULT_SIGNATURES, {"rapid_fire.weight": [0.2, 0.3],
+                                                           "url_bomber.url_threshold": [2, 5]})
+        self.assertEqual([name for name, _ in variants][:2], ["rapid_fire.weight=0.2,url_bomber.url_threshold=2",
+                                                              "rapid_fire.weight=0.2,url_bomber.url_threshold=5"])
+        self.assertEqual(len(variants), 4)
+        self.assertEqual(variants[3][1]["url_bomber"]["url_threshold"], 5)
+        self.assertEqual(DEFAULT_SIGNATURES["rapid_fire"]["weight"], 0.25)  # base untouched
+        with self.assertRaises(ValueError):
+            replay.expand_grid(DEFAULT_SIGNATURES, {"weight": [1]})
+
+
+class TestReplaySweep(unittest.TestCase):
+    """Sweeps replay the same stream per config, in any number of processes"""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.messages = generate(WorkloadConfig(humans=20, bots=4, duration=1800.0))
+        self.labels = [user_id.startswith("bot") for user_id, _, _ in self.messages]
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_replay_separates_bots(self):
+        results = replay.replay(self.messages, batch_size=100)
+        self.assertEqual([r.to_dict() for r in results],
+                         [r.to_dict() for r in replay.replay(self.messages)])  # batch size is invisible
+        report = replay.evaluate(results, self.labels)
+        self.assertGreater(report['roc_auc'], 0.9)
+        self.assertGreater(report['layers']['rapid_fire']['bots'], report['layers']['rapid_fire']['humans'])
+
+    def test_parallel_sweep_matches_serial(self):
+        configs = replay.expand_grid(DEFAULT_SIGNATURES, {"rapid_fire.weight": [0.0, 0.5]})
+        serial = replay.sweep(self.messages, self.labels, configs, workers=1)
+        parallel = replay.sweep(self.messages, self.labels, configs, workers=2)
+        for name, _ in configs:
+            for key in ('confusion', 'roc', 'layers', 'ruleset'):
+                self.assertEqual(parallel[name][key], serial[name][key])
+        self.assertGreater(serial["rapid_fire.weight=0.5"]['roc_auc'], serial["rapid_fire.weight=0.0"]['roc_auc'])
+
+        with self.assertRaises(ValueError):
+            replay.sweep(self.messages, self.labels, [("bad", {"rapid_fire": {"weight": 2}})])
+
+    def test_cli(self):
+        stream, labels, grid, output = (os.path.join(self.tmp.name, name)
+                                        for name in ("stream.jsonl", "labels.json", "grid.json", "report.json"))
+        with open(stream, "w", encoding="utf-8") as f:
+            for user_id, text, timestamp in self.messages:
+                f.write(json.dumps({"user_id": user_id, "text": text, "timestamp": timestamp}) + "\n")
+        with open(labels, "w", encoding="utf-8") as f:
+            json.dump({user_id: user_id.startswith("bot") for user_id, _, _ in self.messages}, f)
+        with open(grid, "w", encoding="utf-8") as f:
+            json.dump({"unusual_caps.weight": [0.1, 0.15]}, f)
+
+        with redirect_stdout(StringIO()) as out:
+            code = replay.main([stream, "--labels", labels, "--grid", grid,
+                                "--workers", "1", "--output", output])
+        self.assertEqual(code, 0)
+        self.assertIn("unusual_caps.weight=0.15", out.getvalue())
+        with open(output, encoding="utf-8") as f:
+            reports = json.load(f)
+        self.assertEqual(set(reports), {"unusual_caps.weight=0.1", "unusual_caps.weight=0.15"})
+        self.assertEqual(reports["unusual_caps.weight=0.1"]['labelled'], len(self.messages))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,137 @@
+"""
+Tests for structured detection results, their serialization and score calibration
+"""
+
+import io
+import unittest
+
+import numpy as np
+
+from antibot.detection import (BotDetectionEngine, DetectionResult, ScoreCalibrator,
+                               read_records, write_records)
+
+SPAM = "CHECK OUT MY PROFILE link in bio subscribe now http://a.io http://b.io http://c.io http://d.io"
+
+
+class TestDetectionResult(unittest.TestCase):
+    """Reason text and serialization round trips"""
+
+    def result(self, **overrides) -> DetectionResult:
+        fields = dict(
+            user_id="użytkownik", timestamp=1700000000.5, score=0.7, probability=0.73,
+            contributions={"rapid_fire": 0.25, "url_bomber": 0.1, "ml_anomaly": 0.0731, "coordinated_campaign": 0.2},
+            features=tuple(float(i) / 3 for i in range(8)), model_version=4, ruleset_version=2,
+            url_count=5, campaign_size=7,
+        )
+        fields.update(overrides)
+        return DetectionResult(**fields)
+
+    def test_reason_and_layers(self):
+        result = self.result()
+        self.assertEqual(result.layers, ("rapid_fire", "url_bomber", "ml_anomaly", "coordinated_campaign"))
+        self.assertEqual(result.reason, "⚠️ Rapid-fire messaging detected | 🔗 URL bombing: 5 links detected"
+                                        " | 🤖 ML anomaly detected | 🕸️ Coordinated campaign: 7 accounts"
+                                        " posting near-identical messages")
+        self.assertEqual(DetectionResult("u", 0.0).reason, "✅ Looks humanly natural")
+        self.assertTrue(result.is_bot())
+        with self.assertRaises(AttributeError):
+            result.extra = 1  # slots
+
+    def test_json_and_binary_round_trip(self):
+        for result in (self.result(), self.result(features=None, model_version=None, contributions={})):
+            with self.subTest(result=result):
+                self.assertEqual(DetectionResult.from_bytes(result.to_bytes()), result)
+                self.assertEqual(DetectionResult.from_dict(result.to_dict()), result)
+                self.assertLess(len(result.to_bytes()), len(result.to_json().encode("utf-8")))
+
+    def test_binary_keeps_evaluation_order(self):
+        # Engines add contributions cheapest layer first, not in LAYERS order
+        result = self.result(contributions={"url_bomber": 0.1, "rapid_fire": 0.25, "coordinated_campaign": 0.2},
+                             skipped=("coordinated_campaign", "ml_anomaly"), threshold=0.5)
+        restored = DetectionResult.from_bytes(result.to_bytes())
+        self.assertEqual(list(restored.contributions), ["url_bomber", "rapid_fire", "coordinated_campaign"])
+        self.assertEqual(restored.skipped, ("coordinated_campaign", "ml_anomaly"))
+        self.assertEqual(restored.reason, result.reason)
+        self.assertEqual(restored.to_json(), result.to_json())
+        self.assertEqual(restored.threshold, 0.5)
+
+    def test_binary_carries_plugin_layers_by_name(self):
+        result = self.result(contributions={"shouting_name": 0.3, "rapid_fire": 0.25, "łańcuszek": 0.1},
+                             skipped=("ml_anomaly", "shouting_name_2"))
+        restored = DetectionResult.from_bytes(result.to_bytes())
+        self.assertEqual(restored, result)
+        self.assertEqual(list(restored.contributions), ["shouting_name", "rapid_fire", "łańcuszek"])
+        self.assertEqual(restored.skipped, ("ml_anomaly", "shouting_name_2"))
+
+    def test_record_stream(self):
+        results = [self.result(user_id=f"u{i}", score=i / 10) for i in range(5)]
+        buffer = io.BytesIO()
+        self.assertEqual(write_records(buffer, results), 5)
+        buffer.seek(0)
+        self.assertEqual(list(read_records(buffer)), results)
+
+
+class TestScoreCalibrator(unittest.TestCase):
+    def test_default_threshold_is_even_odds(self):
+        calibrator = ScoreCalibrator()
+        self.assertAlmostEqual(calibrator.probability(0.6), 0.5)
+        self.assertLess(calibrator.probability(0.0), 0.01)
+        self.assertEqual(calibrator.probability(1e6), 1.0)
+        np.testing.assert_allclose(calibrator.probabilities([0.0, 0.6]), [calibrator.probability(0.0), 0.5])
+
+    def test_fit_recovers_logistic_curve(self):
+        rng = np.random.default_rng(0)
+        scores = rng.uniform(0, 1, 20000)
+        labels = rng.uniform(size=scores.size) < 1 / (1 + np.exp(-(8 * scores - 3)))
+        calibrator = ScoreCalibrator().fit(scores, labels)
+        self.assertAlmostEqual(calibrator.slope, 8, delta=0.5)
+        self.assertAlmostEqual(calibrator.intercept, -3, delta=0.3)
+        self.assertEqual(ScoreCalibrator.from_dict(calibrator.to_dict()).slope, calibrator.slope)
+        with self.assertRaises(ValueError):
+            ScoreCalibrator().fit([], [])
+
+
+class TestEngineResults(unittest.TestCase):
+    """detect() and detect_batch() produce identical structured results"""
+
+    def engine(self) -> BotDetectionEngine:
+        engine = BotDetectionEngine(train=False)
+        rng = np.random.default_rng(0)
+        for row in rng.normal(size=(60, len(engine.FEATURE_NAMES))):
+            engine.trainer.observe(row)
+        engine.trainer.refit()
+        return engine
+
+    def test_single_and_batch_agree(self):
+        messages = [(f"bot{i % 4}", SPAM, float(i)) for i in range(12)]
+        messages += [(f"user{i}", f"what a game last night {i}", 100.0 + i) for i in range(4)]
+        single, batch = self.engine(), self.engine()
+        expected = [single.detect(*message) for message in messages]
+        actual = batch.detect_batch(messages)
+        single.close()
+        batch.close()
+
+        self.assertEqual([r.to_dict() for r in actual], [r.to_dict() for r in expected])
+        spam = actual[11]
+        self.assertEqual(spam.score, min(1.0, sum(spam.contributions.values())))
+        # Evaluation order (cheapest first), kept through a binary round trip
+        self.assertEqual(list(spam.contributions), [layer.name for layer in batch.layers if layer.name in spam.contributions])
+        self.assertEqual(DetectionResult.from_bytes(spam.to_bytes()).to_json(), spam.to_json())
+        self.assertIn("coordinated_campaign", spam.contributions)
+        self.assertEqual((spam.url_count, spam.model_version, spam.ruleset_version), (4, 1, 1))
+        self.assertEqual(len(spam.features), len(BotDetectionEngine.FEATURE_NAMES))
+        self.assertEqual(spam.probability, single.calibrator.probability(spam.score))
+
+    def test_engine_threshold_reaches_results_and_metrics(self):
+        engine = BotDetectionEngine(train=False, bot_threshold=0.3)
+        results = engine.detect_batch([(f"bot{i % 4}", SPAM, float(i)) for i in range(12)])
+        engine.close()
+        flagged = [result for result in results if 0.3 <= result.score < 0.6]
+        self.assertTrue(flagged)
+        self.assertTrue(all(result.threshold == 0.3 and result.is_bot() for result in flagged))
+        self.assertFalse(flagged[0].is_bot(threshold=0.6))
+        self.assertEqual(engine.metrics.flagged, sum(result.is_bot() for result in results))
+
+
+if __name__ == "__main__":
+    unittest.main()
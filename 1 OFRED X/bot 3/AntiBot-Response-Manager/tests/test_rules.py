@@ -0,0 +1,183 @@
+"""
+Tests for signature validation, compiled rulesets and hot reloading
+"""
+
+import dataclasses
+import json
+import os
+import tempfile
+import unittest
+from pathlib import Path
+
+import numpy as np
+
+from antibot.detection import BotDetectionEngine, Ruleset, RulesetError, SignatureWatcher
+from antibot.detection.rules import DEFAULT_SIGNATURES, validate_signatures
+
+CONFIG = Path(__file__).resolve().parents[1] / "config" / "bot_signatures.json"
+SPAM = "CHECK OUT MY PROFILE link in bio subscribe now"
+
+
+class TestValidation(unittest.TestCase):
+    """Schema checks and defaults"""
+
+    def test_shipped_config_is_valid(self):
+        ruleset = Ruleset.load(str(CONFIG))
+        self.assertEqual(ruleset.generic_matcher.keywords[0], "check out my profile")
+        # Sections missing from the file fall back to the defaults
+        self.assertEqual(dict(ruleset.signatures["suspicious_timing"]), DEFAULT_SIGNATURES["suspicious_timing"])
+
+    def test_missing_fields_take_defaults(self):
+        signatures = validate_signatures({"url_bomber": {"url_threshold": 5}})
+        self.assertEqual(signatures["url_bomber"], {"url_threshold": 5, "weight": 0.10})
+        self.assertEqual(signatures["rapid_fire"], DEFAULT_SIGNATURES["rapid_fire"])
+
+    def test_every_problem_is_reported(self):
+        with self.assertRaises(RulesetError) as caught:
+            validate_signatures({
+                "rapid_fire": {"min_msgs": 1.5, "wieght": 0.2, "windows": [{"seconds": 60}]},
+                "emoji_spam": {"threshold": 2},
+                "url_bomber": {"url_threshold": True},
+                "generic_responses": {"keywords": ["ok", ""]},
+                "typo_section": {},
+            }, source="sig.json")
+        problems = caught.exception.problems
+        self.assertEqual(len(problems), 7)
+        self.assertIn("rapid_fire.windows: window 0: expected an object with exactly 'seconds' and 'min_msgs'",
+                      problems)
+        self.assertIn("rapid_fire.min_msgs: expected an integer, got 1.5", problems)
+        self.assertIn("rapid_fire.wieght: unknown field", problems)
+        self.assertIn("unknown section 'typo_section'", problems)
+        self.assertTrue(str(caught.exception).startswith("sig.json: "))
+        self.assertIsInstance(caught.exception, ValueError)
+
+    def test_unreadable_file(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "broken.json"
+            path.write_text("{not json", encoding="utf-8")
+            with self.assertRaises(RulesetError):
+                Ruleset.load(str(path))
+            with self.assertRaises(RulesetError):
+                Ruleset.load(str(Path(tmp) / "missing.json"))
+
+    def test_ruleset_is_immutable(self):
+        ruleset = Ruleset.compile(DEFAULT_SIGNATURES)
+        with self.assertRaises(dataclasses.FrozenInstanceError):
+            ruleset.caps_ratio = 0.9
+        with self.assertRaises(TypeError):
+            ruleset.signatures["rapid_fire"]["weight"] = 1.0
+        self.assertEqual(ruleset.to_dict(), DEFAULT_SIGNATURES)
+        self.assertEqual(ruleset.digest, Ruleset.compile(ruleset.to_dict()).digest)
+
+
+class TestRateLayers(unittest.TestCase):
+    """Multi-window rapid-fire and timing regularity, driven by the config"""
+
+    def reasons(self, engine, user_id, timestamps):
+        return [engine.analyze_user(user_id, f"message number {i} about the game", t)[1]
+                for i, t in enumerate(timestamps)]
+
+    def test_windows_at_several_scales(self):
+        signatures = {"rapid_fire": {"windows": [{"seconds": 60, "min_msgs": 10}, {"seconds": 3600, "min_msgs": 40}]},
+                      "suspicious_timing": {"weight": 0.0}}
+        engine = BotDetectionEngine(train=False)
+        engine.set_ruleset(Ruleset.compile(signatures, version=2))
+        # One message every 5 s: 10 land in a minute from the 10th message on
+        minute = self.reasons(engine, "fast", [5.0 * i for i in range(12)])
+        # One message every 80 s: never 10 a minute, 40 span 3120 s < 1 h from the 40th on
+        hour = self.reasons(engine, "steady", [80.0 * i for i in range(46)])
+        engine.close()
+        self.assertEqual(["Rapid-fire" in reason for reason in minute], [False] * 9 + [True] * 3)
+        self.assertEqual(["Rapid-fire" in reason for reason in hour].index(True), 39)
+
+    def test_suspicious_timing(self):
+        engine = BotDetectionEngine(train=False)
+        rng = np.random.default_rng(1)
+        metronome = self.reasons(engine, "bot", [100.0 * i + rng.uniform(0, 5) for i in range(10)])
+        human = self.reasons(engine, "human", list(np.cumsum(rng.exponential(100.0, size=10))))
+        engine.close()
+        self.assertEqual(["timing" in reason for reason in metronome], [False] * 5 + [True] * 5)
+        self.assertFalse(any("timing" in reason for reason in human))
+        self.assertEqual(engine.metrics.layer_hits["suspicious_timing"], 5)
+
+    def test_pattern_threshold(self):
+        # The same text four times, then four new ones
+        texts = ["same old message"] * 4 + [f"brand new topic {word}" for word in ("alpha", "beta", "gamma", "delta")]
+        verdicts = {}
+        for threshold in (0.7, 0.3):
+            engine = BotDetectionEngine(train=False)
+            engine.set_ruleset(Ruleset.compile({"repetitive": {"pattern_threshold": threshold}}, version=2))
+            reasons = [engine.analyze_user("u", text, 1000.0 * i)[1] for i, text in enumerate(texts)]
+            engine.close()
+            verdicts[threshold] = ["repetitive" in reason for reason in reasons]
+        # Repeats so far: 0/1, 1/2, 2/3, 3/4, then 3/5 ... 3/8
+        self.assertEqual(verdicts[0.7], [False, False, False, True, False, False, False, False])
+        self.assertEqual(verdicts[0.3], [False, True, True, True, True, True, True, True])
+
+
+class TestReload(unittest.TestCase):
+    """Engines swap rulesets without losing behavior state"""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.config = Path(self.tmp.name) / "bot_signatures.json"
+        self.write({"generic_responses": {"weight": 0.15}})
+        self.engine = BotDetectionEngine(config_path=str(self.config), train=False)
+
+    def tearDown(self):
+        self.engine.close()
+        self.tmp.cleanup()
+
+    def write(self, signatures):
+        self.config.write_text(json.dumps(signatures), encoding="utf-8")
+
+    def test_reload_keeps_behavior_state(self):
+        self.engine.analyze_user("spammer", SPAM, 1.0)
+        self.write({"generic_responses": {"weight": 0.5}})
+        ruleset = self.engine.reload_signatures()
+        self.assertEqual(ruleset.version, 2)
+
+        score, _ = self.engine.analyze_user("spammer", SPAM, 100.0)
+        self.assertEqual(score, 0.5)
+        self.assertEqual(self.engine.user_behaviors["spammer"].message_count, 2)
+
+    def test_invalid_reload_keeps_current_ruleset(self):
+        current = self.engine.ruleset
+        self.write({"generic_responses": {"weight": "high"}})
+        with self.assertRaises(RulesetError):
+            self.engine.reload_signatures()
+        self.assertIs(self.engine.ruleset, current)
+
+    def test_in_flight_message_keeps_its_version(self):
+        rules = self.engine.ruleset
+        scored = self.engine.score_message("spammer", SPAM, 1.0, rules)
+        self.engine.set_ruleset(Ruleset.compile({"generic_responses": {"weight": 0.9}}, version=2))
+        result = self.engine.finish_message(*scored, rules)
+        self.assertEqual((result.score, result.ruleset_version), (0.15, 1))
+        score, _ = self.engine.analyze_user("spammer2", SPAM, 2.0)
+        self.assertEqual(score, 0.9)
+
+    def test_watcher_reloads_on_change(self):
+        watcher = SignatureWatcher(str(self.config), self.engine.reload_signatures, interval=3600)
+        self.assertFalse(watcher.check())
+
+        self.write({"generic_responses": {"weight": 0.3}})
+        os.utime(self.config, ns=(1, 1))  # a distinct mtime even on coarse-grained filesystems
+        self.assertTrue(watcher.check())
+        self.assertEqual(self.engine.ruleset.weights["generic_responses"], 0.3)
+
+        with self.assertLogs("antibot.detection.rules", "WARNING"):
+            self.write({"generic_responses": {"weight": -1}})
+            os.utime(self.config, ns=(2, 2))
+            self.assertFalse(watcher.check())
+        self.assertEqual(self.engine.ruleset.version, 2)
+
+    def test_watch_thread_stops_on_close(self):
+        engine = BotDetectionEngine(config_path=str(self.config), train=False, watch_config=True)
+        self.assertTrue(engine.signature_watcher._thread.is_alive())
+        engine.close()
+        self.assertIsNone(engine.signature_watcher._thread)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,107 @@
+"""
+Tests for the headless HTTP scoring service
+"""
+
+import unittest
+
+from aiohttp.test_utils import TestClient, TestServer
+
+from antibot.detection import BotDetectionEngine
+from antibot.service import MAX_BATCH, create_app
+
+
+class TestScoringService(unittest.IsolatedAsyncioTestCase):
+    """/score, /score/batch and /health against a resident engine"""
+
+    async def asyncSetUp(self):
+        self.engine = BotDetectionEngine()
+        self.client = TestClient(TestServer(create_app(self.engine)))
+        await self.client.start_server()
+
+    async def asyncTearDown(self):
+        await self.client.close()
+
+    async def test_score(self):
+        response = await self.client.post("/score", json={'user_id': "u1", 'text': "hello there", 'timestamp': 100.0})
+        self.assertEqual(response.status, 200)
+        body = await response.json()
+        self.assertEqual(body['user_id'], "u1")
+        self.assertIsInstance(body['score'], float)
+        self.assertFalse(body['is_bot'])
+        self.assertIn("u1", self.engine.user_behaviors)
+
+    async def test_batch_matches_engine_order(self):
+        messages = [
+            {'user_id': "spammer", 'text': "CHECK OUT MY PROFILE link in bio subscribe now", 'timestamp': float(t)}
+            for t in range(6)
+        ]
+        response = await self.client.post("/score/batch", json={'messages': messages})
+        self.assertEqual(response.status, 200)
+        results = (await response.json())['results']
+        self.assertEqual(len(results), 6)
+        self.assertTrue(all(r['user_id'] == "spammer" for r in results))
+        self.assertIn("Rapid-fire", results[-1]['reason'])
+        self.assertIn("rapid_fire", results[-1]['contributions'])
+        self.assertAlmostEqual(sum(results[-1]['contributions'].values()), results[-1]['score'])
+        self.assertGreater(results[-1]['score'], results[0]['score'])
+
+    async def test_early_exit_and_explain(self):
+        self.engine.early_exit = True
+        messages = [
+            {'user_id': "spammer", 'text': "CHECK OUT MY PROFILE link in bio subscribe now", 'timestamp': float(t)}
+            for t in range(6)
+        ]
+        response = await self.client.post("/score/batch", json={'messages': messages})
+        last = (await response.json())['results'][-1]
+        self.assertTrue(last['is_bot'])
+        self.assertIn("coordinated_campaign", last['skipped'])
+
+        message = dict(messages[0], timestamp=6.0)
+        response = await self.client.post("/score", json=dict(message, explain=True))
+        body = await response.json()
+        self.assertEqual(body['skipped'], [])
+        response = await self.client.post("/score", json=dict(message, explain="yes"))
+        self.assertEqual(response.status, 400)
+
+    async def test_timestamp_is_optional(self):
+        response = await self.client.post("/score", json={'user_id': "u2", 'text': "hi"})
+        self.assertEqual(response.status, 200)
+
+    async def test_invalid_payloads(self):
+        for payload in ({'text': "no user"}, {'user_id': "u1", 'text': 5}, {'user_id': "u1", 'text': "x", 'timestamp': "now"}):
+            with self.subTest(payload=payload):
+                response = await self.client.post("/score", json=payload)
+                self.assertEqual(response.status, 400)
+                self.assertIn("error", await response.json())
+
+        response = await self.client.post("/score", data=b"not json")
+        self.assertEqual(response.status, 400)
+        response = await self.client.post("/score/batch", json={'messages': "nope"})
+        self.assertEqual(response.status, 400)
+
+    async def test_batch_limit(self):
+        messages = [{'user_id': "u", 'text': "x"}] * (MAX_BATCH + 1)
+        response = await self.client.post("/score/batch", json={'messages': messages})
+        self.assertEqual(response.status, 413)
+
+    async def test_metrics(self):
+        await self.client.post("/score", json={'user_id': "u1", 'text': "hello there", 'timestamp': 1.0})
+        response = await self.client.get("/metrics")
+        self.assertEqual(response.status, 200)
+        self.assertTrue(response.headers['Content-Type'].startswith("text/plain; version=0.0.4"))
+        self.assertIn("antibot_messages_total 1", await response.text())
+
+        response = await self.client.get("/metrics.json")
+        body = await response.json()
+        self.assertEqual(body['detection']['messages'], 1)
+        self.assertIn('instrumentation', body)
+
+    async def test_health(self):
+        response = await self.client.get("/health")
+        body = await response.json()
+        self.assertEqual(body['status'], "ok")
+        self.assertIsNone(body['model_version'])
+
+
+if __name__ == "__main__":
+    unittest.main()
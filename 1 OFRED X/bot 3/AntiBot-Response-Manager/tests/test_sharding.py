@@ -0,0 +1,143 @@
+"""
+Tests for the multi-process sharded detector
+"""
+
+import json
+import random
+import tempfile
+import unittest
+from pathlib import Path
+
+from antibot.detection import BotDetectionEngine, ShardedDetector, SQLiteBehaviorStore
+
+TEXTS = [
+    "hello how are you doing today my friend",
+    "CHECK OUT MY PROFILE link in bio subscribe now",
+    "😀😀😀 lol",
+    "what a game last night, the referee was terrible http://x.y",
+]
+
+
+def workload(n: int, users: int = 40, seed: int = 0):
+    rng = random.Random(seed)
+    timestamp = 1000.0
+    messages = []
+    for _ in range(n):
+        timestamp += rng.choice([0.5, 2.0, 30.0])
+        messages.append((f"u{rng.randrange(users)}", f"{rng.choice(TEXTS)} {rng.randrange(20)}", timestamp))
+    return messages
+
+
+class TestShardedDetector(unittest.TestCase):
+    """Same scores as one engine, in input order"""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_matches_single_process(self):
+        messages = workload(300)
+        engine = BotDetectionEngine(train=False)
+        expected = [engine.analyze_user(*message) for message in messages]
+        engine.close()
+
+        with ShardedDetector(workers=3) as detector:
+            actual = detector.analyze_batch(messages[:120]) + detector.analyze_batch(messages[120:])
+        self.assertEqual(actual, expected)
+        self.assertTrue(any("Coordinated campaign" in reason for _, reason in actual))
+
+    def test_stream_reorders_across_shards(self):
+        messages = workload(200)
+        engine = BotDetectionEngine(train=False)
+        expected = [engine.analyze_user(*message) for message in messages]
+        engine.close()
+
+        # Swap neighbours: every message arrives at most one step late
+        arrival = list(messages)
+        for i in range(0, len(arrival) - 1, 2):
+            arrival[i], arrival[i + 1] = arrival[i + 1], arrival[i]
+        with ShardedDetector(workers=2) as detector:
+            actual = [(r.score, r.reason) for r in detector.detect_stream(arrival, max_delay=30.0, batch_size=64)]
+        self.assertEqual(actual, expected)
+
+    def test_checkpoint_writes_shard_state(self):
+        store_dir = str(Path(self.tmp.name) / "behaviors")
+        messages = workload(50, users=10)
+        with ShardedDetector(workers=2, store_dir=store_dir, checkpoint_interval=3600) as detector:
+            detector.analyze_batch(messages)
+            user_id = messages[0][0]
+            shard_dir = str(Path(store_dir) / f"shard-{detector.shard_of(user_id)}")
+            self.assertEqual(detector.checkpoint(), len({user_id for user_id, _, _ in messages}))
+
+        # Each worker writes only its own store
+        self.assertEqual(sorted(p.name for p in Path(store_dir).iterdir()), ["shard-0", "shard-1"])
+        restored = SQLiteBehaviorStore(shard_dir).load(user_id)
+        self.assertIsNotNone(restored)
+        self.assertEqual(restored.message_count, sum(1 for m in messages if m[0] == user_id))
+        other_dir = str(Path(store_dir) / f"shard-{1 - detector.shard_of(user_id)}")
+        self.assertIsNone(SQLiteBehaviorStore(other_dir).load(user_id))
+
+    def test_state_is_flushed_between_checkpoints(self):
+        # Workers flush like any SQLiteBehaviorStore instead of holding every
+        # touched user in memory until the next checkpoint
+        store_dir = str(Path(self.tmp.name) / "behaviors")
+        messages = workload(600, users=300)
+        with ShardedDetector(workers=2, store_dir=store_dir, checkpoint_interval=3600) as detector:
+            detector.analyze_batch(messages)
+            stores = [SQLiteBehaviorStore(str(Path(store_dir) / f"shard-{i}")) for i in range(2)]
+            persisted = [user_id for user_id in {m[0] for m in messages}
+                         if stores[detector.shard_of(user_id)].load(user_id) is not None]
+            self.assertGreaterEqual(len(persisted), 64)
+            for store in stores:
+                store.close()
+
+    def test_reload_reaches_workers(self):
+        config = Path(self.tmp.name) / "bot_signatures.json"
+        config.write_text(json.dumps({"rapid_fire": {"weight": 0.25}}), encoding="utf-8")
+        messages = workload(200)
+        engine = BotDetectionEngine(config_path=str(config), train=False)
+        with ShardedDetector(workers=2, config_path=str(config)) as detector:
+            actual = detector.analyze_batch(messages[:100])
+            expected = [engine.analyze_user(*message) for message in messages[:100]]
+
+            config.write_text(json.dumps({"rapid_fire": {"weight": 0.6, "min_msgs": 3, "time_window": 120}}), encoding="utf-8")
+            detector.coordinator.reload_signatures()
+            engine.reload_signatures()
+            actual += detector.analyze_batch(messages[100:])
+            expected += [engine.analyze_user(*message) for message in messages[100:]]
+        engine.close()
+        self.assertEqual(actual, expected)
+        self.assertTrue(any(score >= 0.6 for score, _ in actual[100:]))
+
+    def test_failed_shard_leaves_no_stale_replies(self):
+        messages = workload(120)
+        engine = BotDetectionEngine(train=False)
+        expected = [engine.analyze_user(*message) for message in messages]
+        engine.close()
+
+        with ShardedDetector(workers=3) as detector:
+            # One shard fails (text None) while the others score their chunks
+            broken = ("broken", None, 1.0)
+            others = [(f"side{i}", "hello there", 1.0) for i in range(30)
+                      if detector.shard_of(f"side{i}") != detector.shard_of("broken")]
+            with self.assertRaisesRegex(RuntimeError, f"shard {detector.shard_of('broken')} failed"):
+                detector.analyze_batch(others + [broken])
+
+            # Side users never reappear, so the rest must score as if the batch never happened
+            actual = detector.analyze_batch(messages[:60]) + detector.analyze_batch(messages[60:])
+            detector.checkpoint()
+        self.assertEqual(actual, expected)
+
+    def test_routing_is_stable(self):
+        with ShardedDetector(workers=4) as detector:
+            shards = {detector.shard_of(f"user{i}") for i in range(100)}
+            self.assertEqual(shards, {0, 1, 2, 3})
+            self.assertEqual(detector.shard_of("alice"), detector.shard_of("alice"))
+            score, reason = detector.analyze_user("alice", "hello there", 10.0)
+            self.assertIsInstance(score, float)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,97 @@
+"""
+Tests for SimHash near-duplicate detection
+"""
+
+import unittest
+
+from antibot.detection.similarity import (
+    DEFAULT_MAX_DISTANCE,
+    NearDuplicateIndex,
+    hamming,
+    minhash,
+    simhash,
+    sketch,
+)
+
+SPAM = "Hey babe, check out my profile for something special 😍💦 link in bio!"
+
+
+class TestSimHash(unittest.TestCase):
+    """Small edits stay close, unrelated messages stay far apart"""
+
+    def test_deterministic_64_bit(self):
+        self.assertEqual(simhash(SPAM), simhash(SPAM))
+        self.assertLess(simhash(SPAM), 1 << 64)
+
+    def test_case_and_whitespace_are_ignored(self):
+        self.assertEqual(simhash(SPAM), simhash("  " + SPAM.upper().replace(" ", "\t ")))
+
+    def test_small_edits_are_near(self):
+        for variant in [SPAM.replace("😍", "🔥"), SPAM + " 💦", SPAM.rstrip("!")]:
+            with self.subTest(variant=variant):
+                self.assertLessEqual(hamming(simhash(SPAM), simhash(variant)), DEFAULT_MAX_DISTANCE)
+
+    def test_unrelated_messages_are_far(self):
+        others = [
+            "What time does the game start tonight?",
+            "I think the referee made the wrong call in the second half honestly",
+            "Does anyone know a good recipe for sourdough bread?",
+        ]
+        for other in others:
+            with self.subTest(other=other):
+                self.assertGreater(hamming(simhash(SPAM), simhash(other)), DEFAULT_MAX_DISTANCE)
+
+    def test_short_and_empty_text(self):
+        self.assertEqual(simhash("ok"), simhash("OK"))
+        self.assertIsInstance(simhash(""), int)
+
+
+class TestMinHash(unittest.TestCase):
+    """Signature agreement tracks shingle overlap"""
+
+    def test_agreement(self):
+        signature = minhash(SPAM)
+        near = minhash(SPAM.replace("😍", "🔥"))
+        far = minhash("Does anyone know a good recipe for sourdough bread?")
+        self.assertGreater((signature == near).mean(), 0.6)
+        self.assertLess((signature == far).mean(), 0.3)
+
+    def test_sketch_matches_separate_calls(self):
+        fingerprint, signature = sketch(SPAM, num_perm=16)
+        self.assertEqual(fingerprint, simhash(SPAM))
+        self.assertTrue((signature == minhash(SPAM, num_perm=16)).all())
+
+    def test_invalid_length(self):
+        with self.assertRaises(ValueError):
+            minhash(SPAM, num_perm=0)
+
+
+class TestNearDuplicateIndex(unittest.TestCase):
+    """Fixed-size window of recent fingerprints"""
+
+    def test_add_reports_similar_before_insert(self):
+        index = NearDuplicateIndex(capacity=4)
+        self.assertFalse(index.add(simhash(SPAM)))
+        self.assertTrue(index.add(simhash(SPAM.replace("😍", "🔥"))))
+        self.assertFalse(index.add(simhash("Does anyone know a good recipe for sourdough bread?")))
+
+    def test_capacity_is_fixed(self):
+        index = NearDuplicateIndex(capacity=3, max_distance=0)
+        for value in range(10):
+            index.add(value)
+        self.assertEqual(len(index), 3)
+        self.assertEqual(list(index), [7, 8, 9])
+        self.assertFalse(index.contains_similar(6))
+        self.assertTrue(index.contains_similar(9))
+
+    def test_from_values_keeps_newest(self):
+        index = NearDuplicateIndex.from_values(range(10), capacity=4)
+        self.assertEqual(list(index), [6, 7, 8, 9])
+
+    def test_invalid_capacity(self):
+        with self.assertRaises(ValueError):
+            NearDuplicateIndex(capacity=0)
+
+
+if __name__ == "__main__":
+    unittest.main()
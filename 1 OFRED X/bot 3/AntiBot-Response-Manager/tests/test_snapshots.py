@@ -0,0 +1,92 @@
+"""
+Tests for on-disk anomaly model snapshots
+"""
+
+import tempfile
+import time
+import unittest
+from pathlib import Path
+
+import numpy as np
+
+from antibot.detection.snapshots import ModelSnapshotStore, feature_schema_hash
+from antibot.detection.training import ModelTrainer
+
+FIVE = ('length', 'word_count', 'caps_ratio', 'emoji_ratio', 'url_count')
+EIGHT = (
+    'message_velocity', 'length_anomaly', 'caps_ratio', 'punct_ratio',
+    'emoji_ratio', 'url_count', 'unique_ratio', 'timing_anomaly',
+)
+
+
+def trained(n_features: int, snapshots=None) -> ModelTrainer:
+    trainer = ModelTrainer(n_features=n_features, min_samples=20, n_estimators=10, snapshots=snapshots)
+    for row in np.random.RandomState(0).rand(40, n_features):
+        trainer.observe(row)
+    trainer.refit()
+    return trainer
+
+
+class TestModelSnapshotStore(unittest.TestCase):
+    """Save/load and schema checks"""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.directory = str(Path(self.tmp.name) / "models")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_schema_hash_differs_between_variants(self):
+        self.assertNotEqual(feature_schema_hash(FIVE), feature_schema_hash(EIGHT))
+        self.assertEqual(feature_schema_hash(FIVE), feature_schema_hash(list(FIVE)))
+
+    def test_round_trip_scores_match(self):
+        store = ModelSnapshotStore(self.directory, FIVE)
+        model = trained(5, snapshots=store).model
+        loaded = store.load_latest()
+        self.assertEqual(loaded.version, model.version)
+        probe = np.random.RandomState(1).rand(10, 5)
+        np.testing.assert_array_equal(loaded.anomaly_scores(probe), model.anomaly_scores(probe))
+
+    def test_variants_do_not_mix(self):
+        trained(5, snapshots=ModelSnapshotStore(self.directory, FIVE))
+        self.assertIsNone(ModelSnapshotStore(self.directory, EIGHT).load_latest())
+
+    def test_stale_pointer_is_rejected(self):
+        store = ModelSnapshotStore(self.directory, FIVE)
+        trained(5, snapshots=store)
+        store.pointer_path.write_text('{"format": 1, "schema": "0000", "version": 1, "file": "x"}')
+        self.assertIsNone(store.load_latest())
+
+    def test_keeps_only_newest_snapshots(self):
+        store = ModelSnapshotStore(self.directory, FIVE, keep=2)
+        trainer = trained(5, snapshots=store)
+        for _ in range(3):
+            trainer.refit()
+        files = sorted(p.name for p in Path(self.directory).glob("model-*.joblib"))
+        self.assertEqual(len(files), 2)
+        self.assertTrue(files[-1].endswith("v000004.joblib"))
+
+    def test_trainer_warm_starts_from_snapshot(self):
+        store = ModelSnapshotStore(self.directory, EIGHT)
+        saved = trained(8, snapshots=store).model
+
+        fresh = ModelTrainer(n_features=8, min_samples=20, n_estimators=10, snapshots=store)
+        fresh.start()
+        try:
+            deadline = time.monotonic() + 10
+            while fresh.model is None and time.monotonic() < deadline:
+                time.sleep(0.01)
+            self.assertEqual(fresh.model.version, saved.version)
+        finally:
+            fresh.stop()
+
+        # The next refit continues the version sequence
+        for row in np.random.RandomState(2).rand(30, 8):
+            fresh.observe(row)
+        self.assertEqual(fresh.refit().version, saved.version + 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
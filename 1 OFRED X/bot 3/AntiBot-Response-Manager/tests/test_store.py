@@ -0,0 +1,91 @@
+"""
+Tests for the persistent user-behavior stores
+"""
+
+import tempfile
+import unittest
+from pathlib import Path
+
+from antibot.detection.behavior import UserBehavior
+from antibot.detection.similarity import simhash
+from antibot.detection.store import BehaviorStore, SQLiteBehaviorStore, shard_for
+
+
+def make_user(user_id: str, messages: int = 3) -> UserBehavior:
+    user = UserBehavior(user_id, window=8, created_at=50.0)
+    for i in range(messages):
+        user.record(100.0 + i, 10 * (i + 1))
+        if not user.recent_fingerprints.add(simhash(f"message number {i}")):
+            user.unique_messages += 1
+    return user
+
+
+class TestBehaviorStore(unittest.TestCase):
+    """Default in-memory store"""
+
+    def test_never_returns_state(self):
+        store = BehaviorStore()
+        store.save(make_user("u1"))
+        self.assertIsNone(store.load("u1"))
+
+
+class TestSQLiteBehaviorStore(unittest.TestCase):
+    """Sharded SQLite persistence"""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.directory = Path(self.tmp.name) / "behaviors"
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_round_trip_across_instances(self):
+        store = SQLiteBehaviorStore(str(self.directory), shards=4)
+        original = make_user("alice", messages=20)
+        store.save(original)
+        store.close()
+
+        restored = SQLiteBehaviorStore(str(self.directory), shards=4).load("alice")
+        self.assertIsNotNone(restored)
+        self.assertEqual(restored.to_state(), original.to_state())
+        self.assertEqual(list(restored.timestamps), list(original.timestamps))
+
+    def test_unknown_user(self):
+        store = SQLiteBehaviorStore(str(self.directory))
+        self.assertIsNone(store.load("nobody"))
+        store.close()
+
+    def test_pending_writes_are_visible_before_flush(self):
+        store = SQLiteBehaviorStore(str(self.directory), flush_every=1000, flush_interval=3600)
+        user = make_user("bob")
+        store.save(user)
+        self.assertIs(store.load("bob"), user)
+        store.close()
+
+    def test_flushes_after_threshold(self):
+        store = SQLiteBehaviorStore(str(self.directory), shards=2, flush_every=3, flush_interval=3600)
+        for i in range(3):
+            store.save(make_user(f"user{i}"))
+        self.assertEqual(store._pending_count, 0)
+        other = SQLiteBehaviorStore(str(self.directory), shards=2)
+        self.assertIsNotNone(other.load("user2"))
+        other.close()
+        store.close()
+
+    def test_shards_are_stable(self):
+        self.assertEqual(shard_for("alice", 8), shard_for("alice", 8))
+        store = SQLiteBehaviorStore(str(self.directory), shards=8)
+        for i in range(50):
+            store.save(make_user(f"user{i}"))
+        store.close()
+        files = sorted(p.name for p in self.directory.glob("*.sqlite3"))
+        self.assertGreater(len(files), 1)
+        self.assertLessEqual(len(files), 8)
+
+    def test_open_is_lazy(self):
+        SQLiteBehaviorStore(str(self.directory), shards=8).close()
+        self.assertEqual(list(self.directory.glob("*.sqlite3")), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,172 @@
+"""
+Tests for the GUI task executor
+"""
+
+import threading
+import time
+import unittest
+
+from antibot.tasks import TaskCancelled, TaskExecutor, current_task
+
+
+class FakeScheduler:
+    """Stands in for Tk's after(): callbacks run when the test pumps them, on the test thread"""
+
+    def __init__(self):
+        self.callbacks = []
+        self.frames = 0
+
+    def __call__(self, ms, callback):
+        self.callbacks.append(callback)
+
+    def run_until(self, predicate, timeout: float = 5.0):
+        deadline = time.monotonic() + timeout
+        while not predicate():
+            if time.monotonic() > deadline:
+                raise AssertionError("timed out waiting for the UI pump")
+            callbacks, self.callbacks = self.callbacks, []
+            for callback in callbacks:
+                self.frames += 1
+                callback()
+            time.sleep(0.001)
+
+
+class TestTaskExecutor(unittest.TestCase):
+    """Result marshaling, lanes, cancellation and progress"""
+
+    def setUp(self):
+        self.ui_thread = threading.current_thread()
+        self.scheduler = FakeScheduler()
+        self.tasks = TaskExecutor(self.scheduler, workers=2)
+
+    def tearDown(self):
+        self.tasks.shutdown()
+
+    def test_result_delivered_on_ui_thread(self):
+        seen = []
+        self.tasks.submit(lambda a, b: (threading.current_thread(), a + b), 2, 3,
+                          on_done=lambda result: seen.append((threading.current_thread(), result)))
+        self.scheduler.run_until(lambda: seen)
+
+        (callback_thread, (worker_thread, value)), = seen
+        self.assertIs(callback_thread, self.ui_thread)
+        self.assertIsNot(worker_thread, self.ui_thread)
+        self.assertEqual(value, 5)
+        self.scheduler.run_until(lambda: self.tasks.pending == 0)
+
+    def test_error_callback(self):
+        errors = []
+        self.tasks.submit(lambda: 1 / 0, on_done=lambda _: self.fail("no result expected"),
+                          on_error=errors.append)
+        self.scheduler.run_until(lambda: errors)
+        self.assertIsInstance(errors[0], ZeroDivisionError)
+
+    def test_lane_is_serial(self):
+        running = []
+        overlaps = []
+
+        def work(i):
+            running.append(i)
+            if len(running) > 1:
+                overlaps.append(i)
+            time.sleep(0.005)
+            running.remove(i)
+            return i
+
+        results = []
+        for i in range(6):
+            self.tasks.submit(work, i, lane="engine", on_done=results.append)
+        self.scheduler.run_until(lambda: len(results) == 6)
+        self.assertEqual(results, list(range(6)))
+        self.assertEqual(overlaps, [])
+
+    def test_cancel_running_task(self):
+        started = threading.Event()
+        stopped = threading.Event()
+        cancelled = []
+
+        def scan():
+            task = current_task()
+            task.add_cancel_callback(stopped.set)
+            started.set()
+            for _ in range(1000):
+                task.check()
+                time.sleep(0.005)
+            return "finished"
+
+        task = self.tasks.submit(scan, on_done=lambda _: self.fail("cancelled task delivered a result"),
+                                 on_cancel=lambda: cancelled.append(True))
+        self.assertTrue(started.wait(5))
+        task.cancel()
+        self.assertTrue(stopped.is_set())
+        self.scheduler.run_until(lambda: self.tasks.pending == 0)
+        self.assertEqual(cancelled, [True])
+        self.assertIsNone(task.future.result(5))
+
+    def test_key_replaces_previous_task(self):
+        gate = threading.Event()
+        results = []
+        first = self.tasks.submit(gate.wait, 5, key="refresh", on_done=lambda _: results.append("first"))
+        self.tasks.submit(lambda: "second", key="refresh", on_done=results.append)
+        gate.set()
+        self.scheduler.run_until(lambda: self.tasks.pending == 0)
+        self.assertTrue(first.cancelled)
+        self.assertEqual(results, ["second"])
+
+    def test_queued_task_cancelled_before_start(self):
+        gate = threading.Event()
+        tasks = TaskExecutor(self.scheduler, workers=1)
+        self.addCleanup(tasks.shutdown)
+        tasks.submit(gate.wait, 5)
+        queued = tasks.submit(lambda: self.fail("cancelled before it started"))
+        queued.cancel()
+        gate.set()
+        self.scheduler.run_until(lambda: tasks.pending == 0)
+        self.assertTrue(queued.future.cancelled())
+
+    def test_progress_is_coalesced_per_frame(self):
+        reports = []
+        gate = threading.Event()
+
+        def work():
+            task = current_task()
+            for i in range(1, 101):
+                task.report(i / 100, f"step {i}")
+            gate.wait(5)
+            return "ok"
+
+        done = []
+        self.tasks.submit(work, on_progress=lambda fraction, message: reports.append((fraction, message)),
+                          on_done=done.append)
+        time.sleep(0.1)  # all 100 reports are queued before the next frame
+        gate.set()
+        self.scheduler.run_until(lambda: done)
+        self.assertLess(len(reports), 100)
+        self.assertEqual(reports[-1], (1.0, "step 100"))
+
+    def test_check_raises_after_cancel(self):
+        task = self.tasks.submit(time.sleep, 0.01)
+        task.cancel()
+        with self.assertRaises(TaskCancelled):
+            task.check()
+
+    def test_frame_budget_bounds_callback_time(self):
+        tasks = TaskExecutor(self.scheduler, workers=2, budget_ms=5)
+        self.addCleanup(tasks.shutdown)
+        delivered = []
+        for i in range(50):
+            tasks.submit(lambda i=i: i, on_done=lambda i: (delivered.append(i), time.sleep(0.002)))
+        time.sleep(0.1)
+        self.scheduler.frames = 0
+        self.scheduler.run_until(lambda: len(delivered) == 50)
+        # ~2 ms per callback within a 5 ms budget: several frames, not one long one
+        self.assertGreater(self.scheduler.frames, 5)
+
+    def test_submit_after_shutdown(self):
+        self.tasks.shutdown()
+        with self.assertRaises(RuntimeError):
+            self.tasks.submit(print)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,121 @@
+"""
+Tests for the background anomaly-model trainer
+"""
+
+import threading
+import time
+import unittest
+
+import numpy as np
+
+from antibot.detection.training import FeatureReservoir, ModelTrainer
+
+
+def wait_for(predicate, timeout: float = 10.0) -> bool:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if predicate():
+            return True
+        time.sleep(0.01)
+    return False
+
+
+class TestFeatureReservoir(unittest.TestCase):
+    """Bounded uniform sample"""
+
+    def test_capacity_is_bounded(self):
+        reservoir = FeatureReservoir(n_features=2, capacity=100, seed=1)
+        for i in range(10_000):
+            reservoir.add([i, -i])
+        self.assertEqual(reservoir.seen, 10_000)
+        self.assertEqual(len(reservoir), 100)
+        self.assertEqual(reservoir.sample().shape, (100, 2))
+
+    def test_sample_covers_whole_stream(self):
+        reservoir = FeatureReservoir(n_features=1, capacity=500, seed=3)
+        for i in range(20_000):
+            reservoir.add([i])
+        # A uniform sample of 0..19999 has its mean near 10000
+        self.assertAlmostEqual(reservoir.sample().mean() / 10_000, 1.0, delta=0.1)
+
+
+class TestModelTrainer(unittest.TestCase):
+    """Refit scheduling and model swaps"""
+
+    def test_no_model_until_min_samples(self):
+        trainer = ModelTrainer(n_features=3, min_samples=20, n_estimators=10)
+        for _ in range(19):
+            trainer.observe([1.0, 2.0, 3.0])
+        self.assertIsNone(trainer.refit())
+        self.assertIsNone(trainer.model)
+
+    def test_refit_swaps_in_new_version(self):
+        rng = np.random.RandomState(0)
+        trainer = ModelTrainer(n_features=3, min_samples=20, n_estimators=10)
+        for row in rng.rand(50, 3):
+            trainer.observe(row)
+        first = trainer.refit()
+        self.assertEqual(first.version, 1)
+        self.assertEqual(first.n_samples, 50)
+        second = trainer.refit()
+        self.assertEqual(second.version, 2)
+        self.assertIs(trainer.model, second)
+        scores = second.anomaly_scores(rng.rand(4, 3))
+        self.assertEqual(scores.shape, (4,))
+
+    def test_background_thread_fits_and_refits_on_drift(self):
+        rng = np.random.RandomState(1)
+        trainer = ModelTrainer(n_features=2, min_samples=30, refit_interval=3600,
+                               n_estimators=10, drift_threshold=1.0, drift_alpha=0.2)
+        trainer.start()
+        try:
+            for row in rng.rand(40, 2):
+                trainer.observe(row)
+            self.assertTrue(wait_for(lambda: trainer.model is not None))
+            self.assertEqual(trainer.model.version, 1)
+
+            # Same distribution: no drift refit
+            for row in rng.rand(40, 2):
+                trainer.observe(row)
+            time.sleep(0.1)
+            self.assertEqual(trainer.model.version, 1)
+
+            # Shifted distribution: drift wakes the trainer early
+            for row in rng.rand(40, 2) + 25.0:
+                trainer.observe(row)
+            self.assertTrue(wait_for(lambda: trainer.model.version >= 2))
+        finally:
+            trainer.stop()
+
+    def test_observe_races_refit(self):
+        rng = np.random.RandomState(2)
+        trainer = ModelTrainer(n_features=2, min_samples=20, n_estimators=5, drift_alpha=0.5)
+        for row in rng.rand(20, 2):
+            trainer.observe(row)
+        trainer.refit()
+
+        errors = []
+        done = threading.Event()
+
+        def score():
+            try:
+                while not done.is_set():
+                    trainer.observe(rng.rand(2) * 10)
+            except Exception as e:
+                errors.append(e)
+
+        thread = threading.Thread(target=score)
+        thread.start()
+        try:
+            for _ in range(20):
+                trainer.refit()
+        finally:
+            done.set()
+            thread.join()
+        self.assertEqual(errors, [])
+        self.assertGreaterEqual(trainer.model.version, 21)
+        self.assertGreaterEqual(trainer.seen_since_fit, 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,83 @@
+"""
+Synthetic message streams for tests and benchmarks
+Humans post varied sentences at long, irregular intervals; bots post in
+bursts from a few spam templates (caps, emoji, links), and bots sharing a
+campaign post near-identical text. Output is deterministic for a seed.
+"""
+
+import random
+from dataclasses import dataclass
+from typing import List, Tuple
+
+WORDS = (
+    "game last night was great honestly the referee ruined it for everyone "
+    "anyone know a good place to eat downtown my cat keeps knocking stuff off "
+    "the table lol just finished the book you recommended thanks what time "
+    "does the stream start tomorrow weather has been weird all week I think "
+    "we should try again next weekend did you see that new trailer it looks amazing"
+).split()
+
+EMOJI = ("😂", "😀", "🥰", "🔥", "👍", "😅")
+
+SPAM_TEMPLATES = (
+    "CHECK OUT MY PROFILE for exclusive content link in bio subscribe now {n}",
+    "hey babe 😘😘😘 click here http://promo{n}.example/x http://promo{n}.example/y http://promo{n}.example/z http://promo{n}.example/w",
+    "FREE GIFT CARDS TODAY ONLY 🎁🎁🎁 visit my page and subscribe now {n}",
+    "dm me for free content 🔥🔥🔥🔥 link in bio check out my profile {n}",
+)
+
+CAMPAIGN_TEMPLATE = "Limited offer for the first 100 fans only - subscribe now at http://offer.example/{n}"
+
+
+@dataclass
+class WorkloadConfig:
+    """Shape of a synthetic stream (intervals are mean seconds between a user's messages)"""
+    humans: int = 200
+    bots: int = 20
+    duration: float = 3600.0
+    human_interval: float = 300.0
+    bot_interval: float = 20.0
+    burst: int = 6
+    campaign_share: float = 0.5
+    seed: int = 0
+
+
+def _human_text(rng: random.Random) -> str:
+    words = rng.sample(WORDS, rng.randint(4, 14))
+    words[0] = words[0].capitalize()
+    text = " ".join(words)
+    if rng.random() < 0.2:
+        text += " " + rng.choice(EMOJI)
+    return text + rng.choice((".", "!", "?", ""))
+
+
+def _bot_text(rng: random.Random, campaign: bool) -> str:
+    if campaign:
+        return CAMPAIGN_TEMPLATE.format(n=rng.randint(1, 3))
+    return rng.choice(SPAM_TEMPLATES).format(n=rng.randint(1, 9))
+
+
+def generate(config: WorkloadConfig = WorkloadConfig()) -> List[Tuple[str, str, float]]:
+    """[(user_id, text, timestamp), ...] sorted by timestamp"""
+    rng = random.Random(config.seed)
+    start = 1_700_000_000.0
+    messages = []
+
+    for i in range(config.humans):
+        t = start + rng.uniform(0, config.human_interval)
+        while t < start + config.duration:
+            messages.append((f"human{i}", _human_text(rng), t))
+            t += rng.expovariate(1.0 / config.human_interval)
+
+    for i in range(config.bots):
+        campaign = i < config.bots * config.campaign_share
+        t = start + rng.uniform(0, config.bot_interval * config.burst)
+        while t < start + config.duration:
+            # A burst of messages a second or two apart, then a pause
+            for _ in range(config.burst):
+                messages.append((f"bot{i}", _bot_text(rng, campaign), t))
+                t += rng.uniform(0.5, 2.0)
+            t += rng.expovariate(1.0 / (config.bot_interval * config.burst))
+
+    messages.sort(key=lambda message: message[2])
+    return messages
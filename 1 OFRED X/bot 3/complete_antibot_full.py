@@ -9,9 +9,7 @@ License: GPL-3.0
 
 import os
 import sys
-import json
 import time
-import hashlib
 import random
 import threading
 import asyncio
@@ -20,17 +18,12 @@ from datetime import datetime, timedelta
 from typing import Optional, List, Dict, Tuple
 from dataclasses import dataclass, field, asdict
 from collections import defaultdict
-import re
+from itertools import islice
 
 # GUI
 import customtkinter as ctk
 from tkinter import messagebox, filedialog, scrolledtext
 
-# ML/Data
-import numpy as np
-from sklearn.ensemble import IsolationForest
-from sklearn.preprocessing import StandardScaler
-
 # APIs
 try:
     import praw
@@ -44,241 +37,16 @@ from dotenv import load_dotenv
 
 load_dotenv()
 
-# ============================================================================
-# LOGGING
-# ============================================================================
-
-class Logger:
-    """Simple logging system"""
-    def __init__(self, name: str):
-        self.name = name
-        os.makedirs("logs", exist_ok=True)
-        self.log_file = f"logs/antibot_{datetime.now().strftime('%Y%m%d')}.log"
-    
-    def log(self, level: str, message: str):
-        timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-        log_msg = f"[{timestamp}] [{level}] [{self.name}] {message}"
-        print(log_msg)
-        with open(self.log_file, 'a', encoding='utf-8') as f:
-            f.write(log_msg + "\n")
-    
-    def info(self, msg: str): self.log("INFO", msg)
-    def error(self, msg: str): self.log("ERROR", msg)
-    def warning(self, msg: str): self.log("WARNING", msg)
-    def debug(self, msg: str): self.log("DEBUG", msg)
-
-# ============================================================================
-# DATA MODELS
-# ============================================================================
-
-@dataclass
-class UserBehavior:
-    """Track user behavioral patterns"""
-    user_id: str
-    message_count: int = 0
-    timestamps: List[float] = field(default_factory=list)
-    message_lengths: List[int] = field(default_factory=list)
-    unique_patterns: set = field(default_factory=set)
-    created_at: float = field(default_factory=time.time)
-    
-    def to_dict(self):
-        return {
-            'user_id': self.user_id,
-            'message_count': self.message_count,
-            'unique_patterns_count': len(self.unique_patterns),
-            'avg_message_length': np.mean(self.message_lengths) if self.message_lengths else 0,
-            'created_at': self.created_at,
-        }
-
-# ============================================================================
-# BOT DETECTION ENGINE
-# ============================================================================
-
-class BotDetectionEngine:
-    """
-    🤖 Machine Learning-based Bot Detection System
-    8-Layer Analysis: Velocity + Length + Linguistics + Timing + ML
-    """
-    
-    def __init__(self, config_path: str = None):
-        self.logger = Logger("BotDetector")
-        
-        # Load bot signatures
-        if config_path and Path(config_path).exists():
-            with open(config_path, 'r') as f:
-                self.bot_signatures = json.load(f)
-        else:
-            self.bot_signatures = self._default_signatures()
-        
-        # Initialize ML models
-        self.user_behaviors: Dict[str, UserBehavior] = {}
-        self.scaler = StandardScaler()
-        self.isolation_forest = IsolationForest(
-            contamination=0.1,
-            random_state=42,
-            n_estimators=100
-        )
-        self.training_data = []
-        
-    def _default_signatures(self) -> Dict:
-        """Default bot signatures"""
-        return {
-            "rapid_fire": {"min_msgs": 5, "time_window": 10, "weight": 0.25},
-            "repetitive": {"pattern_threshold": 0.7, "weight": 0.20},
-            "generic_responses": {
-                "keywords": [
-                    "check out my profile", "subscribe now", "link in bio",
-                    "follow for more", "dm me", "click here", "only fans",
-                    "🔥🔥🔥", "💯💯💯", "👀👀👀"
-                ],
-                "weight": 0.15
-            },
-            "suspicious_timing": {"std_dev_threshold": 0.5, "weight": 0.10},
-            "unusual_caps": {"ratio_threshold": 0.4, "weight": 0.15},
-            "emoji_spam": {"threshold": 0.3, "weight": 0.10},
-            "url_bomber": {"url_threshold": 3, "weight": 0.10}
-        }
-    
-    def extract_features(self, text: str, user: UserBehavior) -> np.ndarray:
-        """Extract 8 behavioral features"""
-        
-        # 1. Message velocity (msg/second)
-        if len(user.timestamps) > 1:
-            recent_times = user.timestamps[-5:]
-            time_diffs = np.diff(recent_times)
-            message_velocity = 1.0 / (np.mean(time_diffs) + 1e-6)
-        else:
-            message_velocity = 0.0
-        
-        # 2. Message length anomaly
-        if user.message_lengths:
-            length_std = np.std(user.message_lengths) if len(user.message_lengths) > 1 else 0
-            length_mean = np.mean(user.message_lengths)
-            current_length = len(text)
-            length_anomaly = abs(current_length - length_mean) / (length_std + 1)
-        else:
-            length_anomaly = 0.0
-        
-        # 3. Capitalization ratio
-        caps_ratio = sum(1 for c in text if c.isupper()) / (len(text) + 1)
-        
-        # 4. Punctuation ratio
-        punct_ratio = sum(1 for c in text if c in '!?.,-;:') / (len(text) + 1)
-        
-        # 5. Emoji ratio
-        emoji_ratio = len(re.findall(r'[😀-🙏🌀-🗿🚀-🛿]', text)) / (len(text) + 1)
-        
-        # 6. URL count
-        url_count = len(re.findall(r'http[s]?://\S+', text))
-        
-        # 7. Word uniqueness
-        words = text.lower().split()
-        unique_ratio = len(set(words)) / (len(words) + 1)
-        
-        # 8. Response timing anomaly
-        if len(user.timestamps) > 1:
-            recent_interval = user.timestamps[-1] - user.timestamps[-2]
-            avg_interval = np.mean(np.diff(user.timestamps))
-            timing_anomaly = recent_interval / (avg_interval + 1e-6)
-        else:
-            timing_anomaly = 0.0
-        
-        features = np.array([
-            message_velocity,
-            length_anomaly,
-            caps_ratio,
-            punct_ratio,
-            emoji_ratio,
-            url_count,
-            unique_ratio,
-            timing_anomaly,
-        ])
-        
-        return features
-    
-    def analyze_user(self, user_id: str, text: str) -> Tuple[float, str]:
-        """
-        Analyze user message for bot-like behavior
-        Returns: (bot_score 0-1, reason_string)
-        """
-        
-        # Initialize user if new
-        if user_id not in self.user_behaviors:
-            self.user_behaviors[user_id] = UserBehavior(user_id=user_id)
-        
-        user = self.user_behaviors[user_id]
-        
-        # Update tracking
-        user.message_count += 1
-        user.timestamps.append(time.time())
-        user.message_lengths.append(len(text))
-        
-        bot_score = 0.0
-        reasons = []
-        
-        # ========== CHECK 1: Rapid-Fire Messaging ==========
-        if len(user.timestamps) >= 5:
-            recent_window = user.timestamps[-5:]
-            time_span = recent_window[-1] - recent_window[0]
-            sig = self.bot_signatures['rapid_fire']
-            if time_span < sig['time_window']:
-                bot_score += sig['weight']
-                reasons.append("⚠️ Rapid-fire messaging detected")
-        
-        # ========== CHECK 2: Repetitive Patterns ==========
-        user.unique_patterns.add(hashlib.md5(text.lower().encode()).hexdigest()[:8])
-        if len(user.unique_patterns) < user.message_count * 0.3:
-            bot_score += self.bot_signatures['repetitive']['weight']
-            reasons.append("🔄 Highly repetitive messages")
-        
-        # ========== CHECK 3: Generic/Template Responses ==========
-        generic_sig = self.bot_signatures['generic_responses']
-        generic_count = sum(1 for kw in generic_sig['keywords'] if kw in text.lower())
-        if generic_count > 2:
-            bot_score += generic_sig['weight']
-            reasons.append("📋 Generic/template response detected")
-        
-        # ========== CHECK 4: Abnormal Capitalization ==========
-        caps_ratio = sum(1 for c in text if c.isupper()) / max(len(text), 1)
-        if caps_ratio > self.bot_signatures['unusual_caps']['ratio_threshold']:
-            bot_score += self.bot_signatures['unusual_caps']['weight']
-            reasons.append("🔤 Unusual capitalization pattern")
-        
-        # ========== CHECK 5: Emoji Spam ==========
-        emoji_ratio = len(re.findall(r'[😀-🙏🌀-🗿]', text)) / max(len(text), 1)
-        if emoji_ratio > self.bot_signatures['emoji_spam']['threshold']:
-            bot_score += self.bot_signatures['emoji_spam']['weight']
-            reasons.append("😱 Emoji spam detected")
-        
-        # ========== CHECK 6: URL Bombing ==========
-        url_count = len(re.findall(r'http[s]?://\S+', text))
-        if url_count > self.bot_signatures['url_bomber']['url_threshold']:
-            bot_score += self.bot_signatures['url_bomber']['weight']
-            reasons.append(f"🔗 URL bombing: {url_count} links detected")
-        
-        # ========== CHECK 7: ML Anomaly Detection ==========
-        try:
-            features = self.extract_features(text, user)
-            if len(self.training_data) > 10:
-                scaled_features = self.scaler.transform([features])
-                anomaly_score = -self.isolation_forest.score_samples(scaled_features)[0]
-                if anomaly_score > 0.5:
-                    bot_score += min(0.15, anomaly_score * 0.1)
-                    reasons.append("🤖 ML anomaly detected")
-        except Exception as e:
-            self.logger.debug(f"ML analysis error: {str(e)}")
-        
-        # Normalize score to 0-1
-        bot_score = min(1.0, bot_score)
-        reason_text = " | ".join(reasons) if reasons else "✅ Looks humanly natural"
-        
-        self.logger.info(f"Analyzed {user_id}: {bot_score:.2%} - {reason_text}")
-        
-        return bot_score, reason_text
-    
-    def is_likely_bot(self, bot_score: float, threshold: float = 0.6) -> bool:
-        """Determine if user is likely a bot"""
-        return bot_score >= threshold
+# Shared detection package (antibot/) - next to src/ or inside AntiBot-Response-Manager/
+_HERE = Path(__file__).resolve().parent
+for _root in (_HERE.parent, _HERE / "AntiBot-Response-Manager"):
+    if (_root / "antibot").is_dir():
+        sys.path.insert(0, str(_root))
+        break
+from antibot.detection import BotDetectionEngine, SQLiteBehaviorStore, format_report
+from antibot.ingest import InboxIngester, RedditInboxSource, ScoredMessageStore
+from antibot.logger import Logger
+from antibot.tasks import TaskExecutor, current_task
 
 # ============================================================================
 # RESPONSE GENERATOR
@@ -425,7 +193,8 @@ Your goal: genuine interaction, NOT bot-like automated responses."""
             
         except Exception as e:
             self.logger.error(f"Generation error: {str(e)}")
-            default = f"Hey! Thanks for reaching out. {random.choice(['What brings you here?', 'How can I help?', 'What\'s up?'])}"
+            follow_up = random.choice(['What brings you here?', 'How can I help?', "What's up?"])
+            default = f"Hey! Thanks for reaching out. {follow_up}"
             return default
 
 # ============================================================================
@@ -446,6 +215,7 @@ class RedditManager:
         }
         """
         self.logger = Logger("RedditManager")
+        self.credentials = credentials  # reused by the async inbox ingester
         
         try:
             self.reddit = praw.Reddit(**credentials)
@@ -499,7 +269,7 @@ class RedditManager:
 # MAIN GUI APPLICATION
 # ============================================================================
 
-class AntiBot ResponseGUI(ctk.CTk):
+class AntiBotResponseGUI(ctk.CTk):
     """🔥 Main GUI Application"""
     
     def __init__(self):
@@ -514,12 +284,30 @@ class AntiBot ResponseGUI(ctk.CTk):
         self.logger = Logger("GUI")
         
         # Initialize components
-        self.bot_detector = BotDetectionEngine()
+        self.bot_detector = BotDetectionEngine(
+            config_path="config/bot_signatures.json",
+            behavior_store=SQLiteBehaviorStore("data/behaviors"),
+            model_dir="data/models",
+            watch_config=True,
+        )
         self.response_generator: Optional[HumanResponseGenerator] = None
         self.reddit_manager: Optional[RedditManager] = None
+        self.inbox_store = ScoredMessageStore("data/inbox.sqlite3")
+        self.inbox_ingester: Optional[InboxIngester] = None
+        self.inbox_results: List[Dict] = []
+        # Shared by every tab: blocking work runs here, results come back via after()
+        self.tasks = TaskExecutor(self.after)
         
         # Build UI
         self.create_widgets()
+        self.protocol("WM_DELETE_WINDOW", self.on_close)
+        
+    def on_close(self):
+        """Persist detector state before the window goes away"""
+        self.tasks.shutdown(wait=True)  # cancels the inbox fetch, finishes engine work
+        self.bot_detector.close()
+        self.inbox_store.close()
+        self.destroy()
         
     def create_widgets(self):
         """Build UI components"""
@@ -894,10 +682,37 @@ class AntiBot ResponseGUI(ctk.CTk):
             messagebox.showwarning("⚠️ Input Required", "Please enter both username and message!")
             return
         
+        self.bot_results.delete("1.0", "end")
+        self.bot_results.insert("1.0", "⏳ Analyzing...")
+        self.tasks.submit(
+            self._analyze_user, username, message,
+            lane="engine", key="analyze",
+            on_done=self.show_analysis,
+            on_error=lambda e: self.show_text(self.bot_results, f"❌ Analysis failed: {e}"),
+        )
+    
+    def _analyze_user(self, username: str, message: str) -> Dict:
+        """Engine lane: score the message and snapshot the user's profile"""
         bot_score, reason = self.bot_detector.analyze_user(username, message)
-        is_bot = self.bot_detector.is_likely_bot(bot_score)
-        
         user_data = self.bot_detector.user_behaviors[username]
+        return {
+            'username': username,
+            'bot_score': bot_score,
+            'reason': reason,
+            'is_bot': self.bot_detector.is_likely_bot(bot_score),
+            'message_count': user_data.message_count,
+            'unique_messages': user_data.unique_messages,
+            'mean_length': user_data.length_stats.mean,
+            'min_length': user_data.length_stats.min if user_data.message_count else 0,
+            'max_length': user_data.length_stats.max if user_data.message_count else 0,
+            'created_at': user_data.created_at,
+        }
+    
+    def show_analysis(self, result: Dict):
+        """Render an analysis from _analyze_user"""
+        username = result['username']
+        bot_score = result['bot_score']
+        is_bot = result['is_bot']
         
         result_text = f"""
 {'='*60}
@@ -909,15 +724,15 @@ class AntiBot ResponseGUI(ctk.CTk):
 🚨 Status: {"🤖 LIKELY BOT (CONFIDENCE: {:.0%})".format(bot_score) if is_bot else "✅ LIKELY HUMAN"}
 
 📋 Behavioral Analysis:
-{reason}
+{result['reason']}
 
 ⚙️ User Behavioral Data:
-  ├─ Total Messages Analyzed: {user_data.message_count}
-  ├─ Unique Message Patterns: {len(user_data.unique_patterns)}
-  ├─ Average Message Length: {np.mean(user_data.message_lengths):.0f} characters
-  ├─ Min Message Length: {min(user_data.message_lengths) if user_data.message_lengths else 0}
-  ├─ Max Message Length: {max(user_data.message_lengths) if user_data.message_lengths else 0}
-  └─ Account Age: {(time.time() - user_data.created_at):.0f} seconds
+  ├─ Total Messages Analyzed: {result['message_count']}
+  ├─ Unique Message Patterns: {result['unique_messages']}
+  ├─ Average Message Length: {result['mean_length']:.0f} characters
+  ├─ Min Message Length: {result['min_length']}
+  ├─ Max Message Length: {result['max_length']}
+  └─ Account Age: {(time.time() - result['created_at']):.0f} seconds
 
 🔧 Recommendation:
 {
@@ -928,10 +743,14 @@ class AntiBot ResponseGUI(ctk.CTk):
 {'='*60}
         """
         
-        self.bot_results.delete("1.0", "end")
-        self.bot_results.insert("1.0", result_text)
+        self.show_text(self.bot_results, result_text)
         self.logger.info(f"Analyzed {username}: {bot_score:.2%}")
     
+    def show_text(self, textbox, text: str):
+        """Replace a textbox's contents"""
+        textbox.delete("1.0", "end")
+        textbox.insert("1.0", text)
+    
     def generate_response(self):
         """Generate AI response"""
         if not self.response_generator:
@@ -946,21 +765,20 @@ class AntiBot ResponseGUI(ctk.CTk):
             return
         
         # Show loading
-        self.response_output.delete("1.0", "end")
-        self.response_output.insert("1.0", "⏳ Generating response... (this may take a few seconds)")
-        self.update()
+        self.show_text(self.response_output, "⏳ Generating response... (this may take a few seconds)")
         
-        try:
-            response = self.response_generator.generate_response(incoming, persona=persona)
-            
-            self.response_output.delete("1.0", "end")
-            self.response_output.insert("1.0", response)
+        def show_response(response: str):
+            self.show_text(self.response_output, response)
             self.logger.info(f"Generated response ({persona}): {response[:50]}...")
-            
-        except Exception as e:
-            self.response_output.delete("1.0", "end")
-            self.response_output.insert("1.0", f"❌ Error: {str(e)}\n\nMake sure your OpenAI API key is valid!")
+        
+        def show_error(e: BaseException):
+            self.show_text(self.response_output, f"❌ Error: {str(e)}\n\nMake sure your OpenAI API key is valid!")
             self.logger.error(f"Response generation error: {str(e)}")
+        
+        self.tasks.submit(
+            self.response_generator.generate_response, incoming, persona=persona,
+            key="response", on_done=show_response, on_error=show_error,
+        )
     
     def copy_response(self):
         """Copy response to clipboard"""
@@ -973,37 +791,66 @@ class AntiBot ResponseGUI(ctk.CTk):
             messagebox.showwarning("⚠️ No Response", "Generate a response first!")
     
     def fetch_reddit_messages(self):
-        """Fetch Reddit messages"""
+        """Fetch and score unread messages in the background (read-only)"""
         if not self.reddit_manager or not self.reddit_manager.authenticated:
             messagebox.showerror("❌ Not Authenticated", "Please authenticate Reddit first!")
             return
         
         limit = int(self.reddit_limit.get())
-        self.reddit_messages.delete("1.0", "end")
-        self.reddit_messages.insert("1.0", "⏳ Fetching messages...")
-        self.update()
-        
-        messages = self.reddit_manager.get_messages(limit=limit)
-        
-        if not messages:
-            self.reddit_messages.delete("1.0", "end")
-            self.reddit_messages.insert("1.0", "📭 No unread messages found!")
+        self.show_text(self.reddit_messages, "⏳ Fetching messages...")
+        
+        self.inbox_results = []
+        self.inbox_ingester = InboxIngester(
+            self.bot_detector,
+            RedditInboxSource(self.reddit_manager.credentials, limit=limit),
+            self.inbox_store,
+            executor=self.tasks.lane("engine"),  # scoring shares the engine lane
+        )
+        self.tasks.submit(
+            self._run_ingester, self.inbox_ingester,
+            key="inbox",  # a second click restarts the fetch
+            on_progress=lambda fraction, status: self.show_reddit_messages(f"⏳ Fetching... {status}"),
+            on_done=lambda ingester: self.show_reddit_messages(None),
+            on_error=lambda e: self.show_text(self.reddit_messages, f"❌ Error fetching messages: {e}"),
+        )
+    
+    def _run_ingester(self, ingester: InboxIngester) -> InboxIngester:
+        """Worker: run one ingest pass, reporting each scored batch"""
+        task = current_task()
+        task.add_cancel_callback(ingester.stop)
+        ingester.on_scored = lambda results: task.report(None, f"{ingester.scored} scored")
+        asyncio.run(ingester.run())
+        return ingester
+    
+    def show_reddit_messages(self, status: Optional[str]):
+        """Show scored inbox messages, newest first; status=None once the fetch is done"""
+        ingester = self.inbox_ingester
+        while not ingester.results.empty():
+            self.inbox_results.append(ingester.results.get_nowait())
+        
+        if status is None and not self.inbox_results:
+            self.show_text(
+                self.reddit_messages, f"📭 No new unread messages found! ({ingester.duplicates} already scored)"
+            )
             return
         
-        text = f"📬 {len(messages)} Unread Messages\n{'='*60}\n\n"
+        header = status or f"📬 {len(self.inbox_results)} Unread Messages"
+        text = f"{header}\n{'='*60}\n\n"
         
+        messages = sorted(self.inbox_results, key=lambda m: m['created'], reverse=True)
         for i, msg in enumerate(messages, 1):
+            verdict = "🤖 BOT" if msg['is_bot'] else "👤 Human"
             text += f"""
 {i}. From: {msg['author']}
    Subject: {msg['subject']}
    Message: {msg['body'][:100]}...
    Date: {datetime.fromtimestamp(msg['created']).strftime('%Y-%m-%d %H:%M:%S')}
+   Bot Score: {msg['score']:.1%} {verdict}
    ID: {msg['id']}
 {'-'*60}
 """
         
-        self.reddit_messages.delete("1.0", "end")
-        self.reddit_messages.insert("1.0", text)
+        self.show_text(self.reddit_messages, text)
     
     def send_reddit_message(self):
         """Send Reddit message"""
@@ -1019,39 +866,63 @@ class AntiBot ResponseGUI(ctk.CTk):
             messagebox.showwarning("⚠️ Missing Fields", "Fill username, subject, and message!")
             return
         
-        if self.reddit_manager.send_message(username, subject, message):
-            messagebox.showinfo("✅ Sent", f"Message sent to {username}!")
-            self.reply_username.delete(0, "end")
-            self.reply_subject.delete(0, "end")
-            self.reply_message.delete("1.0", "end")
-            self.logger.info(f"Sent message to {username}")
-        else:
-            messagebox.showerror("❌ Error", "Failed to send message!")
+        def sent(ok: bool):
+            if ok:
+                messagebox.showinfo("✅ Sent", f"Message sent to {username}!")
+                self.reply_username.delete(0, "end")
+                self.reply_subject.delete(0, "end")
+                self.reply_message.delete("1.0", "end")
+                self.logger.info(f"Sent message to {username}")
+            else:
+                messagebox.showerror("❌ Error", "Failed to send message!")
+        
+        self.tasks.submit(self.reddit_manager.send_message, username, subject, message, on_done=sent)
     
     def refresh_stats(self):
         """Refresh statistics display"""
-        stats_text = """
+        self.tasks.submit(
+            self._stats_text, lane="engine", key="stats",
+            on_done=lambda text: self.show_text(self.monitor_stats, text),
+        )
+    
+    def _stats_text(self) -> str:
+        """Engine lane: build the statistics report"""
+        # Constant time: counters come from the metrics registry, not a scan of every user
+        trainer = self.bot_detector.trainer
+        metrics = self.bot_detector.metrics.snapshot()
+        total_users = len(self.bot_detector.user_behaviors)
+        training_points = len(trainer.reservoir)
+        user_stats = "\n".join([
+            f"  {i+1}. {uid}: {u.message_count} msgs, {u.unique_messages} patterns"
+            for i, (uid, u) in enumerate(islice(self.bot_detector.user_behaviors.items(), 10))
+        ]) if self.bot_detector.user_behaviors else "  (No users analyzed yet)"
+        
+        stats_text = f"""
 ╔════════════════════════════════════════════════════════════════════════╗
 ║               📊 BOT DETECTION ENGINE STATISTICS                       ║
 ╚════════════════════════════════════════════════════════════════════════╝
 
 📈 OVERALL STATISTICS:
-  ├─ Total Unique Users Analyzed: {total_users}
-  ├─ Total Messages Analyzed: {total_messages}
+  ├─ Users in Memory: {total_users} of {self.bot_detector.user_behaviors.max_users} ({self.bot_detector.user_behaviors.evicted} evicted to disk)
+  ├─ Total Messages Analyzed: {metrics['messages']}
   ├─ Training Data Points: {training_points}
-  └─ ML Model Status: {"Ready" if self.bot_detector.training_data else "Warming Up"}
+  └─ ML Model Status: {f"Ready (v{trainer.model.version})" if trainer.model else "Warming Up"}
+
+{format_report(metrics)}
 
 👥 USER PROFILES (Last 10):
 {user_stats}
 
-🤖 BOT SIGNATURES LOADED:
+🤖 BOT SIGNATURES LOADED (v{self.bot_detector.ruleset.version}, {self.bot_detector.ruleset.digest}):
   ├─ Rapid-Fire Detection: {"✅ Enabled" if "rapid_fire" in self.bot_detector.bot_signatures else "❌ Disabled"}
   ├─ Repetition Analysis: {"✅ Enabled" if "repetitive" in self.bot_detector.bot_signatures else "❌ Disabled"}
+  ├─ Timing Regularity: {"✅ Enabled" if "suspicious_timing" in self.bot_detector.bot_signatures else "❌ Disabled"}
   ├─ Generic Response Detection: {"✅ Enabled" if "generic_responses" in self.bot_detector.bot_signatures else "❌ Disabled"}
   ├─ Capitalization Anomaly: {"✅ Enabled" if "unusual_caps" in self.bot_detector.bot_signatures else "❌ Disabled"}
   ├─ Emoji Spam Detection: {"✅ Enabled" if "emoji_spam" in self.bot_detector.bot_signatures else "❌ Disabled"}
   ├─ URL Bombing Detection: {"✅ Enabled" if "url_bomber" in self.bot_detector.bot_signatures else "❌ Disabled"}
-  └─ ML Anomaly Detection: {"✅ Enabled" if self.bot_detector.isolation_forest else "❌ Disabled"}
+  ├─ ML Anomaly Detection: {"✅ Enabled" if trainer.model else "⏳ Collecting samples"}
+  └─ Campaign Detection: {len(self.bot_detector.campaign_index)} recent messages indexed
 
 ✨ RESPONSE GENERATOR STATUS:
   └─ {
@@ -1062,18 +933,8 @@ class AntiBot ResponseGUI(ctk.CTk):
   └─ {
     "✅ Connected & Authenticated" if self.reddit_manager and self.reddit_manager.authenticated else "⚠️ Not Authenticated"
   }
-        """.format(
-            total_users=len(self.bot_detector.user_behaviors),
-            total_messages=sum(u.message_count for u in self.bot_detector.user_behaviors.values()),
-            training_points=len(self.bot_detector.training_data),
-            user_stats="\n".join([
-                f"  {i+1}. {uid}: {u.message_count} msgs, {len(u.unique_patterns)} patterns"
-                for i, (uid, u) in enumerate(list(self.bot_detector.user_behaviors.items())[:10])
-            ]) if self.bot_detector.user_behaviors else "  (No users analyzed yet)"
-        )
-        
-        self.monitor_stats.delete("1.0", "end")
-        self.monitor_stats.insert("1.0", stats_text)
+        """
+        return stats_text
 
 
 # ============================================================================
@@ -1082,7 +943,7 @@ class AntiBot ResponseGUI(ctk.CTk):
 
 def main():
     """Launch application"""
-    app = AntiBot ResponseGUI()
+    app = AntiBotResponseGUI()
     app.mainloop()
 
 